@@ -1,35 +1,137 @@
 import csv
+import hashlib
 import os
-from banco.cartas import CartaAleatoria, CartaCriatura, CartaFeitico, CartaFeiticoRevive, CartaTerreno
+import pickle
+import tempfile
+from typing import Dict, List, Optional, Tuple
+from banco.cartas import EFEITOS, Carta, CartaAleatoria, CartaCriatura, CartaFeitico, CartaFeiticoRevive, CartaTerreno, ModeloCarta, compilar_modelo
+from banco.indices import IndiceCartas
+
+CLASSES_CARTA = {classe.__name__: classe for classe in (CartaCriatura, CartaFeitico, CartaFeiticoRevive, CartaTerreno, CartaAleatoria)}
+
+# Catálogo compilado: o nome da classe de cada carta e o seu modelo imutável.
+Catalogo = List[Tuple[str, ModeloCarta]]
+
+_VERSAO_CACHE = 2
+_PASTA_CACHE = "__cache__"
+
+# Catálogos já compilados neste processo, por caminho do CSV, junto com a assinatura (mtime, tamanho) do
+# arquivo e o tamanho da tabela de efeitos quando os opcodes foram resolvidos.
+_catalogos: Dict[str, Tuple[Tuple[int, int], int, Catalogo]] = {}
 
 class BancoSimulado:
     def __init__(self, arquivo_csv):
         self.arquivo_csv = arquivo_csv
         self.cartas = self.carregar_cartas()
+        self.indice = IndiceCartas(self.cartas)
 
     def carregar_cartas(self):
-        cartas = []
+        """Cria as cartas do banco a partir do catálogo compilado do CSV."""
         base_path = os.path.dirname(os.path.abspath(__file__))
         csv_path = os.path.join(base_path, self.arquivo_csv)
-        with open(csv_path, newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                if row['tipo'] == 'CartaCriatura':
-                    cartas.append(CartaCriatura(row['nome'], int(row['custo_mana']), row['descricao'], int(row['poder']), int(row['resistencia'])))
-                elif row['tipo'] == 'CartaFeitico':
-                    cartas.append(CartaFeitico(row['nome'], int(row['custo_mana']), row['descricao'], row['tipo_magia'], int(row['poder']), row['tem_alvo'] == 'True', row['afeta_todos'] == 'True'))
-                elif row['tipo'] == 'CartaFeiticoRevive':
-                    cartas.append(CartaFeiticoRevive(row['nome'], int(row['custo_mana']), row['descricao']))
-                elif row['tipo'] == 'CartaTerreno':
-                    cartas.append(CartaTerreno(row['nome'], row['descricao'], row['tipo_magia']))
-                elif row['tipo'] == 'CartaAleatoria':
-                    cartas.append(CartaAleatoria(row['nome'], int(row['custo_mana']), row['descricao'], row['efeitos'].split(';')))
-        return cartas
+        return [CLASSES_CARTA[tipo].de_modelo(modelo) for tipo, modelo in compilar_catalogo(csv_path)]
 
     def obter_cartas(self):
         return self.cartas
-    
+
     def adicionar_carta(self, carta):
         """Adiciona uma carta à coleção e retorna-a."""
         self.cartas.append(carta)
+        self.indice.adicionar(carta)
         return carta
+
+    def consultar(self, **criterios):
+        """Busca cartas pelos índices do banco; veja `IndiceCartas.consultar` para os critérios."""
+        return self.indice.consultar(**criterios)
+
+def ler_csv(csv_path: str) -> List[Carta]:
+    """Lê e converte todas as linhas do CSV de cartas."""
+    cartas = []
+    with open(csv_path, newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        for row in reader:
+            if row['tipo'] == 'CartaCriatura':
+                cartas.append(CartaCriatura(row['nome'], int(row['custo_mana']), row['descricao'], int(row['poder']), int(row['resistencia'])))
+            elif row['tipo'] == 'CartaFeitico':
+                cartas.append(CartaFeitico(row['nome'], int(row['custo_mana']), row['descricao'], row['tipo_magia'], int(row['poder']), row['tem_alvo'] == 'True', row['afeta_todos'] == 'True'))
+            elif row['tipo'] == 'CartaFeiticoRevive':
+                cartas.append(CartaFeiticoRevive(row['nome'], int(row['custo_mana']), row['descricao']))
+            elif row['tipo'] == 'CartaTerreno':
+                cartas.append(CartaTerreno(row['nome'], row['descricao'], row['tipo_magia']))
+            elif row['tipo'] == 'CartaAleatoria':
+                cartas.append(CartaAleatoria(row['nome'], int(row['custo_mana']), row['descricao'], row['efeitos'].split(';')))
+    return cartas
+
+def compilar_catalogo(csv_path: str) -> Catalogo:
+    """Devolve o catálogo compilado do CSV.
+
+    O CSV só é lido quando muda: o resultado fica em memória para todo o processo e em um
+    arquivo pickle na pasta `__cache__` ao lado do CSV, invalidado por mtime/tamanho e,
+    se estes mudarem, pelo hash do conteúdo. Os opcodes dos efeitos dependem dos efeitos
+    registrados neste processo, então são resolvidos de novo ao ler o cache e sempre que
+    um efeito novo é registrado.
+    """
+    estado = os.stat(csv_path)
+    assinatura = (estado.st_mtime_ns, estado.st_size)
+    em_memoria = _catalogos.get(csv_path)
+    if em_memoria is not None and em_memoria[0] == assinatura:
+        if em_memoria[1] == len(EFEITOS):
+            return em_memoria[2]
+        catalogo = em_memoria[2]
+    else:
+        catalogo = _ler_cache(csv_path, assinatura)
+        if catalogo is None:
+            catalogo = [(type(carta).__name__, carta.modelo) for carta in ler_csv(csv_path)]
+            _gravar_cache(csv_path, assinatura, _hash_arquivo(csv_path), catalogo)
+    catalogo = compilar_efeitos(catalogo)
+    _catalogos[csv_path] = (assinatura, len(EFEITOS), catalogo)
+    return catalogo
+
+def compilar_efeitos(catalogo: Catalogo) -> Catalogo:
+    """Resolve os opcodes dos efeitos de cada modelo do catálogo (veja `banco.cartas.compilar_modelo`)."""
+    return [(tipo, compilar_modelo(CLASSES_CARTA[tipo], modelo)) for tipo, modelo in catalogo]
+
+def _caminho_cache(csv_path: str) -> str:
+    pasta, nome = os.path.split(csv_path)
+    return os.path.join(pasta, _PASTA_CACHE, nome + ".pickle")
+
+def _hash_arquivo(caminho: str) -> str:
+    with open(caminho, 'rb') as arquivo:
+        return hashlib.sha256(arquivo.read()).hexdigest()
+
+def _ler_cache(csv_path: str, assinatura: Tuple[int, int]) -> Optional[Catalogo]:
+    try:
+        with open(_caminho_cache(csv_path), 'rb') as arquivo:
+            dados = pickle.load(arquivo)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if dados.get("versao") != _VERSAO_CACHE:
+        return None
+    if dados["assinatura"] == assinatura:
+        return dados["catalogo"]
+    # O arquivo foi tocado, mas pode não ter mudado: confere o conteúdo antes de recompilar.
+    hash_atual = _hash_arquivo(csv_path)
+    if dados["hash"] != hash_atual:
+        return None
+    _gravar_cache(csv_path, assinatura, hash_atual, dados["catalogo"])
+    return dados["catalogo"]
+
+def _gravar_cache(csv_path: str, assinatura: Tuple[int, int], hash_csv: str, catalogo: Catalogo):
+    """Grava o cache de forma atômica; falhas de escrita apenas deixam o cache de fora."""
+    caminho = _caminho_cache(csv_path)
+    dados = {"versao": _VERSAO_CACHE, "assinatura": assinatura, "hash": hash_csv, "catalogo": catalogo}
+    try:
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(caminho), suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(descritor, 'wb') as arquivo:
+            pickle.dump(dados, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+        # No Windows, a troca falha se outro processo estiver com o cache aberto.
+        os.replace(temporario, caminho)
+    except (OSError, pickle.PicklingError, TypeError):
+        try:
+            os.remove(temporario)
+        except OSError:
+            pass
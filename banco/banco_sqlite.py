@@ -0,0 +1,252 @@
+import contextlib
+import os
+import queue
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Iterator, List, Optional, Tuple, Type, Union
+from urllib.parse import quote
+from banco.banco_de_dados import CLASSES_CARTA, compilar_catalogo
+from banco.cartas import EFEITOS, Carta, ModeloCarta, compilar_modelo
+from banco.indices import Faixa
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS cartas (
+    posicao INTEGER PRIMARY KEY,
+    tipo TEXT NOT NULL,
+    nome TEXT NOT NULL,
+    custo_mana INTEGER NOT NULL,
+    descricao TEXT NOT NULL,
+    tipo_magia TEXT,
+    poder INTEGER NOT NULL DEFAULT 0,
+    resistencia INTEGER NOT NULL DEFAULT 0,
+    tem_alvo INTEGER NOT NULL DEFAULT 0,
+    afeta_todos INTEGER NOT NULL DEFAULT 0,
+    efeitos TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_cartas_nome ON cartas(nome);
+CREATE INDEX IF NOT EXISTS idx_cartas_tipo_custo ON cartas(tipo, custo_mana);
+CREATE INDEX IF NOT EXISTS idx_cartas_tipo_magia ON cartas(tipo_magia, custo_mana);
+CREATE INDEX IF NOT EXISTS idx_cartas_custo ON cartas(custo_mana);
+CREATE INDEX IF NOT EXISTS idx_cartas_tipo_poder ON cartas(tipo, poder);
+CREATE INDEX IF NOT EXISTS idx_cartas_tipo_resistencia ON cartas(tipo, resistencia);
+"""
+
+_COLUNAS = "posicao, tipo, nome, custo_mana, descricao, tipo_magia, poder, resistencia, tem_alvo, afeta_todos, efeitos"
+_INSERIR = ("INSERT INTO cartas (tipo, nome, custo_mana, descricao, tipo_magia, poder, resistencia, tem_alvo, afeta_todos, efeitos) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+def _linha_da_carta(tipo: str, modelo: ModeloCarta) -> tuple:
+    return (tipo, modelo.nome, modelo.custo_mana, modelo.descricao, modelo.tipo_magia, modelo.poder,
+            modelo.resistencia, int(modelo.tem_alvo), int(modelo.afeta_todos), ";".join(modelo.efeitos))
+
+def _modelo_da_linha(linha: tuple) -> Tuple[str, ModeloCarta]:
+    _, tipo, nome, custo_mana, descricao, tipo_magia, poder, resistencia, tem_alvo, afeta_todos, efeitos = linha
+    modelo = ModeloCarta(nome, custo_mana, descricao, tipo_magia, poder, resistencia, bool(tem_alvo),
+                         bool(afeta_todos), tuple(efeitos.split(";")) if efeitos else ())
+    return tipo, compilar_modelo(CLASSES_CARTA[tipo], modelo)
+
+class PoolConexoes:
+    """Pool pequeno de conexões somente leitura, criadas sob demanda.
+
+    O pool pertence ao processo que o criou: após um fork, `BancoSQLite` abre um pool novo,
+    então cada processo trabalhador tem as próprias conexões.
+    """
+    def __init__(self, caminho_db: str, tamanho: int = 4):
+        self._uri = f"file:{quote(os.path.abspath(caminho_db))}?mode=ro"
+        self._tamanho = tamanho
+        self._livres: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._todas: List[sqlite3.Connection] = []
+        self._trava = threading.Lock()
+
+    @contextlib.contextmanager
+    def conexao(self) -> Iterator[sqlite3.Connection]:
+        """Empresta uma conexão do pool, esperando se todas estiverem em uso."""
+        try:
+            con = self._livres.get_nowait()
+        except queue.Empty:
+            with self._trava:
+                con = self._abrir() if len(self._todas) < self._tamanho else None
+            if con is None:
+                con = self._livres.get()
+        try:
+            yield con
+        finally:
+            self._livres.put(con)
+
+    def _abrir(self) -> sqlite3.Connection:
+        con = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+        self._todas.append(con)
+        return con
+
+    def fechar(self):
+        with self._trava:
+            for con in self._todas:
+                con.close()
+            self._todas.clear()
+            self._livres = queue.LifoQueue()
+
+class CartasSQLite(Sequence):
+    """Sequência preguiçosa das cartas do banco.
+
+    Nada é lido na criação: cada acesso por índice busca uma linha (com cache LRU dos modelos já
+    lidos) e a iteração percorre a tabela em lotes. Funciona com `random.choices`.
+    """
+    def __init__(self, banco: "BancoSQLite", tamanho_lote: int = 500, tamanho_cache: int = 100_000):
+        self._banco = banco
+        self._tamanho_lote = tamanho_lote
+        self._tamanho_cache = tamanho_cache
+        self._modelos: "OrderedDict[int, Tuple[str, ModeloCarta]]" = OrderedDict()
+        # Tamanho da tabela de efeitos quando os modelos do cache foram compilados.
+        self._efeitos_compilados = len(EFEITOS)
+
+    def __len__(self) -> int:
+        return self._banco.contar()
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self)))]
+        tamanho = len(self)
+        if indice < 0:
+            indice += tamanho
+        if not 0 <= indice < tamanho:
+            raise IndexError("índice de carta fora do banco")
+        if self._efeitos_compilados != len(EFEITOS):
+            # Um efeito foi registrado depois: os opcodes do cache podem estar desatualizados.
+            self._modelos.clear()
+            self._efeitos_compilados = len(EFEITOS)
+        entrada = self._modelos.get(indice)
+        if entrada is None:
+            with self._banco.leitura() as con:
+                linha = con.execute(f"SELECT {_COLUNAS} FROM cartas WHERE posicao = ?", (indice + 1,)).fetchone()
+            entrada = self._modelos[indice] = _modelo_da_linha(linha)
+            if len(self._modelos) > self._tamanho_cache:
+                self._modelos.popitem(last=False)
+        else:
+            self._modelos.move_to_end(indice)
+        tipo, modelo = entrada
+        return CLASSES_CARTA[tipo].de_modelo(modelo)
+
+    def __iter__(self) -> Iterator[Carta]:
+        return self._banco.iterar_cartas(tamanho_lote=self._tamanho_lote)
+
+class BancoSQLite:
+    """Banco de cartas em SQLite, com a mesma interface de `BancoSimulado`.
+
+    Leituras usam um pool de conexões somente leitura e as escritas uma conexão própria,
+    com o banco em modo WAL para que vários processos possam ler enquanto outro escreve.
+    As posições das cartas são contínuas a partir de 1, pois o banco não remove cartas.
+    """
+    def __init__(self, caminho_db: str, arquivo_csv: Optional[str] = None, tamanho_pool: int = 4):
+        self.caminho_db = caminho_db
+        self._tamanho_pool = tamanho_pool
+        self._escrita = sqlite3.connect(caminho_db, check_same_thread=False)
+        self._escrita.execute("PRAGMA journal_mode=WAL")
+        self._escrita.executescript(_ESQUEMA)
+        self._trava_escrita = threading.Lock()
+        self._pool: Optional[PoolConexoes] = None
+        self._pid_pool: Optional[int] = None
+        self._total: Optional[int] = None
+        self.cartas = CartasSQLite(self)
+        if arquivo_csv is not None and self.contar() == 0:
+            self.importar_csv(arquivo_csv)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def leitura(self):
+        """Empresta uma conexão somente leitura do pool deste processo."""
+        if self._pool is None or self._pid_pool != os.getpid():
+            self._pool = PoolConexoes(self.caminho_db, self._tamanho_pool)
+            self._pid_pool = os.getpid()
+        return self._pool.conexao()
+
+    def importar_csv(self, arquivo_csv: str) -> int:
+        """Importa todas as cartas de um CSV em uma única transação e devolve quantas foram inseridas."""
+        base_path = os.path.dirname(os.path.abspath(__file__))
+        linhas = [_linha_da_carta(tipo, modelo) for tipo, modelo in compilar_catalogo(os.path.join(base_path, arquivo_csv))]
+        with self._trava_escrita, self._escrita:
+            self._escrita.executemany(_INSERIR, linhas)
+        self._total = None
+        return len(linhas)
+
+    def contar(self) -> int:
+        # O total fica guardado até a próxima escrita feita por este objeto.
+        if self._total is None:
+            with self.leitura() as con:
+                self._total = con.execute("SELECT COUNT(*) FROM cartas").fetchone()[0]
+        return self._total
+
+    def obter_cartas(self) -> CartasSQLite:
+        return self.cartas
+
+    def adicionar_carta(self, carta: Carta) -> Carta:
+        """Adiciona uma carta ao banco e retorna-a."""
+        with self._trava_escrita, self._escrita:
+            self._escrita.execute(_INSERIR, _linha_da_carta(type(carta).__name__, carta.modelo))
+        self._total = None
+        return carta
+
+    def iterar_cartas(self, tamanho_lote: int = 500, filtro: str = "", parametros: tuple = ()) -> Iterator[Carta]:
+        """Percorre as cartas em ordem, buscando `tamanho_lote` linhas por vez.
+
+        Cada lote empresta uma conexão do pool só durante a consulta e continua da última
+        posição lida, então iteradores abertos (ou esquecidos) não prendem conexões.
+        """
+        condicao = f"{filtro} AND posicao > ?" if filtro else "WHERE posicao > ?"
+        consulta = f"SELECT {_COLUNAS} FROM cartas {condicao} ORDER BY posicao LIMIT ?"
+        ultima = 0
+        while True:
+            with self.leitura() as con:
+                linhas = con.execute(consulta, parametros + (ultima, tamanho_lote)).fetchall()
+            if not linhas:
+                break
+            ultima = linhas[-1][0]
+            for linha in linhas:
+                tipo, modelo = _modelo_da_linha(linha)
+                yield CLASSES_CARTA[tipo].de_modelo(modelo)
+            if len(linhas) < tamanho_lote:
+                break
+
+    def consultar(self, nome: Optional[str] = None, tipo: Union[Type[Carta], str, None] = None,
+                  tipo_magia: Optional[str] = None, custo_mana: Optional[Faixa] = None,
+                  poder: Optional[Faixa] = None, resistencia: Optional[Faixa] = None) -> List[Carta]:
+        """Mesmos critérios de `BancoSimulado.consultar`, resolvidos pelos índices do SQLite."""
+        condicoes, parametros = [], []
+        if nome is not None:
+            condicoes.append("nome = ?")
+            parametros.append(nome)
+        if tipo is not None:
+            classe = tipo if isinstance(tipo, type) else CLASSES_CARTA.get(tipo)
+            tipos = [n for n, c in CLASSES_CARTA.items() if classe is not None and issubclass(c, classe)] or [tipo]
+            condicoes.append(f"tipo IN ({', '.join('?' * len(tipos))})")
+            parametros.extend(tipos)
+        if tipo_magia is not None:
+            condicoes.append("tipo_magia = ?")
+            parametros.append(tipo_magia)
+        for coluna, faixa, tipos_validos in (("custo_mana", custo_mana, None),
+                                             ("poder", poder, ("CartaCriatura", "CartaFeitico", "CartaFeiticoRevive")),
+                                             ("resistencia", resistencia, ("CartaCriatura",))):
+            if faixa is None:
+                continue
+            minimo, maximo = (faixa, faixa) if isinstance(faixa, int) else faixa
+            if minimo is not None:
+                condicoes.append(f"{coluna} >= ?")
+                parametros.append(minimo)
+            if maximo is not None:
+                condicoes.append(f"{coluna} <= ?")
+                parametros.append(maximo)
+            if tipos_validos is not None:
+                condicoes.append(f"tipo IN ({', '.join('?' * len(tipos_validos))})")
+                parametros.extend(tipos_validos)
+        filtro = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        return list(self.iterar_cartas(filtro=filtro, parametros=tuple(parametros)))
+
+    def fechar(self):
+        if self._pool is not None and self._pid_pool == os.getpid():
+            self._pool.fechar()
+        self._escrita.close()
@@ -1,122 +1,297 @@
-from typing import List, Optional
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
 import random
+from jogo_estrutura import eventos
+
+class ModeloCarta(NamedTuple):
+    """Dados imutáveis de uma carta, compartilhados por todas as suas cópias.
+
+    `opcodes` é o efeito compilado (veja `compilar_modelo`): a posição em `EFEITOS` do
+    efeito de `tipo_magia` ou de cada nome em `efeitos` (`SEM_EFEITO` se não houver nenhum).
+    """
+    nome: str
+    custo_mana: int
+    descricao: str
+    tipo_magia: Optional[str] = None
+    poder: int = 0
+    resistencia: int = 0
+    tem_alvo: bool = False
+    afeta_todos: bool = False
+    efeitos: Tuple[str, ...] = ()
+    opcodes: Tuple[int, ...] = ()
+
+# --- Tabela de efeitos ---
+
+# Um efeito recebe (carta, jogador, alvo, jogador_alvo, rng); quem o chama já pagou a mana
+# e cuida da carta depois dele (mão, campo, cemitério e histórico).
+Efeito = Callable[..., None]
+
+def _sem_efeito(carta, jogador, alvo, jogador_alvo, rng):
+    pass
+
+SEM_EFEITO = 0
+EFEITOS: List[Efeito] = [_sem_efeito]
+_opcodes: Dict[Tuple[type, str], int] = {}
+
+def registrar_efeito(tipo: type, nome: str, efeito: Efeito) -> int:
+    """Associa `efeito` ao nome usado em `tipo_magia` ou `efeitos` pelas cartas da classe `tipo`.
+
+    Devolve o opcode do efeito. Registrar de novo o mesmo nome troca o efeito e mantém o
+    opcode. Subclasses de `tipo` também usam o efeito, a menos que registrem o seu próprio.
+    As cartas só encontram efeitos registrados antes de serem criadas ou carregadas do banco.
+    """
+    opcode = _opcodes.get((tipo, nome))
+    if opcode is None:
+        opcode = _opcodes[(tipo, nome)] = len(EFEITOS)
+        EFEITOS.append(efeito)
+    else:
+        EFEITOS[opcode] = efeito
+    return opcode
+
+def opcode_do_efeito(tipo: type, nome: str) -> int:
+    """Opcode do efeito `nome` para cartas da classe `tipo`; `SEM_EFEITO` se não houver."""
+    for classe in tipo.__mro__:
+        opcode = _opcodes.get((classe, nome))
+        if opcode is not None:
+            return opcode
+    return SEM_EFEITO
+
+def compilar_modelo(tipo: type, modelo: ModeloCarta) -> ModeloCarta:
+    """Devolve o modelo com `opcodes` resolvidos para a classe de carta `tipo`.
+
+    Um modelo sem nenhum nome de efeito recebe `(SEM_EFEITO,)`, para que lançá-lo só gaste a mana.
+    """
+    nomes = (modelo.tipo_magia,) if modelo.tipo_magia else modelo.efeitos
+    opcodes = tuple(opcode_do_efeito(tipo, nome) for nome in nomes) or (SEM_EFEITO,)
+    return modelo if opcodes == modelo.opcodes else modelo._replace(opcodes=opcodes)
 
 class Carta:
-    """Representa uma carta genérica."""
-    def __init__(self, nome: str, custo_mana: int, descricao: str, tipo_magia: Optional[str] = None):
-        self.nome = nome
-        self.custo_mana = custo_mana
-        self.descricao = descricao
-        self.tipo_magia = tipo_magia
+    """Representa uma carta genérica.
+
+    Os dados fixos ficam em `modelo`, compartilhado entre as cópias da mesma carta;
+    cada instância guarda apenas o estado que muda durante a partida.
+    """
+    __slots__ = ("modelo",)
+
+    def __init__(self, nome: str, custo_mana: int, descricao: str, tipo_magia: Optional[str] = None, **atributos):
+        self.modelo = compilar_modelo(type(self), ModeloCarta(nome, custo_mana, descricao, tipo_magia, **atributos))
+        self._iniciar_estado()
+
+    @classmethod
+    def de_modelo(cls, modelo: ModeloCarta):
+        """Cria uma nova instância da carta a partir de um modelo já existente.
+
+        Um modelo ainda sem opcodes é compilado para a classe `cls`.
+        """
+        if not modelo.opcodes:
+            modelo = compilar_modelo(cls, modelo)
+        carta = cls.__new__(cls)
+        carta.modelo = modelo
+        carta._iniciar_estado()
+        return carta
+
+    def nova_copia(self):
+        """Cria uma cópia nova desta carta, com o estado inicial do modelo."""
+        return self.de_modelo(self.modelo)
+
+    def _iniciar_estado(self):
+        """Inicializa o estado mutável da instância a partir do modelo."""
+
+    def __copy__(self):
+        classe = type(self)
+        copia = classe.__new__(classe)
+        for base in classe.__mro__:
+            for atributo in getattr(base, "__slots__", ()):
+                if hasattr(self, atributo):
+                    setattr(copia, atributo, getattr(self, atributo))
+        return copia
+
+    def __deepcopy__(self, memo):
+        # O modelo é imutável e o estado só contém valores imutáveis, então a cópia rasa basta.
+        return self.__copy__()
+
+    @property
+    def nome(self) -> str:
+        return self.modelo.nome
+
+    @property
+    def custo_mana(self) -> int:
+        return self.modelo.custo_mana
+
+    @property
+    def descricao(self) -> str:
+        return self.modelo.descricao
+
+    @property
+    def tipo_magia(self) -> Optional[str]:
+        return self.modelo.tipo_magia
 
     def __str__(self):
         return f"{self.nome} (Mana: {self.custo_mana}) - {self.descricao}"
     
     def receber_dano(self, dano: int):
         """Método genérico para receber dano."""
-        print(f"{self.nome} sofre {dano} de dano.")
+        eventos.emitir(eventos.CartaSofreDano(self.nome, dano))
 
     def curar(self, quantidade: int):
         """Método genérico para curar."""
-        print(f"{self.nome} recupera {quantidade} de saúde.")
+        eventos.emitir(eventos.CartaRecuperaSaude(self.nome, quantidade))
 
 class CartaCriatura(Carta):
-    """Representa uma carta de criatura."""
+    """Representa uma carta de criatura.
+
+    Enquanto está em um `CampoDeBatalha`, a criatura guarda o campo e a sua posição nele
+    (`_campo`, `_posicao`, `_seq`) e avisa o campo quando o poder ou a resistência mudam.
+    """
+    __slots__ = ("_poder", "_resistencia", "_campo", "_posicao", "_seq")
+
     def __init__(self, nome: str, custo_mana: int, descricao: str, poder: int, resistencia: int):
-        super().__init__(nome, custo_mana, descricao)
-        self.poder = poder
-        self.resistencia = resistencia
+        super().__init__(nome, custo_mana, descricao, poder=poder, resistencia=resistencia)
+
+    def _iniciar_estado(self):
+        self._campo = None
+        self._poder = self.modelo.poder
+        self._resistencia = self.modelo.resistencia
+
+    def __copy__(self):
+        # Caminho rápido da cópia genérica: as criaturas são as únicas cartas copiadas ao clonar um jogo.
+        # A cópia começa fora de qualquer campo de batalha.
+        copia = type(self).__new__(type(self))
+        copia.modelo = self.modelo
+        copia._campo = None
+        copia._poder = self._poder
+        copia._resistencia = self._resistencia
+        return copia
+
+    @property
+    def poder(self) -> int:
+        return self._poder
+
+    @poder.setter
+    def poder(self, valor: int):
+        self._poder = valor
+        if self._campo is not None:
+            self._campo._atributos_mudaram(self)
+
+    @property
+    def resistencia(self) -> int:
+        return self._resistencia
+
+    @resistencia.setter
+    def resistencia(self, valor: int):
+        self._resistencia = valor
+        if self._campo is not None:
+            self._campo._atributos_mudaram(self)
 
     def __str__(self):
         return f"{self.nome} (Mana: {self.custo_mana}) [Poder: {self.poder}, Resistência: {self.resistencia}] - {self.descricao}"
     
     def sofrer_dano(self, quantidade: int, jogador=None):
         """Aplica dano à criatura e envia ao cemitério se a resistência for menor ou igual a zero."""
-        self.resistencia -= quantidade
-        print(f"{self.nome} sofre {quantidade} de dano. Resistência restante: {self.resistencia}")
-        if self.resistencia <= 0:
+        self.resistencia = resistencia = self._resistencia - quantidade
+        eventos.emitir(eventos.CriaturaSofreDano(self.nome, quantidade, resistencia))
+        if resistencia <= 0:
             if jogador:
                 jogador.campo_de_batalha.remove(self)
                 jogador.cemiterio.append(self)
-                print(f"{self.nome} foi removida do campo de batalha e enviada ao cemitério.")
+                eventos.emitir(eventos.CriaturaDestruida(self.nome))
             return True
         return False
 
 class CartaFeitico(Carta):
     """Representa uma carta de feitiço."""
+    __slots__ = ()
+
     def __init__(self, nome: str, custo_mana: int, descricao: str, tipo_magia: str, poder: int, tem_alvo: bool = False, afeta_todos: bool = False):
-        super().__init__(nome, custo_mana, descricao, tipo_magia)
-        self.poder = poder
-        self.tem_alvo = tem_alvo
-        self.afeta_todos = afeta_todos
+        super().__init__(nome, custo_mana, descricao, tipo_magia, poder=poder, tem_alvo=tem_alvo, afeta_todos=afeta_todos)
+
+    @property
+    def poder(self) -> int:
+        return self.modelo.poder
 
-    def lancar(self, lancador, alvo=None, jogador_adversario=None):
+    @property
+    def tem_alvo(self) -> bool:
+        return self.modelo.tem_alvo
+
+    @property
+    def afeta_todos(self) -> bool:
+        return self.modelo.afeta_todos
+
+    def lancar(self, lancador, alvo=None, jogador_adversario=None, rng=random):
         """Lança o feitiço."""
         if not self._verificar_mana(lancador):
             return False
-
-        if self.tipo_magia == "dano_direto":
-            self._aplicar_dano(alvo, jogador_adversario)
-        elif self.tipo_magia == "cura":
-            self._curar(lancador)
-        elif self.tipo_magia == "buff_coletivo":
-            self._buffar_coletivo(lancador)
-        elif self.tipo_magia == "dano_coletivo" and jogador_adversario:
-            self._dano_coletivo(jogador_adversario)
+        EFEITOS[self.modelo.opcodes[0]](self, lancador, alvo, jogador_adversario, rng)
         return True
 
     def _verificar_mana(self, lancador):
         if lancador.mana < self.custo_mana:
-            print(f"Mana insuficiente para lançar {self.nome}.")
+            eventos.emitir(eventos.ManaInsuficiente(self.nome, "lançar"))
             return False
         lancador.mana -= self.custo_mana
         return True
 
     def _aplicar_dano(self, alvo, jogador_adversario):
         if alvo and hasattr(alvo, 'receber_dano'):
-            print(f"{self.nome} causa {self.poder} de dano a {alvo.nome}.")
+            eventos.emitir(eventos.FeiticoCausaDano(self.nome, self.poder, alvo.nome))
             alvo.receber_dano(self.poder)
         elif jogador_adversario:
-            print(f"{self.nome} causa {self.poder} de dano ao jogador adversário.")
+            eventos.emitir(eventos.FeiticoCausaDanoAdversario(self.nome, self.poder))
             jogador_adversario.saude -= self.poder
 
     def _curar(self, lancador):
-        print(f"{self.nome} cura {self.poder} de saúde de {lancador.nome}.")
+        eventos.emitir(eventos.FeiticoCura(self.nome, self.poder, lancador.nome))
         lancador.saude += self.poder
 
     def _buffar_coletivo(self, lancador):
-        print(f"{self.nome} fortalece as criaturas de {lancador.nome}.")
-        for criatura in lancador.campo_de_batalha:
-            criatura.resistencia += self.poder
+        eventos.emitir(eventos.FeiticoFortalece(self.nome, lancador.nome))
+        with lancador.campo_de_batalha.em_lote() as campo:
+            for criatura in campo:
+                criatura.resistencia += self.poder
 
     def _dano_coletivo(self, jogador_adversario):
-        print(f"{self.nome} causa {self.poder} de dano a todas as criaturas do adversário.")
-        for criatura in jogador_adversario.campo_de_batalha[:]:
-            criatura.sofrer_dano(self.poder, jogador_adversario)
+        """Aplica o dano a todas as criaturas do adversário e depois leva as mortas ao cemitério de uma vez.
+
+        Os eventos saem na mesma ordem de antes (dano e, se for o caso, destruição de cada
+        criatura, na ordem do campo), assim como a ordem das criaturas no cemitério.
+        """
+        eventos.emitir(eventos.FeiticoDanoColetivo(self.nome, self.poder))
+        campo = jogador_adversario.campo_de_batalha
+        mortas = []
+        with campo.em_lote():
+            for criatura in campo:
+                if criatura.sofrer_dano(self.poder):
+                    mortas.append(criatura)
+                    eventos.emitir(eventos.CriaturaDestruida(criatura.nome))
+            campo.remover_todas(mortas)
+        jogador_adversario.cemiterio.extend(mortas)
     
 class CartaFeiticoRevive(CartaFeitico):
     """Representa um feitiço que revive uma criatura do cemitério."""
+    __slots__ = ()
+
     def __init__(self, nome: str, custo_mana: int, descricao: str):
         super().__init__(nome, custo_mana, descricao, tipo_magia="revive", poder=0, tem_alvo=False, afeta_todos=False)
 
-    def lancar(self, lancador, criaturas_disponiveis, alvo=None, jogador_adversario=None):
-        """Lança o feitiço de reviver criatura."""
+    def lancar(self, lancador, criaturas_disponiveis, alvo=None, jogador_adversario=None, rng=random):
+        """Lança o feitiço de reviver criatura; `rng` sorteia a criatura revivida."""
         if not self._verificar_mana(lancador):
             return False
+        self._reviver(lancador, criaturas_disponiveis, rng)
+        return True
 
-        criatura_para_revivir = self._escolher_criatura_para_revivir(lancador, criaturas_disponiveis)
+    def _reviver(self, lancador, criaturas_disponiveis, rng=random):
+        criatura_para_revivir = self._escolher_criatura_para_revivir(lancador, criaturas_disponiveis, rng)
         if criatura_para_revivir:
             lancador.campo_de_batalha.append(criatura_para_revivir)
-            print(f"{lancador.nome} reviveu {criatura_para_revivir.nome} do cemitério!")
+            eventos.emitir(eventos.CriaturaRevivida(lancador.nome, criatura_para_revivir.nome))
         else:
-            print(f"{lancador.nome} tentou reviver uma criatura, mas não há nenhuma no cemitério.")
-        return True
+            eventos.emitir(eventos.ReviverSemCriaturas(lancador.nome))
     
     @staticmethod
-    def _escolher_criatura_para_revivir(lancador, criaturas_disponiveis):
+    def _escolher_criatura_para_revivir(lancador, criaturas_disponiveis, rng=random):
         criaturas_no_cemiterio = [c for c in lancador.cemiterio if isinstance(c, CartaCriatura)]
         if criaturas_no_cemiterio:
-            criatura_para_revivir = random.choice(criaturas_no_cemiterio)
+            criatura_para_revivir = rng.choice(criaturas_no_cemiterio)
             lancador.cemiterio.remove(criatura_para_revivir)
             resistencia_original = criaturas_disponiveis.get(criatura_para_revivir.nome, criatura_para_revivir.resistencia)
             criatura_para_revivir.resistencia = resistencia_original
@@ -125,33 +300,82 @@ class CartaFeiticoRevive(CartaFeitico):
 
 class CartaTerreno(Carta):
     """Representa uma carta de terreno."""
+    __slots__ = ()
+
     def __init__(self, nome: str, descricao: str, efeito: str):
-        super().__init__(nome, custo_mana=0, descricao=descricao)
-        self.efeito = efeito
+        super().__init__(nome, custo_mana=0, descricao=descricao, efeitos=(efeito,))
+
+    @property
+    def efeito(self) -> str:
+        return self.modelo.efeitos[0]
 
     def ativar_efeito(self, jogador):
         """Ativa o efeito do terreno."""
-        if self.efeito == "mana_extra":
-            jogador.mana += 1
-            print(f"{jogador.nome} ganha 1 mana extra devido ao efeito do terreno {self.nome}.")
-        elif self.efeito == "cura":
-            jogador.saude += 3
-            print(f"{jogador.nome} recupera 3 pontos de saúde devido ao efeito do terreno {self.nome}.")
+        EFEITOS[self.modelo.opcodes[0]](self, jogador, None, None, random)
 
 class CartaAleatoria(Carta):
     """Representa uma carta com efeito aleatório."""
+    __slots__ = ("efeito_atual",)
+
     def __init__(self, nome: str, custo_mana: int, descricao: str, efeitos: List[str]):
-        super().__init__(nome, custo_mana, descricao)
-        self.efeitos = efeitos
-
-    def ativar_efeito(self, jogador, alvo=None):
-        """Ativa um efeito aleatório."""
-        self.efeito_atual = random.choice(self.efeitos)
-        print(f"{jogador.nome} ativa {self.nome} com efeito aleatório: {self.efeito_atual}.")
-        if self.efeito_atual == "dano":
-            if alvo:
-                alvo.receber_dano(3)
-        elif self.efeito_atual == "cura":
-            jogador.saude += 3
-        elif self.efeito_atual == "mana_extra":
-            jogador.mana += 4
\ No newline at end of file
+        super().__init__(nome, custo_mana, descricao, efeitos=tuple(efeitos))
+
+    @property
+    def efeitos(self) -> Tuple[str, ...]:
+        return self.modelo.efeitos
+
+    def ativar_efeito(self, jogador, alvo=None, rng=random):
+        """Ativa um efeito sorteado por `rng`; `alvo` é o jogador que sofre o efeito de dano."""
+        # `randrange(n)` consome o gerador como `choice` em uma sequência de tamanho n.
+        sorteado = rng.randrange(len(self.modelo.opcodes))
+        self.efeito_atual = self.modelo.efeitos[sorteado]
+        eventos.emitir(eventos.EfeitoAleatorioAtivado(jogador.nome, self.nome, self.efeito_atual))
+        EFEITOS[self.modelo.opcodes[sorteado]](self, jogador, None, alvo, rng)
+
+# --- Efeitos das cartas do jogo ---
+
+def _feitico_dano_direto(carta, jogador, alvo, jogador_alvo, rng):
+    carta._aplicar_dano(alvo, jogador_alvo)
+
+def _feitico_cura(carta, jogador, alvo, jogador_alvo, rng):
+    carta._curar(jogador)
+
+def _feitico_buff_coletivo(carta, jogador, alvo, jogador_alvo, rng):
+    carta._buffar_coletivo(jogador)
+
+def _feitico_dano_coletivo(carta, jogador, alvo, jogador_alvo, rng):
+    if jogador_alvo:
+        carta._dano_coletivo(jogador_alvo)
+
+def _feitico_revive(carta, jogador, alvo, jogador_alvo, rng):
+    from jogo_estrutura import constantes
+    carta._reviver(jogador, constantes.CRIATURAS_DISPONIVEIS, rng)
+
+def _terreno_mana_extra(carta, jogador, alvo, jogador_alvo, rng):
+    jogador.mana += 1
+    eventos.emitir(eventos.TerrenoManaExtra(jogador.nome, carta.nome))
+
+def _terreno_cura(carta, jogador, alvo, jogador_alvo, rng):
+    jogador.saude += 3
+    eventos.emitir(eventos.TerrenoCura(jogador.nome, carta.nome))
+
+def _aleatoria_dano(carta, jogador, alvo, jogador_alvo, rng):
+    if jogador_alvo:
+        jogador_alvo.receber_dano(3)
+
+def _aleatoria_cura(carta, jogador, alvo, jogador_alvo, rng):
+    jogador.saude += 3
+
+def _aleatoria_mana_extra(carta, jogador, alvo, jogador_alvo, rng):
+    jogador.mana += 4
+
+registrar_efeito(CartaFeitico, "dano_direto", _feitico_dano_direto)
+registrar_efeito(CartaFeitico, "cura", _feitico_cura)
+registrar_efeito(CartaFeitico, "buff_coletivo", _feitico_buff_coletivo)
+registrar_efeito(CartaFeitico, "dano_coletivo", _feitico_dano_coletivo)
+registrar_efeito(CartaFeiticoRevive, "revive", _feitico_revive)
+registrar_efeito(CartaTerreno, "mana_extra", _terreno_mana_extra)
+registrar_efeito(CartaTerreno, "cura", _terreno_cura)
+registrar_efeito(CartaAleatoria, "dano", _aleatoria_dano)
+registrar_efeito(CartaAleatoria, "cura", _aleatoria_cura)
+registrar_efeito(CartaAleatoria, "mana_extra", _aleatoria_mana_extra)
@@ -0,0 +1,146 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple, Type, Union
+from banco.cartas import Carta, CartaCriatura, CartaFeitico
+
+# Um critério numérico pode ser um valor exato ou uma faixa (mínimo, máximo) inclusiva;
+# use None em um dos lados para deixar a faixa aberta.
+Faixa = Union[int, Tuple[Optional[int], Optional[int]]]
+
+class IndiceFaixa:
+    """Índice de um atributo inteiro que responde a consultas por faixa.
+
+    As posições ficam agrupadas por valor e os valores distintos ficam ordenados, então
+    inserir é O(1) (mais O(log k) para um valor novo) e consultar é O(log k + resultado),
+    onde k é a quantidade de valores distintos, pequena para custos e atributos de cartas.
+    """
+    def __init__(self):
+        self._valores: List[int] = []
+        self._posicoes: Dict[int, List[int]] = {}
+
+    def adicionar(self, valor: int, posicao: int):
+        posicoes = self._posicoes.get(valor)
+        if posicoes is None:
+            posicoes = self._posicoes[valor] = []
+            insort(self._valores, valor)
+        posicoes.append(posicao)
+
+    def _faixa(self, faixa: Faixa) -> List[List[int]]:
+        minimo, maximo = (faixa, faixa) if isinstance(faixa, int) else faixa
+        inicio = 0 if minimo is None else bisect_left(self._valores, minimo)
+        fim = len(self._valores) if maximo is None else bisect_right(self._valores, maximo)
+        return [self._posicoes[valor] for valor in self._valores[inicio:fim]]
+
+    def contar(self, faixa: Faixa) -> int:
+        return sum(len(posicoes) for posicoes in self._faixa(faixa))
+
+    def posicoes(self, faixa: Faixa) -> List[int]:
+        grupos = self._faixa(faixa)
+        if len(grupos) == 1:
+            return grupos[0]
+        # Cada grupo já está em ordem de inserção; o Timsort junta as sequências em tempo quase linear.
+        return sorted(posicao for grupo in grupos for posicao in grupo)
+
+    def contem(self, valor: int, faixa: Faixa) -> bool:
+        minimo, maximo = (faixa, faixa) if isinstance(faixa, int) else faixa
+        return (minimo is None or valor >= minimo) and (maximo is None or valor <= maximo)
+
+class IndiceCartas:
+    """Índices secundários sobre um catálogo de cartas, mantidos a cada carta adicionada.
+
+    Indexa por nome, tipo (incluindo as classes base, como `isinstance`), tipo de magia,
+    custo de mana, poder (criaturas e feitiços) e resistência (criaturas). Os atributos
+    indexados são os do modelo da carta, que não mudam.
+    """
+    def __init__(self, cartas: Iterable[Carta] = ()):
+        self._cartas: List[Carta] = []
+        self._por_nome: Dict[str, List[int]] = defaultdict(list)
+        self._por_tipo: Dict[str, List[int]] = defaultdict(list)
+        self._classes: Dict[str, type] = {}
+        self._por_tipo_magia: Dict[Optional[str], List[int]] = defaultdict(list)
+        self._por_custo = IndiceFaixa()
+        self._por_poder = IndiceFaixa()
+        self._por_resistencia = IndiceFaixa()
+        for carta in cartas:
+            self.adicionar(carta)
+
+    def __len__(self) -> int:
+        return len(self._cartas)
+
+    def adicionar(self, carta: Carta):
+        posicao = len(self._cartas)
+        self._cartas.append(carta)
+        modelo = carta.modelo
+        self._por_nome[modelo.nome].append(posicao)
+        for classe in type(carta).__mro__:
+            if issubclass(classe, Carta) and classe is not Carta:
+                self._por_tipo[classe.__name__].append(posicao)
+                self._classes[classe.__name__] = classe
+        self._por_tipo_magia[modelo.tipo_magia].append(posicao)
+        self._por_custo.adicionar(modelo.custo_mana, posicao)
+        if isinstance(carta, (CartaCriatura, CartaFeitico)):
+            self._por_poder.adicionar(modelo.poder, posicao)
+        if isinstance(carta, CartaCriatura):
+            self._por_resistencia.adicionar(modelo.resistencia, posicao)
+
+    def consultar(self, nome: Optional[str] = None, tipo: Union[Type[Carta], str, None] = None,
+                  tipo_magia: Optional[str] = None, custo_mana: Optional[Faixa] = None,
+                  poder: Optional[Faixa] = None, resistencia: Optional[Faixa] = None) -> List[Carta]:
+        """Devolve, na ordem do catálogo, as cartas que atendem a todos os critérios informados.
+
+        A consulta parte do critério mais seletivo e só confere os demais nas cartas candidatas,
+        então o custo depende do tamanho do resultado, não do tamanho do catálogo.
+        """
+        if isinstance(tipo, type):
+            tipo = tipo.__name__
+        classe_tipo = self._classes.get(tipo) if tipo is not None else None
+        candidatos: List[Tuple[int, str]] = []
+        if nome is not None:
+            candidatos.append((len(self._por_nome.get(nome, ())), "nome"))
+        if tipo is not None:
+            candidatos.append((len(self._por_tipo.get(tipo, ())), "tipo"))
+        if tipo_magia is not None:
+            candidatos.append((len(self._por_tipo_magia.get(tipo_magia, ())), "tipo_magia"))
+        if custo_mana is not None:
+            candidatos.append((self._por_custo.contar(custo_mana), "custo_mana"))
+        if poder is not None:
+            candidatos.append((self._por_poder.contar(poder), "poder"))
+        if resistencia is not None:
+            candidatos.append((self._por_resistencia.contar(resistencia), "resistencia"))
+        if not candidatos:
+            return list(self._cartas)
+
+        _, criterio = min(candidatos)
+        if criterio == "nome":
+            posicoes = self._por_nome.get(nome, [])
+        elif criterio == "tipo":
+            posicoes = self._por_tipo.get(tipo, [])
+        elif criterio == "tipo_magia":
+            posicoes = self._por_tipo_magia.get(tipo_magia, [])
+        elif criterio == "custo_mana":
+            posicoes = self._por_custo.posicoes(custo_mana)
+        elif criterio == "poder":
+            posicoes = self._por_poder.posicoes(poder)
+        else:
+            posicoes = self._por_resistencia.posicoes(resistencia)
+
+        resultado = []
+        for posicao in posicoes:
+            carta = self._cartas[posicao]
+            modelo = carta.modelo
+            if nome is not None and modelo.nome != nome:
+                continue
+            if tipo is not None and not (classe_tipo is not None and isinstance(carta, classe_tipo)):
+                continue
+            if tipo_magia is not None and modelo.tipo_magia != tipo_magia:
+                continue
+            if custo_mana is not None and not self._por_custo.contem(modelo.custo_mana, custo_mana):
+                continue
+            if poder is not None and not (isinstance(carta, (CartaCriatura, CartaFeitico))
+                                          and self._por_poder.contem(modelo.poder, poder)):
+                continue
+            if resistencia is not None and not (isinstance(carta, CartaCriatura)
+                                                and self._por_resistencia.contem(modelo.resistencia, resistencia)):
+                continue
+            resultado.append(carta)
+        return resultado
@@ -0,0 +1,151 @@
+"""Teste de carga do servidor de partidas com muitas sessões simultâneas em localhost.
+
+Cada sessão conecta, pede uma partida e joga com uma regra simples: joga a primeira carta que
+cabe na mana, senão ataca com a primeira criatura, senão passa a vez (e passa se a jogada não
+valer). A latência medida vai do envio de uma jogada até a resposta do servidor, incluindo o
+turno da máquina. Sem `--endereco` nem `--unix`, o servidor é aberto neste mesmo processo, em
+uma porta livre; para medir só o servidor, rode-o à parte e informe o endereço.
+
+    python -m benchmarks.carga_servidor --sessoes 500
+    python -m benchmarks.carga_servidor --sessoes 100 --ia mcts --simulacoes 50
+    python -m benchmarks.carga_servidor --endereco 127.0.0.1:8765 --sessoes 5000 --simultaneas 1000
+
+Muitas sessões simultâneas precisam de um descritor de arquivo por conexão (dois, com o
+servidor no mesmo processo); aumente o limite com `ulimit -n` se necessário.
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from jogo_estrutura.servidor import LIMITE_LINHA, ServidorJogo, estrategia_da_ia, processos_padrao
+from jogo_estrutura.simulacao import carregar_catalogo
+
+Conectar = Callable[[], Awaitable[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]]
+
+def escolher_jogada(estado: dict, nome: str) -> dict:
+    """Jogada do cliente de carga para o estado recebido em "sua_vez"."""
+    eu = next(jogador for jogador in estado["jogadores"] if jogador["nome"] == nome)
+    for indice, carta in enumerate(eu["mao"]):
+        if carta["custo"] <= eu["mana"]:
+            return {"tipo": "jogar", "carta": indice}
+    if eu["campo"]:
+        return {"tipo": "atacar", "atacante": 0}
+    return {"tipo": "passar"}
+
+async def _enviar(escritor: asyncio.StreamWriter, mensagem: dict):
+    escritor.write(json.dumps(mensagem).encode() + b"\n")
+    await escritor.drain()
+
+async def jogar_sessao(conectar: Conectar, nome: str, semente: Optional[int], latencias: List[float]) -> dict:
+    """Joga uma partida pelo servidor e devolve a mensagem "fim"; acrescenta a `latencias` o tempo de cada resposta."""
+    leitor, escritor = await conectar()
+    try:
+        await _enviar(escritor, {"tipo": "nova_partida", "nome": nome, "semente": semente})
+        enviada_em = None
+        while True:
+            linha = await leitor.readline()
+            if not linha:
+                raise ConnectionError("o servidor fechou a conexão")
+            mensagem = json.loads(linha)
+            if enviada_em is not None:
+                latencias.append(time.perf_counter() - enviada_em)
+                enviada_em = None
+            tipo = mensagem["tipo"]
+            if tipo == "fim":
+                return mensagem
+            if tipo == "erro":
+                raise RuntimeError(mensagem["mensagem"])
+            if tipo == "sua_vez":
+                jogada = escolher_jogada(mensagem["estado"], nome)
+            elif tipo == "invalida":
+                jogada = {"tipo": "passar"}
+            else:
+                continue
+            enviada_em = time.perf_counter()
+            await _enviar(escritor, jogada)
+    finally:
+        escritor.close()
+
+def _percentil(ordenadas: List[float], fracao: float) -> float:
+    return ordenadas[min(len(ordenadas) - 1, int(fracao * len(ordenadas)))] if ordenadas else 0.0
+
+async def executar_carga(conectar: Conectar, sessoes: int, simultaneas: Optional[int] = None,
+                         semente: Optional[int] = 1) -> dict:
+    """Joga `sessoes` partidas, no máximo `simultaneas` ao mesmo tempo, e devolve o relatório.
+
+    Com `semente`, a sessão `i` usa a semente `semente + i`.
+    """
+    limite = asyncio.Semaphore(simultaneas or sessoes)
+    latencias: List[float] = []
+
+    async def sessao(indice: int) -> dict:
+        async with limite:
+            return await jogar_sessao(conectar, f"Cliente {indice}", None if semente is None else semente + indice, latencias)
+
+    inicio = time.perf_counter()
+    resultados = await asyncio.gather(*(sessao(indice) for indice in range(sessoes)), return_exceptions=True)
+    duracao = time.perf_counter() - inicio
+
+    fins = [resultado for resultado in resultados if isinstance(resultado, dict)]
+    erros = Counter(type(resultado).__name__ for resultado in resultados if isinstance(resultado, BaseException))
+    ordenadas = sorted(latencias)
+    return {
+        "sessoes": sessoes,
+        "simultaneas": simultaneas or sessoes,
+        "duracao_s": round(duracao, 3),
+        "partidas_s": round(len(fins) / duracao, 1),
+        "jogadas": len(latencias),
+        "jogadas_s": round(len(latencias) / duracao, 1),
+        "erros": dict(erros),
+        "vencedores": dict(Counter("Máquina" if fim["vencedor"] == "Máquina" else ("Cliente" if fim["vencedor"] else "Empate")
+                                   for fim in fins)),
+        "latencia_ms": {nome: round(_percentil(ordenadas, fracao) * 1000, 3)
+                        for nome, fracao in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("maximo", 1.0))},
+    }
+
+async def _principal(args) -> dict:
+    if args.unix:
+        return await executar_carga(lambda: asyncio.open_unix_connection(args.unix, limit=LIMITE_LINHA),
+                                    args.sessoes, args.simultaneas, args.semente)
+    if args.endereco:
+        host, porta = args.endereco.rsplit(":", 1)
+        return await executar_carga(lambda: asyncio.open_connection(host, int(porta), limit=LIMITE_LINHA),
+                                    args.sessoes, args.simultaneas, args.semente)
+
+    processos = processos_padrao(args.ia) if args.processos is None else args.processos
+    servidor = ServidorJogo(carregar_catalogo(args.banco), estrategia_da_ia(args.ia, args.simulacoes), processos,
+                            max_sessoes=args.sessoes)
+    async with servidor.ouvir(porta=0) as ouvinte:
+        porta = ouvinte.sockets[0].getsockname()[1]
+        relatorio = await executar_carga(lambda: asyncio.open_connection("127.0.0.1", porta, limit=LIMITE_LINHA),
+                                         args.sessoes, args.simultaneas, args.semente)
+    relatorio["servidor"] = servidor.estatisticas()
+    del relatorio["servidor"]["tipo"]
+    return relatorio
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessoes", type=int, default=200, help="partidas a jogar, uma por conexão")
+    parser.add_argument("--simultaneas", type=int, default=None, help="conexões abertas ao mesmo tempo (padrão: todas)")
+    parser.add_argument("--semente", type=int, default=1, help="a sessão i joga com a semente SEMENTE + i")
+    parser.add_argument("--endereco", metavar="HOST:PORTA", help="servidor TCP já em execução")
+    parser.add_argument("--unix", metavar="CAMINHO", help="servidor já em execução em um socket Unix")
+    parser.add_argument("--banco", default="cartas_game.csv", help="catálogo do servidor aberto neste processo")
+    parser.add_argument("--ia", choices=("regras", "mcts"), default="regras", help="estratégia da máquina do servidor local")
+    parser.add_argument("--simulacoes", type=int, default=300, help="simulações por jogada da IA mcts")
+    parser.add_argument("--processos", type=int, default=None, help="processos para as decisões da máquina no servidor local")
+    parser.add_argument("--saida", help="grava o relatório JSON neste arquivo")
+    args = parser.parse_args()
+
+    relatorio = asyncio.run(_principal(args))
+    texto = json.dumps(relatorio, ensure_ascii=False, indent=2)
+    print(texto)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Mede o tempo de importação a frio do pacote `jogador`.
+
+Cada medição roda `python -c "import jogador"` em um processo novo e desconta o tempo de
+um interpretador vazio, para isolar o custo do próprio pacote.
+
+    python -m benchmarks.importacao --repeticoes 20 --limite-ms 80
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _tempo_processo(codigo: str) -> float:
+    inicio = time.perf_counter()
+    subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, check=True)
+    return time.perf_counter() - inicio
+
+def medir_importacao(modulo: str = "jogador", repeticoes: int = 10) -> dict:
+    """Devolve a mediana, em milissegundos, da importação a frio de `modulo`."""
+    vazio = statistics.median(_tempo_processo("pass") for _ in range(repeticoes))
+    com_modulo = statistics.median(_tempo_processo(f"import {modulo}") for _ in range(repeticoes))
+    return {
+        "modulo": modulo,
+        "repeticoes": repeticoes,
+        "interpretador_ms": round(vazio * 1000, 2),
+        "importacao_ms": round((com_modulo - vazio) * 1000, 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modulo", default="jogador")
+    parser.add_argument("--repeticoes", type=int, default=10)
+    parser.add_argument("--limite-ms", type=float, help="falha se a importação passar deste tempo")
+    args = parser.parse_args()
+
+    resultado = medir_importacao(args.modulo, args.repeticoes)
+    print(json.dumps(resultado, ensure_ascii=False))
+    if args.limite_ms is not None and resultado["importacao_ms"] > args.limite_ms:
+        sys.exit(f"Importação de {args.modulo} levou {resultado['importacao_ms']} ms (limite: {args.limite_ms} ms)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""Mede os caminhos mais usados do motor do jogo e compara com uma base gravada.
+
+Cada caso é executado várias vezes e o resultado é a mediana, em milissegundos por
+chamada. A preparação de cada repetição (montar a mão, restaurar o campo) fica fora da
+medição. Com `--base`, os casos que ficarem mais lentos que a base além da tolerância são
+listados e o comando termina com erro. A comparação é manual: a integração contínua não a
+executa, porque a base só vale para a máquina e a versão do Python em que foi gravada.
+
+    python -m benchmarks.motor --saida resultado.json --base benchmarks/base_motor.json
+    python -m benchmarks.motor --filtro ia --repeticoes 50
+    python -m benchmarks.motor --gravar-base benchmarks/base_motor.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from banco import banco_de_dados
+from banco.banco_de_dados import BancoSimulado, ler_csv
+from banco.cartas import CartaCriatura, CartaFeitico
+from jogador import Jogador
+from jogador.jogador_ia import JogadorIA
+from jogo_estrutura.historico import Historico
+from jogo_estrutura.jogo import Jogo
+from jogo_estrutura.simulacao import simular_partida
+import jogo_estrutura.utils as utils
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ARQUIVO_CSV = "cartas_game.csv"
+TAMANHOS = (10, 100, 1000)
+
+def medir(funcao: Callable[[], object], repeticoes: int, preparar: Optional[Callable[[], object]] = None) -> dict:
+    """Executa `funcao` `repeticoes` vezes e devolve a mediana e o mínimo, em milissegundos.
+
+    `preparar` roda antes de cada repetição, fora do tempo medido.
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        if preparar is not None:
+            preparar()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return {
+        "mediana_ms": round(statistics.median(tempos) * 1000, 4),
+        "minimo_ms": round(min(tempos) * 1000, 4),
+        "repeticoes": repeticoes,
+    }
+
+def _catalogo() -> List:
+    return BancoSimulado(ARQUIVO_CSV).obter_cartas()
+
+def caso_catalogo(repeticoes: int) -> Dict[str, dict]:
+    """Carga do catálogo: leitura do CSV, cache em disco e cache em memória."""
+    banco = BancoSimulado(ARQUIVO_CSV)
+    caminho = os.path.join(RAIZ, "banco", ARQUIVO_CSV)
+    return {
+        "catalogo/csv": medir(lambda: ler_csv(caminho), repeticoes),
+        "catalogo/cache_disco": medir(banco.carregar_cartas, repeticoes, preparar=banco_de_dados._catalogos.clear),
+        "catalogo/memoria": medir(banco.carregar_cartas, repeticoes),
+    }
+
+def caso_baralhos(repeticoes: int) -> Dict[str, dict]:
+    """Montagem dos baralhos dos dois jogadores por `Jogo.distribuir_baralhos`."""
+    cartas = _catalogo()
+    resultados = {}
+    for tamanho in (30, 3000):
+        jogo = None
+
+        def preparar():
+            nonlocal jogo
+            jogo = Jogo([Jogador("A", eh_humano=False), Jogador("B", eh_humano=False)],
+                        tamanho_baralho=tamanho, semente=1)
+
+        resultados[f"baralhos/{tamanho}"] = medir(lambda: jogo.distribuir_baralhos(cartas), repeticoes, preparar)
+    return resultados
+
+def caso_partidas(repeticoes: int) -> Dict[str, dict]:
+    """Partidas completas IA contra IA, sem saída; inclui partidas por segundo."""
+    cartas = _catalogo()
+    sementes = iter(range(10 ** 9))
+    resultado = medir(lambda: simular_partida(cartas, semente=next(sementes)), repeticoes)
+    resultado["partidas_s"] = round(1000 / resultado["mediana_ms"], 1)
+    return {"partidas/ia_contra_ia": resultado}
+
+def _criaturas(quantidade: int, poder: int, resistencia: int, custo: int = 1) -> List[CartaCriatura]:
+    return [CartaCriatura(f"Criatura {i}", custo, "", poder, resistencia) for i in range(quantidade)]
+
+def caso_ia(repeticoes: int) -> Dict[str, dict]:
+    """Latência de `JogadorIA.escolher_acao` pelo tamanho da mão e dos campos.
+
+    A mão só tem criaturas caras demais, então a IA percorre a mão inteira e acaba atacando
+    a criatura de menor resistência do adversário.
+    """
+    resultados = {}
+    for tamanho in TAMANHOS:
+        eu, adversario = Jogador("IA", eh_humano=False), Jogador("Adversário", eh_humano=False)
+        jogo = Jogo([eu, adversario], politica_historico=Historico.DESLIGADO, semente=1)
+        eu.mao = _criaturas(tamanho, 1, 1, custo=99)
+        eu.campo_de_batalha = _criaturas(tamanho, 2, 5)
+        adversario.campo_de_batalha = _criaturas(tamanho, 1, 50)
+        estado = jogo.capturar()
+        ia = JogadorIA(eu)
+
+        def preparar():
+            # Os índices do campo são mantidos de um turno para o outro; restaurar os refaz do zero.
+            jogo.restaurar(estado)
+            eu.campo_de_batalha.mais_forte()
+            adversario.campo_de_batalha.mais_fraca()
+
+        resultados[f"ia/escolher_acao/{tamanho}"] = medir(lambda: ia.escolher_acao(adversario, jogo), repeticoes, preparar)
+    return resultados
+
+def caso_dano_coletivo(repeticoes: int) -> Dict[str, dict]:
+    """`_dano_coletivo` em campos grandes: todas sobrevivem, todas morrem ou morre uma a cada duas."""
+    feitico = CartaFeitico("Terremoto", 0, "", "dano_coletivo", 2, False, True)
+    resultados = {}
+    for tamanho in TAMANHOS + (10000,):
+        for situacao, resistencias in (("sobrevivem", (100,)), ("morrem", (1,)), ("alternadas", (100, 1))):
+            adversario = Jogador("Adversário", eh_humano=False)
+            criaturas = _criaturas(tamanho, 1, 1)
+
+            def preparar():
+                for i, criatura in enumerate(criaturas):
+                    criatura.resistencia = resistencias[i % len(resistencias)]
+                adversario.campo_de_batalha = list(criaturas)
+                adversario.cemiterio = []
+
+            resultados[f"dano_coletivo/{situacao}/{tamanho}"] = medir(
+                lambda: feitico._dano_coletivo(adversario), repeticoes, preparar)
+    return resultados
+
+def caso_buff_coletivo(repeticoes: int) -> Dict[str, dict]:
+    """`_buffar_coletivo` em campos grandes já indexados, como os da IA durante a partida."""
+    feitico = CartaFeitico("Escudo", 0, "", "buff_coletivo", 1)
+    resultados = {}
+    for tamanho in TAMANHOS + (10000,):
+        jogador = Jogador("Jogador", eh_humano=False)
+        jogador.campo_de_batalha = _criaturas(tamanho, 1, 1)
+
+        def preparar():
+            jogador.campo_de_batalha.mais_fraca()
+            jogador.campo_de_batalha.mais_forte()
+
+        resultados[f"buff_coletivo/{tamanho}"] = medir(lambda: feitico._buffar_coletivo(jogador), repeticoes, preparar)
+    return resultados
+
+def caso_jogadas(repeticoes: int) -> Dict[str, dict]:
+    """`jogar_carta` com uma mão de 1000 cartas do catálogo, de cada classe, jogadas da última para a primeira.
+
+    Os feitiços coletivos e o de reviver ficam de fora, porque o custo deles cresce com o
+    campo; o que se mede é a resolução da jogada e do efeito.
+    """
+    cartas = [carta for carta in _catalogo() if carta.tipo_magia not in ("buff_coletivo", "dano_coletivo", "revive")]
+    mao = [cartas[i % len(cartas)] for i in range(1000)]
+    eu, adversario = Jogador("Jogador", eh_humano=False), Jogador("Adversário", eh_humano=False)
+    jogo = Jogo([eu, adversario], politica_historico=Historico.DESLIGADO, semente=1)
+
+    def preparar():
+        eu.mao = [carta.nova_copia() for carta in mao]
+        eu.campo_de_batalha = []
+        eu.mana, eu.saude, adversario.saude = 10 ** 6, 10 ** 6, 10 ** 6
+
+    def jogar():
+        for indice in range(len(mao) - 1, -1, -1):
+            eu.jogar_carta(indice, jogador_alvo=adversario, jogo=jogo)
+
+    return {"jogadas/1000": medir(jogar, repeticoes, preparar)}
+
+CASOS: Dict[str, Callable[[int], Dict[str, dict]]] = {
+    "catalogo": caso_catalogo,
+    "baralhos": caso_baralhos,
+    "partidas": caso_partidas,
+    "ia": caso_ia,
+    "dano_coletivo": caso_dano_coletivo,
+    "buff_coletivo": caso_buff_coletivo,
+    "jogadas": caso_jogadas,
+}
+
+def executar(repeticoes: int = 20, filtro: Optional[str] = None) -> dict:
+    """Executa os casos (os que contêm `filtro` no nome, se informado) e devolve o relatório."""
+    resultados = {}
+    with utils.modo_headless():
+        for nome, caso in CASOS.items():
+            if filtro is None or filtro in nome:
+                resultados.update(caso(repeticoes))
+    return {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+        "resultados": resultados,
+    }
+
+def comparar(atual: dict, base: dict, tolerancia: float = 0.25) -> List[str]:
+    """Lista os casos em que a mediana de `atual` passou da base em mais de `tolerancia` (0.25 = 25%).
+
+    Casos que só existem em um dos relatórios são ignorados.
+    """
+    regressoes = []
+    for nome, medida in sorted(atual["resultados"].items()):
+        referencia = base["resultados"].get(nome)
+        if referencia is None:
+            continue
+        razao = medida["mediana_ms"] / max(referencia["mediana_ms"], 1e-9)
+        if razao > 1 + tolerancia:
+            regressoes.append(f"{nome}: {medida['mediana_ms']} ms (base {referencia['mediana_ms']} ms, {razao:.2f}x)")
+    return regressoes
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    parser.add_argument("--filtro", help="executa só os casos cujo nome contém este texto")
+    parser.add_argument("--saida", help="grava o relatório JSON neste arquivo")
+    parser.add_argument("--base", help="relatório JSON usado como referência")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="aumento aceito sobre a base (0.25 = 25%%)")
+    parser.add_argument("--gravar-base", metavar="ARQUIVO", help="grava o relatório como nova base")
+    args = parser.parse_args()
+
+    relatorio = executar(args.repeticoes, args.filtro)
+    texto = json.dumps(relatorio, ensure_ascii=False, indent=2)
+    print(texto)
+    for caminho in (args.saida, args.gravar_base):
+        if caminho:
+            with open(caminho, "w", encoding="utf-8") as arquivo:
+                arquivo.write(texto + "\n")
+
+    if args.base:
+        with open(args.base, encoding="utf-8") as arquivo:
+            regressoes = comparar(relatorio, json.load(arquivo), args.tolerancia)
+        if regressoes:
+            sys.exit("Casos mais lentos que a base:\n  " + "\n  ".join(regressoes))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import random
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from banco.cartas import Carta
+
+class EstadoBaralho(NamedTuple):
+    """Fotografia das cartas restantes de um baralho, usada por `Baralho.restaurar`."""
+    cartas: Tuple[Carta, ...]
+    definidas: int
+    fim_embaralhado: int
+    rng: random.Random  # ou o próprio módulo `random`
+
+class Baralho:
+    """Pilha de compra do jogador.
+
+    As cartas ficam em uma lista cujo topo avança a cada compra, então comprar custa O(1)
+    mesmo em baralhos com dezenas de milhares de cartas. Embaralhar também é O(1): a ordem
+    das cartas restantes só é sorteada (Fisher-Yates incremental) quando uma delas precisa
+    ser revelada, seja por uma compra ou por `topo`.
+    """
+    # Abaixo deste tamanho não vale a pena descartar as posições já compradas da lista.
+    _COMPACTAR_APOS = 1024
+
+    def __init__(self, cartas: Iterable[Carta] = ()):
+        self._cartas: List[Optional[Carta]] = list(cartas)
+        self._topo = 0       # posição da próxima carta a ser comprada
+        self._definidas = 0  # até aqui a ordem já foi sorteada
+        self._fim_embaralhado = 0  # cartas entre `_definidas` e este limite ainda não têm ordem definida
+        self._rng = random
+
+    def __len__(self) -> int:
+        return len(self._cartas) - self._topo
+
+    def __iter__(self) -> Iterator[Carta]:
+        """Percorre as cartas restantes. A ordem da parte ainda não sorteada não é a ordem de compra."""
+        for indice in range(self._topo, len(self._cartas)):
+            yield self._cartas[indice]
+
+    def append(self, carta: Carta):
+        """Coloca uma carta no fundo do baralho."""
+        self._cartas.append(carta)
+
+    def extend(self, cartas: Iterable[Carta]):
+        """Coloca várias cartas no fundo do baralho, na ordem dada."""
+        self._cartas.extend(cartas)
+
+    def embaralhar(self, rng: Optional[random.Random] = None):
+        """Embaralha as cartas restantes; o sorteio acontece aos poucos, conforme as cartas são reveladas."""
+        if rng is not None:
+            self._rng = rng
+        self._definidas = self._topo
+        self._fim_embaralhado = len(self._cartas)
+
+    def comprar(self) -> Optional[Carta]:
+        """Retira e devolve a carta do topo, ou None se o baralho estiver vazio."""
+        if self._topo >= len(self._cartas):
+            return None
+        self._definir_ordem(self._topo + 1)
+        carta = self._cartas[self._topo]
+        self._cartas[self._topo] = None
+        self._topo += 1
+        if self._topo > self._COMPACTAR_APOS and self._topo * 2 > len(self._cartas):
+            self._compactar()
+        return carta
+
+    def topo(self, quantidade: int = 1) -> List[Carta]:
+        """Devolve, sem comprar, as próximas `quantidade` cartas na ordem de compra."""
+        fim = min(self._topo + quantidade, len(self._cartas))
+        self._definir_ordem(fim)
+        return self._cartas[self._topo:fim]
+
+    def buscar(self, criterio: Callable[[Carta], bool]) -> Optional[Carta]:
+        """Procura no baralho uma carta que satisfaça `criterio`, retira-a e a devolve.
+
+        As cartas cuja ordem já está definida são examinadas na ordem de compra; entre as
+        que ainda não foram sorteadas qualquer uma pode ser a encontrada.
+        """
+        for indice in range(self._topo, len(self._cartas)):
+            carta = self._cartas[indice]
+            if criterio(carta):
+                del self._cartas[indice]
+                if indice < self._definidas:
+                    self._definidas -= 1
+                if indice < self._fim_embaralhado:
+                    self._fim_embaralhado -= 1
+                return carta
+        return None
+
+    def capturar(self) -> EstadoBaralho:
+        """Guarda as cartas restantes, na ordem atual, e o progresso do embaralhamento."""
+        topo = self._topo
+        return EstadoBaralho(tuple(self._cartas[topo:]), max(self._definidas - topo, 0),
+                             max(self._fim_embaralhado - topo, 0), self._rng)
+
+    def restaurar(self, estado: EstadoBaralho):
+        """Volta o baralho para um estado guardado por `capturar`."""
+        self._cartas = list(estado.cartas)
+        self._topo = 0
+        self._definidas = estado.definidas
+        self._fim_embaralhado = estado.fim_embaralhado
+        self._rng = estado.rng
+
+    def clonar(self, copiar: Callable[[Carta], Carta], rng: Optional[random.Random] = None) -> "Baralho":
+        """Cria um baralho independente com as cartas restantes, passadas por `copiar`.
+
+        Com `rng`, o clone passa a sortear a ordem das cartas com esse gerador.
+        """
+        estado = self.capturar()
+        clone = Baralho()
+        clone.restaurar(estado._replace(cartas=[copiar(carta) for carta in estado.cartas], rng=rng or estado.rng))
+        return clone
+
+    def _definir_ordem(self, ate: int):
+        """Sorteia as posições ainda indefinidas até `ate` (exclusivo)."""
+        cartas = self._cartas
+        limite = min(ate, self._fim_embaralhado)
+        while self._definidas < limite:
+            posicao = self._definidas
+            escolhida = self._rng.randrange(posicao, self._fim_embaralhado)
+            cartas[posicao], cartas[escolhida] = cartas[escolhida], cartas[posicao]
+            self._definidas += 1
+        if self._definidas < ate:
+            self._definidas = ate
+
+    def _compactar(self):
+        del self._cartas[:self._topo]
+        self._definidas -= self._topo
+        self._fim_embaralhado = max(self._fim_embaralhado - self._topo, 0)
+        self._topo = 0
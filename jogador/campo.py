@@ -0,0 +1,181 @@
+import contextlib
+import heapq
+from typing import Iterable, Iterator, List, Optional
+from banco.cartas import CartaCriatura
+
+class CampoDeBatalha:
+    """Criaturas em jogo de um jogador, na ordem em que entraram.
+
+    Remover uma criatura é O(1): a posição dela vira um buraco, e os buracos só são
+    compactados quando alguém precisa das posições (`campo[i]`, `index`). Cada criatura
+    sabe em que campo está e em que posição, e avisa o campo quando o poder ou a
+    resistência mudam; assim os heaps de `mais_fraca` e `mais_forte` ficam atualizados sem
+    percorrer o campo. Os heaps só são montados na primeira consulta e as entradas antigas
+    são descartadas quando chegam ao topo.
+
+    Efeitos em todo o campo rodam dentro de `em_lote()`: as mudanças não atualizam os heaps e
+    as remoções não compactam; tudo isso é feito uma vez só no fim do bloco.
+    """
+    __slots__ = ("_cartas", "_buracos", "_proxima", "_por_resistencia", "_por_poder", "_entradas",
+                 "_em_lote", "_mudou_em_lote")
+
+    def __init__(self, cartas: Iterable[CartaCriatura] = ()):
+        self._cartas: List[Optional[CartaCriatura]] = []
+        self._buracos = 0
+        self._proxima = 0  # sequência da próxima criatura; desempata pela ordem de entrada
+        self._por_resistencia: Optional[list] = None  # heap de (resistência, seq, entrada, criatura)
+        self._por_poder: Optional[list] = None        # heap de (-poder, seq, entrada, criatura)
+        self._entradas = 0
+        self._em_lote = False
+        self._mudou_em_lote = False
+        self.extend(cartas)
+
+    def __len__(self) -> int:
+        return len(self._cartas) - self._buracos
+
+    def __iter__(self) -> Iterator[CartaCriatura]:
+        # Filtra os buracos mesmo sem nenhum agora: uma criatura pode sair durante a iteração.
+        return (carta for carta in self._cartas if carta is not None)
+
+    def __getitem__(self, indice):
+        self._compactar()
+        return self._cartas[indice]
+
+    def __contains__(self, carta) -> bool:
+        return getattr(carta, "_campo", None) is self
+
+    def __eq__(self, outro) -> bool:
+        if isinstance(outro, (CampoDeBatalha, list)):
+            return list(self) == list(outro)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"CampoDeBatalha({list(self)!r})"
+
+    def append(self, carta: CartaCriatura):
+        """Põe a criatura no fim do campo; se ela estava em outro campo, sai de lá."""
+        if carta._campo is not None:
+            carta._campo.remove(carta)
+        carta._campo = self
+        carta._posicao = len(self._cartas)
+        carta._seq = self._proxima
+        self._proxima += 1
+        self._cartas.append(carta)
+        self._indexar(carta)
+
+    def extend(self, cartas: Iterable[CartaCriatura]):
+        for carta in cartas:
+            self.append(carta)
+
+    def remove(self, carta: CartaCriatura):
+        """Tira a criatura do campo em O(1)."""
+        if getattr(carta, "_campo", None) is not self:
+            raise ValueError(f"{carta!r} não está no campo de batalha")
+        self._cartas[carta._posicao] = None
+        carta._campo = None
+        self._buracos += 1
+        if not self._em_lote and self._buracos > 32 and self._buracos > len(self):
+            self._compactar()
+
+    def remover_todas(self, cartas: Iterable[CartaCriatura]):
+        """Tira várias criaturas do campo com uma única compactação."""
+        with self.em_lote():
+            for carta in cartas:
+                self.remove(carta)
+
+    @contextlib.contextmanager
+    def em_lote(self):
+        """Agrupa as mudanças de um efeito que atinge o campo inteiro.
+
+        Dentro do bloco, mudanças de poder e resistência não entram nos heaps e as remoções
+        só deixam buracos. Na saída, se algo mudou, os heaps são descartados (e remontados na
+        próxima consulta, em O(n)) e os buracos são compactados de uma vez.
+        """
+        if self._em_lote:
+            yield self
+            return
+        self._em_lote = True
+        try:
+            yield self
+        finally:
+            self._em_lote = False
+            if self._mudou_em_lote:
+                self._mudou_em_lote = False
+                self._por_resistencia = self._por_poder = None
+                self._entradas = 0
+            self._compactar()
+
+    def pop(self, indice: int = -1) -> CartaCriatura:
+        carta = self[indice]
+        self.remove(carta)
+        return carta
+
+    def index(self, carta: CartaCriatura) -> int:
+        if getattr(carta, "_campo", None) is not self:
+            raise ValueError(f"{carta!r} não está no campo de batalha")
+        self._compactar()
+        return carta._posicao
+
+    def clear(self):
+        for carta in self:
+            carta._campo = None
+        self._cartas = []
+        self._buracos = 0
+        self._por_resistencia = self._por_poder = None
+
+    def mais_fraca(self) -> Optional[CartaCriatura]:
+        """A primeira criatura, na ordem do campo, com a menor resistência; None se o campo estiver vazio."""
+        if self._por_resistencia is None:
+            self._por_resistencia = self._montar(lambda carta: carta.resistencia)
+        return self._topo(self._por_resistencia, lambda carta: carta.resistencia)
+
+    def mais_forte(self) -> Optional[CartaCriatura]:
+        """A primeira criatura, na ordem do campo, com o maior poder; None se o campo estiver vazio."""
+        if self._por_poder is None:
+            self._por_poder = self._montar(lambda carta: -carta.poder)
+        return self._topo(self._por_poder, lambda carta: -carta.poder)
+
+    def _atributos_mudaram(self, carta: CartaCriatura):
+        """Chamado pela criatura quando o poder ou a resistência mudam."""
+        if self._por_resistencia is None and self._por_poder is None:
+            return
+        if self._em_lote:
+            self._mudou_em_lote = True
+            return
+        self._indexar(carta)
+        # Entradas antigas se acumulam a cada mudança; acima do dobro do campo, os heaps são refeitos.
+        if self._entradas > 2 * len(self) + 64:
+            self._por_resistencia = self._por_poder = None
+            self._entradas = 0
+
+    def _indexar(self, carta: CartaCriatura):
+        if self._por_resistencia is not None:
+            heapq.heappush(self._por_resistencia, (carta.resistencia, carta._seq, self._entradas, carta))
+            self._entradas += 1
+        if self._por_poder is not None:
+            heapq.heappush(self._por_poder, (-carta.poder, carta._seq, self._entradas, carta))
+            self._entradas += 1
+
+    def _montar(self, chave) -> list:
+        heap = []
+        for carta in self:
+            heap.append((chave(carta), carta._seq, self._entradas, carta))
+            self._entradas += 1
+        heapq.heapify(heap)
+        return heap
+
+    def _topo(self, heap: list, chave) -> Optional[CartaCriatura]:
+        while heap:
+            valor, seq, _, carta = heap[0]
+            if carta._campo is self and carta._seq == seq and chave(carta) == valor:
+                return carta
+            heapq.heappop(heap)
+        return None
+
+    def _compactar(self):
+        if not self._buracos:
+            return
+        self._cartas = [carta for carta in self._cartas if carta is not None]
+        for posicao, carta in enumerate(self._cartas):
+            carta._posicao = posicao
+        self._buracos = 0
@@ -1,38 +1,149 @@
-from typing import List
+import copy
+from itertools import chain
+from typing import Callable, Iterable, List, NamedTuple, Tuple
 from banco.cartas import Carta, CartaCriatura
+from jogo_estrutura import eventos
 from .jogador_acao import JogadorAcao
 from .jogador_combate import JogadorCombate
 from .jogador_tabuleiro import JogadorTabuleiro
 from .jogador_ia import JogadorIA
+from .baralho import Baralho, EstadoBaralho
+from .campo import CampoDeBatalha
+from .mao import Mao
+
+class EstadoJogador(NamedTuple):
+    """Fotografia compacta de um jogador, usada por `Jogador.restaurar`.
+
+    Guarda referências às cartas (não cópias) e, em `atributos`, o poder e a resistência
+    das criaturas no campo e no cemitério, as únicas que podem ter sido alteradas.
+    """
+    saude: int
+    mana: int
+    baralho: EstadoBaralho
+    mao: Tuple[Carta, ...]
+    campo_de_batalha: Tuple[CartaCriatura, ...]
+    cemiterio: Tuple[Carta, ...]
+    atributos: Tuple[Tuple[CartaCriatura, int, int], ...]
+
+def _copiar_carta(carta: Carta) -> Carta:
+    # Só as criaturas têm estado alterado durante a partida; as demais cartas podem ser compartilhadas.
+    return copy.copy(carta) if isinstance(carta, CartaCriatura) else carta
 
 class Jogador(JogadorAcao, JogadorCombate, JogadorTabuleiro):
     """
     Classe principal do jogador que combina ações, combate e exibição do tabuleiro.
     """
-    def __init__(self, nome: str, eh_humano: bool = True):
+    def __init__(self, nome: str, eh_humano: bool = True, estrategia: Callable = JogadorIA):
         self.nome = nome
         self.saude = 20
         self.mana = 0
-        self.baralho: List[Carta] = []
-        self.mao: List[Carta] = []
-        self.campo_de_batalha: List[CartaCriatura] = []
+        self.baralho = Baralho()
+        self.mao = Mao()
+        self.campo_de_batalha = CampoDeBatalha()
         self.cemiterio: List[Carta] = []
         self.eh_humano = eh_humano
+        # Fábrica do controlador usado quando o jogador não é humano: recebe o jogador e
+        # devolve um objeto com `escolher_acao(jogador_alvo, jogo)`, como `JogadorIA`.
+        self.estrategia = estrategia
+
+    @property
+    def estrategia(self) -> Callable:
+        return self._estrategia
+
+    @estrategia.setter
+    def estrategia(self, estrategia: Callable):
+        self._estrategia = estrategia
+        self._controlador = None
+
+    @property
+    def controlador(self):
+        """Controlador da máquina, criado pela estratégia na primeira jogada e reaproveitado depois."""
+        if self._controlador is None:
+            self._controlador = self._estrategia(self)
+        return self._controlador
+
+    @property
+    def campo_de_batalha(self) -> CampoDeBatalha:
+        return self._campo_de_batalha
+
+    @campo_de_batalha.setter
+    def campo_de_batalha(self, criaturas: Iterable[CartaCriatura]):
+        if not isinstance(criaturas, CampoDeBatalha):
+            criaturas = CampoDeBatalha(criaturas)
+        self._campo_de_batalha = criaturas
+
+    @property
+    def mao(self) -> Mao:
+        return self._mao
+
+    @mao.setter
+    def mao(self, cartas: Iterable[Carta]):
+        self._mao = cartas if isinstance(cartas, Mao) else Mao(cartas)
+
+    @property
+    def baralho(self) -> Baralho:
+        return self._baralho
+
+    @baralho.setter
+    def baralho(self, cartas: Iterable[Carta]):
+        self._baralho = cartas if isinstance(cartas, Baralho) else Baralho(cartas)
+
+    def capturar(self) -> EstadoJogador:
+        """Guarda o estado do jogador para ser restaurado depois com `restaurar`."""
+        atributos = [(carta, carta.poder, carta.resistencia) for carta in self.campo_de_batalha]
+        atributos += [(carta, carta.poder, carta.resistencia) for carta in self.cemiterio if isinstance(carta, CartaCriatura)]
+        return EstadoJogador(self.saude, self.mana, self._baralho.capturar(), tuple(self.mao),
+                             tuple(self.campo_de_batalha), tuple(self.cemiterio), tuple(atributos))
+
+    def restaurar(self, estado: EstadoJogador):
+        """Volta o jogador para um estado guardado por `capturar`.
+
+        Uma criatura só é alterada no campo e de lá só vai para o cemitério, então basta
+        devolver ao modelo as criaturas que estão nesses dois lugares agora e reaplicar os
+        atributos guardados.
+        """
+        for carta in chain(self.campo_de_batalha, self.cemiterio):
+            if isinstance(carta, CartaCriatura):
+                carta.poder = carta.modelo.poder
+                carta.resistencia = carta.modelo.resistencia
+        for carta, poder, resistencia in estado.atributos:
+            carta.poder = poder
+            carta.resistencia = resistencia
+        self.saude = estado.saude
+        self.mana = estado.mana
+        self._baralho.restaurar(estado.baralho)
+        self.mao = list(estado.mao)
+        self.campo_de_batalha = list(estado.campo_de_batalha)
+        self.cemiterio = list(estado.cemiterio)
+
+    def clonar(self, rng=None) -> "Jogador":
+        """Cria um jogador independente com o mesmo estado.
+
+        As criaturas são copiadas e as demais cartas, que não mudam, são compartilhadas.
+        `rng` substitui o gerador usado pelo baralho do clone.
+        """
+        clone = copy.copy(self)
+        clone._controlador = None
+        clone._baralho = self._baralho.clonar(_copiar_carta, rng)
+        clone.mao = [_copiar_carta(carta) for carta in self.mao]
+        clone.campo_de_batalha = [copy.copy(carta) for carta in self.campo_de_batalha]
+        clone.cemiterio = [_copiar_carta(carta) for carta in self.cemiterio]
+        return clone
 
     def comprar_carta(self):
         """Compra uma carta do baralho."""
-        if not self.baralho:
-            print(f"{self.nome} não pode comprar uma carta, o baralho está vazio!")
+        carta = self.baralho.comprar()
+        if carta is None:
+            eventos.emitir(eventos.BaralhoVazio(self.nome))
             return None
-        carta = self.baralho.pop(0)
         self.mao.append(carta)
-        print(f"{self.nome} comprou a carta: {carta.nome}.")
+        eventos.emitir(eventos.CartaComprada(self.nome, carta.nome))
         return carta
 
     def receber_dano(self, quantidade: int):
         """Recebe dano."""
         self.saude -= quantidade
-        print(f"{self.nome} recebe {quantidade} de dano. Saúde restante: {self.saude}")
+        eventos.emitir(eventos.JogadorRecebeDano(self.nome, quantidade, self.saude))
 
     def mostrar_cemiterio(self):
         """Exibe todas as cartas no cemitério do jogador."""
@@ -52,5 +163,4 @@ class Jogador(JogadorAcao, JogadorCombate, JogadorTabuleiro):
         if self.eh_humano:
             super().escolher_acao(jogador_alvo, jogo)
         else:
-            ia = JogadorIA(self)
-            ia.escolher_acao(jogador_alvo, jogo)
+            self.controlador.escolher_acao(jogador_alvo, jogo)
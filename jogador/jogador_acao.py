@@ -1,72 +1,118 @@
-from banco.cartas import Carta, CartaCriatura, CartaFeitico, CartaFeiticoRevive, CartaTerreno, CartaAleatoria
-from jogo_estrutura.constantes import CRIATURAS_DISPONIVEIS
+import random
+from banco.cartas import EFEITOS, Carta, CartaCriatura, CartaFeitico, CartaFeiticoRevive, CartaTerreno, CartaAleatoria
+from jogo_estrutura import eventos
+from jogo_estrutura.historico import AcaoHistorico
 
 class JogadorAcao:
     """Define as ações de cartas que um jogador pode realizar."""
     
     def jogar_carta(self, indice_carta: int, alvo=None, jogador_alvo=None, jogo=None) -> bool:
         """Joga uma carta da mão."""
+        if jogo is None or (jogo.gravacao is None and jogo.perfil is None):
+            return self._jogar_carta(indice_carta, alvo, jogador_alvo, jogo)
+        gravacao, perfil = jogo.gravacao, jogo.perfil
+        if gravacao is not None:
+            # O alvo é gravado pela posição no campo do adversário antes da jogada, que pode removê-lo.
+            indice_alvo = jogador_alvo.campo_de_batalha.index(alvo) if alvo is not None and jogador_alvo else None
+        if perfil is None:
+            jogou = self._jogar_carta(indice_carta, alvo, jogador_alvo, jogo)
+        else:
+            feitico = self._indice_valido(indice_carta, self.mao) and isinstance(self.mao[indice_carta], CartaFeitico)
+            with perfil.fase("feiticos" if feitico else "cartas"):
+                jogou = self._jogar_carta(indice_carta, alvo, jogador_alvo, jogo)
+            if jogou:
+                perfil.contar("cartas_jogadas")
+                if feitico:
+                    perfil.contar("feiticos_lancados")
+        if jogou and gravacao is not None:
+            gravacao.jogar(indice_carta, indice_alvo, jogador_alvo is not None)
+        return jogou
+
+    def _jogar_carta(self, indice_carta: int, alvo, jogador_alvo, jogo) -> bool:
         if not self._indice_valido(indice_carta, self.mao):
-            print("Índice de carta inválido.")
+            eventos.emitir(eventos.IndiceInvalido("carta"))
             return False
 
         carta: Carta = self.mao[indice_carta]
+        # Os sorteios das cartas usam o gerador da partida; sem partida, o gerador global.
+        rng = jogo.rng if jogo else random
+        jogada = _JOGADAS.get(type(carta)) or _jogada_da_classe(type(carta))
+        return jogada(self, indice_carta, carta, alvo, jogador_alvo, jogo, rng)
 
-        if isinstance(carta, CartaFeiticoRevive) and not self.cemiterio:
-            print(f"Não é possível utilizar {carta.nome} pois o cemitério está vazio!")
-            return False
+    # As jogadas leem os dados fixos direto do modelo, sem passar pelas propriedades da carta.
 
-        if isinstance(carta, CartaCriatura):
-            if self.mana >= carta.custo_mana:
-                self.mana -= carta.custo_mana
-                self.campo_de_batalha.append(carta)
-                self.mao.pop(indice_carta)
-                print(f"{self.nome} jogou {carta.nome}.")
-                if jogo:
-                    jogo.historico.append(f"Rodada {jogo.turno + 1} - {self.nome}: Jogou {carta.nome}")
-                return True
-            else:
-                print(f"Mana insuficiente para jogar {carta.nome}.")
-                return False
+    def _jogar_criatura(self, indice_carta, carta, alvo, jogador_alvo, jogo, rng) -> bool:
+        modelo = carta.modelo
+        if self.mana < modelo.custo_mana:
+            eventos.emitir(eventos.ManaInsuficiente(modelo.nome, "jogar"))
+            return False
+        self.mana -= modelo.custo_mana
+        self.campo_de_batalha.append(carta)
+        self.mao.pop(indice_carta)
+        eventos.emitir(eventos.CriaturaJogada(self.nome, modelo.nome))
+        if jogo:
+            jogo.historico.registrar(jogo.turno + 1, self.nome, AcaoHistorico.JOGOU, modelo)
+        return True
 
-        if isinstance(carta, CartaTerreno):
-            if self.mana >= carta.custo_mana:
-                self.mana -= carta.custo_mana
-            print(f"{self.nome} joga o terreno {carta.nome}.")
-            carta.ativar_efeito(self)
-            self.mao.pop(indice_carta)
-            if jogo:
-                jogo.historico.append(f"Rodada {jogo.turno + 1} - {self.nome}: Jogou {carta.nome}")
-            return True
+    def _jogar_terreno(self, indice_carta, carta, alvo, jogador_alvo, jogo, rng) -> bool:
+        modelo = carta.modelo
+        if self.mana >= modelo.custo_mana:
+            self.mana -= modelo.custo_mana
+        eventos.emitir(eventos.TerrenoJogado(self.nome, modelo.nome))
+        EFEITOS[modelo.opcodes[0]](carta, self, None, None, rng)
+        self.mao.pop(indice_carta)
+        if jogo:
+            jogo.historico.registrar(jogo.turno + 1, self.nome, AcaoHistorico.JOGOU, modelo)
+        return True
 
-        if isinstance(carta, CartaAleatoria):
-            if self.mana >= carta.custo_mana:
-                self.mana -= carta.custo_mana
-            print(f"{self.nome} joga {carta.nome}.")
-            carta.ativar_efeito(self, jogador_alvo)
-            self.mao.pop(indice_carta)
-            if jogo:
-                jogo.historico.append(f"Rodada {jogo.turno + 1} - {self.nome}: Jogou {carta.nome}")
-            return True
+    def _jogar_aleatoria(self, indice_carta, carta, alvo, jogador_alvo, jogo, rng) -> bool:
+        modelo = carta.modelo
+        if self.mana >= modelo.custo_mana:
+            self.mana -= modelo.custo_mana
+        eventos.emitir(eventos.CartaAleatoriaJogada(self.nome, modelo.nome))
+        carta.ativar_efeito(self, jogador_alvo, rng)
+        self.mao.pop(indice_carta)
+        if jogo:
+            jogo.historico.registrar(jogo.turno + 1, self.nome, AcaoHistorico.JOGOU, modelo)
+        return True
 
-        if isinstance(carta, CartaFeitico):
-            if isinstance(carta, CartaFeiticoRevive):
-                if carta.lancar(self, CRIATURAS_DISPONIVEIS, alvo, jogador_alvo):
-                    self.cemiterio.append(self.mao.pop(indice_carta))
-                    print(f"{self.nome} lançou {carta.nome}.")
-                    if jogo:
-                        jogo.historico.append(f"Rodada {jogo.turno + 1} - {self.nome}: Usou {carta.nome}")
-                    return True
-            else:
-                if carta.lancar(self, alvo, jogador_alvo):
-                    self.cemiterio.append(self.mao.pop(indice_carta))
-                    print(f"{self.nome} lançou {carta.nome}.")
-                    if jogo:
-                        jogo.historico.append(f"Rodada {jogo.turno + 1} - {self.nome}: Usou {carta.nome}")
-                    return True
+    def _lancar_feitico(self, indice_carta, carta, alvo, jogador_alvo, jogo, rng) -> bool:
+        modelo = carta.modelo
+        if self.mana < modelo.custo_mana:
+            eventos.emitir(eventos.ManaInsuficiente(modelo.nome, "lançar"))
+            return False
+        self.mana -= modelo.custo_mana
+        EFEITOS[modelo.opcodes[0]](carta, self, alvo, jogador_alvo, rng)
+        self.cemiterio.append(self.mao.pop(indice_carta))
+        eventos.emitir(eventos.FeiticoLancado(self.nome, modelo.nome))
+        if jogo:
+            jogo.historico.registrar(jogo.turno + 1, self.nome, AcaoHistorico.USOU, modelo)
+        return True
 
-        return False
+    def _lancar_revive(self, indice_carta, carta, alvo, jogador_alvo, jogo, rng) -> bool:
+        if not self.cemiterio:
+            eventos.emitir(eventos.CemiterioVazio(carta.nome))
+            return False
+        return self._lancar_feitico(indice_carta, carta, alvo, jogador_alvo, jogo, rng)
 
     def _indice_valido(self, indice: int, lista) -> bool:
         """Verifica se o índice é válido para a lista."""
         return 0 <= indice < len(lista)
+
+# Como cada classe de carta é jogada; o efeito da carta vem da tabela `EFEITOS`, pelo opcode do modelo.
+_JOGADAS = {
+    CartaCriatura: JogadorAcao._jogar_criatura,
+    CartaTerreno: JogadorAcao._jogar_terreno,
+    CartaAleatoria: JogadorAcao._jogar_aleatoria,
+    CartaFeitico: JogadorAcao._lancar_feitico,
+    CartaFeiticoRevive: JogadorAcao._lancar_revive,
+}
+
+def _sem_jogada(jogador, indice_carta, carta, alvo, jogador_alvo, jogo, rng) -> bool:
+    return False
+
+def _jogada_da_classe(classe: type):
+    """Jogada de uma subclasse de carta: a da classe base mais próxima, guardada para as próximas vezes."""
+    jogada = next((_JOGADAS[base] for base in classe.__mro__ if base in _JOGADAS), _sem_jogada)
+    _JOGADAS[classe] = jogada
+    return jogada
@@ -1,14 +1,23 @@
 from typing import Optional
 from banco.cartas import CartaCriatura
 import jogo_estrutura.utils as utils
+from jogo_estrutura import eventos
+from jogo_estrutura.historico import AcaoHistorico
 
 class JogadorCombate:
     """Métodos relacionados ao combate do jogador."""
     
     def atacar(self, jogador_alvo, indice_atacante: int, indice_alvo: Optional[int] = None, jogo=None):
         """Ataca o jogador alvo ou suas criaturas com uma criatura."""
+        if jogo is None or jogo.perfil is None:
+            return self._atacar(jogador_alvo, indice_atacante, indice_alvo, jogo)
+        with jogo.perfil.fase("combate"):
+            self._atacar(jogador_alvo, indice_atacante, indice_alvo, jogo)
+        jogo.perfil.contar("ataques")
+
+    def _atacar(self, jogador_alvo, indice_atacante: int, indice_alvo: Optional[int], jogo):
         if not self._indice_valido(indice_atacante, self.campo_de_batalha):
-            print("Índice de atacante inválido.")
+            eventos.emitir(eventos.IndiceInvalido("atacante"))
             return
 
         atacante = self.campo_de_batalha[indice_atacante]
@@ -16,34 +25,40 @@ class JogadorCombate:
         if isinstance(atacante, CartaCriatura):
             # Se o adversário não tiver criaturas, ataca diretamente o jogador
             if not jogador_alvo.campo_de_batalha:
-                print(f"{self.nome}'s {atacante.nome} ataca {jogador_alvo.nome} diretamente.")
+                eventos.emitir(eventos.AtaqueDireto(self.nome, atacante.nome, jogador_alvo.nome))
                 utils.custom_sleep(1.5)
                 jogador_alvo.receber_dano(atacante.poder)
                 if jogo:
-                    jogo.historico.append(
-                        f"Rodada {jogo.turno + 1} - {self.nome}: {atacante.nome}(P:{atacante.poder}, R:{atacante.resistencia}) atacou diretamente {jogador_alvo.nome}"
+                    jogo.historico.registrar(
+                        jogo.turno + 1, self.nome, AcaoHistorico.ATAQUE_DIRETO, atacante.modelo, jogador_alvo.nome,
+                        (atacante.poder, atacante.resistencia)
                     )
+                    if jogo.gravacao is not None:
+                        jogo.gravacao.atacar(indice_atacante, None)
                 return
 
             # Se houver criaturas no campo adversário, valida o índice de alvo
             if indice_alvo is None or not self._indice_valido(indice_alvo, jogador_alvo.campo_de_batalha):
-                print("Índice de criatura alvo inválido.")
+                eventos.emitir(eventos.IndiceInvalido("criatura alvo"))
                 return
 
             criatura_alvo = jogador_alvo.campo_de_batalha[indice_alvo]
-            print(
-                f"{self.nome}'s {atacante.nome} (Poder: {atacante.poder}, Resistência: {atacante.resistencia}) "
-                f"ataca {jogador_alvo.nome}'s {criatura_alvo.nome} (Poder: {criatura_alvo.poder}, Resistência: {criatura_alvo.resistencia})."
-            )
+            eventos.emitir(eventos.AtaqueCriatura(
+                self.nome, atacante.nome, atacante.poder, atacante.resistencia,
+                jogador_alvo.nome, criatura_alvo.nome, criatura_alvo.poder, criatura_alvo.resistencia
+            ))
             utils.custom_sleep(1.5)
             if criatura_alvo.sofrer_dano(atacante.poder):
                 jogador_alvo.campo_de_batalha.remove(criatura_alvo)
                 jogador_alvo.cemiterio.append(criatura_alvo)
 
             if jogo:
-                jogo.historico.append(
-                    f"Rodada {jogo.turno + 1} - {self.nome}: {atacante.nome}(P:{atacante.poder}, R:{atacante.resistencia}) atacou {criatura_alvo.nome}(P:{criatura_alvo.poder}, R:{criatura_alvo.resistencia})"
+                jogo.historico.registrar(
+                    jogo.turno + 1, self.nome, AcaoHistorico.ATAQUE, atacante.modelo, criatura_alvo.modelo,
+                    (atacante.poder, atacante.resistencia, criatura_alvo.poder, criatura_alvo.resistencia)
                 )
+                if jogo.gravacao is not None:
+                    jogo.gravacao.atacar(indice_atacante, indice_alvo)
 
     def _indice_valido(self, indice: int, lista) -> bool:
         """Verifica se o índice é válido para a lista."""
@@ -0,0 +1,251 @@
+import math
+import random
+import time
+from typing import Dict, List, NamedTuple, Optional
+import jogo_estrutura.utils as utils
+from jogo_estrutura import eventos
+from banco.cartas import CartaAleatoria, CartaCriatura, CartaFeitico, CartaFeiticoRevive, CartaTerreno
+from .jogador_ia import JogadorIA
+
+class Acao(NamedTuple):
+    """Uma jogada possível no turno.
+
+    As cartas e criaturas são identificadas pelo nome, e não pelo índice, para que a mesma
+    ação faça sentido em simulações diferentes, onde a mão e o campo variam.
+    """
+    tipo: str  # "jogar", "atacar" ou "passar"
+    carta: Optional[str] = None
+    alvo: Optional[str] = None
+
+PASSAR = Acao("passar")
+
+def acoes_legais(jogador, jogador_alvo) -> List[Acao]:
+    """Lista as jogadas aceitas pelas regras do jogo no estado atual."""
+    acoes = []
+    vistas = set()
+    for carta in jogador.mao:
+        if carta.nome in vistas:
+            continue
+        vistas.add(carta.nome)
+        if isinstance(carta, (CartaTerreno, CartaAleatoria)):
+            acoes.append(Acao("jogar", carta.nome))
+        elif carta.custo_mana > jogador.mana:
+            continue
+        elif isinstance(carta, CartaFeiticoRevive):
+            if jogador.cemiterio:
+                acoes.append(Acao("jogar", carta.nome))
+        elif isinstance(carta, CartaFeitico) and carta.tem_alvo:
+            acoes.append(Acao("jogar", carta.nome))
+            acoes.extend(Acao("jogar", carta.nome, nome) for nome in _nomes(jogador_alvo.campo_de_batalha))
+        else:
+            acoes.append(Acao("jogar", carta.nome))
+    for atacante in _nomes(jogador.campo_de_batalha):
+        if jogador_alvo.campo_de_batalha:
+            acoes.extend(Acao("atacar", atacante, nome) for nome in _nomes(jogador_alvo.campo_de_batalha))
+        else:
+            acoes.append(Acao("atacar", atacante))
+    acoes.append(PASSAR)
+    return acoes
+
+def _nomes(cartas) -> List[str]:
+    return list(dict.fromkeys(carta.nome for carta in cartas))
+
+def _indice(cartas, nome: str) -> int:
+    for i, carta in enumerate(cartas):
+        if carta.nome == nome:
+            return i
+    return -1
+
+def executar_acao(jogador, jogador_alvo, acao: Acao, jogo):
+    """Aplica uma jogada usando as regras de `Jogador`."""
+    if acao.tipo == "jogar":
+        alvo = None
+        if acao.alvo is not None:
+            alvo = jogador_alvo.campo_de_batalha[_indice(jogador_alvo.campo_de_batalha, acao.alvo)]
+        jogador.jogar_carta(_indice(jogador.mao, acao.carta), alvo=alvo, jogador_alvo=jogador_alvo, jogo=jogo)
+    elif acao.tipo == "atacar":
+        indice_alvo = _indice(jogador_alvo.campo_de_batalha, acao.alvo) if acao.alvo is not None else None
+        jogador.atacar(jogador_alvo, _indice(jogador.campo_de_batalha, acao.carta), indice_alvo, jogo=jogo)
+    else:
+        jogo.passar_a_vez(jogador)
+
+def avaliar(jogador, jogador_alvo) -> float:
+    """Estima, entre 0 e 1, a chance de `jogador` vencer a partida a partir do estado atual."""
+    saldo = jogador.saude - jogador_alvo.saude
+    saldo += 0.5 * sum(c.poder + c.resistencia for c in jogador.campo_de_batalha)
+    saldo -= 0.5 * sum(c.poder + c.resistencia for c in jogador_alvo.campo_de_batalha)
+    saldo += 0.5 * (len(jogador.mao) - len(jogador_alvo.mao))
+    return 1 / (1 + math.exp(-saldo / 8))
+
+class _No:
+    """Nó da árvore de busca; representa a sequência de ações que leva até ele."""
+    __slots__ = ("filhos", "visitas", "vitorias", "disponivel")
+
+    def __init__(self):
+        self.filhos: Dict[Acao, "_No"] = {}
+        self.visitas = 0
+        self.vitorias = 0.0  # do ponto de vista de quem escolheu a ação que leva a este nó
+        self.disponivel = 0  # quantas vezes a ação era legal quando o nó pai foi visitado
+
+class JogadorMCTS:
+    """Controlador da máquina que escolhe a jogada por busca em árvore Monte Carlo (UCT).
+
+    A cada iteração uma cópia do jogo volta ao estado inicial, as cartas escondidas (mão do adversário e ordem dos
+    baralhos) são sorteadas de novo, a árvore é percorrida escolhendo ações por UCB1 e a
+    partida é continuada por `profundidade` turnos com a política de simulação. As compras de
+    carta são aleatórias, então a árvore guarda sequências de ações (busca "open-loop"), e não
+    estados. A força é definida por `simulacoes` e/ou por `tempo_limite` em segundos.
+
+    Como a classe recebe o jogador no construtor, pode ser usada como estratégia de `Jogador`,
+    por exemplo com `functools.partial(JogadorMCTS, simulacoes=500)`.
+    """
+    POLITICAS = ("ia", "aleatoria")
+
+    def __init__(self, jogador, simulacoes: Optional[int] = 300, tempo_limite: Optional[float] = None,
+                 profundidade: int = 12, exploracao: float = 1.4, politica: str = "ia",
+                 rng: Optional[random.Random] = None):
+        if simulacoes is None and tempo_limite is None:
+            raise ValueError("Informe a quantidade de simulações ou o tempo limite da busca")
+        if politica not in self.POLITICAS:
+            raise ValueError(f"Política de simulação desconhecida: {politica}")
+        self.jogador = jogador
+        self.simulacoes = simulacoes
+        self.tempo_limite = tempo_limite
+        self.profundidade = profundidade
+        self.exploracao = exploracao
+        self.politica = politica
+        # Sem gerador próprio, cada busca usa um gerador derivado da semente da partida e do
+        # turno, para que partidas com semente continuem reprodutíveis; ele não consome o
+        # gerador da partida, então a partida gravada pode ser repetida sem a busca.
+        self.rng = rng
+        self._rng_busca = rng
+
+    def escolher_acao(self, jogador_alvo, jogo):
+        eventos.emitir(eventos.IAEscolhendo(self.jogador.nome))
+        acao = self.buscar(jogador_alvo, jogo)
+        self._anunciar(acao)
+        utils.custom_sleep(1.5)
+        executar_acao(self.jogador, jogador_alvo, acao, jogo)
+
+    def buscar(self, jogador_alvo, jogo) -> Acao:
+        """Executa a busca a partir do estado atual e devolve a ação mais visitada."""
+        acoes = acoes_legais(self.jogador, jogador_alvo)
+        if len(acoes) == 1:
+            return acoes[0]
+        raiz = _No()
+        indice = jogo.jogadores.index(self.jogador)
+        limite = time.perf_counter() + self.tempo_limite if self.tempo_limite is not None else None
+        self._rng_busca = self.rng or self._gerador_da_busca(jogo)
+        # Todas as iterações usam o mesmo clone, que volta ao estado inicial antes de cada uma.
+        simulado = jogo.clonar()
+        simulado.rng = self._rng_busca
+        inicial = simulado.capturar()
+        iteracoes = 0
+        with utils.modo_headless():
+            while self.simulacoes is None or iteracoes < self.simulacoes:
+                if limite is not None and time.perf_counter() >= limite:
+                    break
+                simulado.restaurar(inicial)
+                self._sortear_escondidas(simulado, indice)
+                self._iterar(raiz, simulado, indice)
+                iteracoes += 1
+        if not raiz.filhos:
+            return PASSAR
+        return max(raiz.filhos.items(), key=lambda item: item[1].visitas)[0]
+
+    def _gerador_da_busca(self, jogo) -> random.Random:
+        if jogo.semente is None:
+            return random.Random(jogo.rng.getrandbits(64))
+        return random.Random(f"{jogo.semente}:{jogo.turno}:{self.jogador.nome}")
+
+    def _sortear_escondidas(self, jogo, indice: int):
+        """Sorteia de novo o que o jogador não pode ver: a mão do adversário e a ordem dos baralhos."""
+        for i, jogador in enumerate(jogo.jogadores):
+            if i != indice:
+                # A mão do adversário é desconhecida: volta para o baralho e é comprada de novo.
+                quantidade = len(jogador.mao)
+                jogador.baralho.extend(jogador.mao)
+                jogador.mao = []
+                jogador.baralho.embaralhar(self._rng_busca)
+                jogador.mao = [jogador.baralho.comprar() for _ in range(quantidade)]
+            else:
+                jogador.baralho.embaralhar(self._rng_busca)
+
+    def _iterar(self, raiz: _No, jogo, indice: int):
+        eu = jogo.jogadores[indice]
+        caminho = []  # pares (nó, jogador que escolheu a ação que leva a ele)
+        no = raiz
+        atual = eu
+        alvo = jogo.jogadores[(indice + 1) % len(jogo.jogadores)]
+        em_andamento = True
+        turnos = 0
+
+        # Seleção e expansão
+        while em_andamento and turnos < self.profundidade:
+            acoes = acoes_legais(atual, alvo)
+            novas = [acao for acao in acoes if acao not in no.filhos]
+            for acao in acoes:
+                filho = no.filhos.get(acao)
+                if filho is not None:
+                    filho.disponivel += 1
+            if novas:
+                acao = self._rng_busca.choice(novas)
+                filho = no.filhos[acao] = _No()
+                filho.disponivel = 1
+            else:
+                acao = max(acoes, key=lambda a: self._ucb(no.filhos[a]))
+                filho = no.filhos[acao]
+            caminho.append((filho, atual))
+            executar_acao(atual, alvo, acao, jogo)
+            em_andamento = jogo.finalizar_turno(alvo)
+            turnos += 1
+            if em_andamento:
+                atual, alvo = jogo.iniciar_turno()
+            no = filho
+            if novas:
+                break
+
+        # Simulação
+        while em_andamento and turnos < self.profundidade:
+            if self.politica == "ia":
+                JogadorIA(atual).escolher_acao(alvo, jogo)
+            else:
+                executar_acao(atual, alvo, self._rng_busca.choice(acoes_legais(atual, alvo)), jogo)
+            em_andamento = jogo.finalizar_turno(alvo)
+            turnos += 1
+            if em_andamento:
+                atual, alvo = jogo.iniciar_turno()
+
+        # Retropropagação
+        if eu not in jogo.jogadores:
+            resultado = 0.0
+        elif len(jogo.jogadores) == 1:
+            resultado = 1.0
+        else:
+            resultado = avaliar(eu, next(j for j in jogo.jogadores if j is not eu))
+        raiz.visitas += 1
+        for no, autor in caminho:
+            no.visitas += 1
+            no.vitorias += resultado if autor is eu else 1 - resultado
+
+    def _ucb(self, no: _No) -> float:
+        return no.vitorias / no.visitas + self.exploracao * math.sqrt(math.log(no.disponivel) / no.visitas)
+
+    def _anunciar(self, acao: Acao):
+        nome = self.jogador.nome
+        if acao.tipo == "atacar":
+            poder = self.jogador.campo_de_batalha[_indice(self.jogador.campo_de_batalha, acao.carta)].poder
+            eventos.emitir(eventos.IADecideAtacar(nome, acao.carta, poder))
+        elif acao.tipo == "passar":
+            eventos.emitir(eventos.IAPassaAVez(nome))
+        else:
+            carta = self.jogador.mao[_indice(self.jogador.mao, acao.carta)]
+            if isinstance(carta, CartaCriatura):
+                eventos.emitir(eventos.IADecideInvocar(nome, carta.nome))
+            elif acao.alvo is not None:
+                eventos.emitir(eventos.IAUsaFeiticoEmCriatura(nome, carta.nome, acao.alvo))
+            elif isinstance(carta, CartaFeitico) and carta.tipo_magia == "cura":
+                eventos.emitir(eventos.IADecideCurar(nome, carta.nome))
+            elif isinstance(carta, CartaFeitico) and carta.tipo_magia in ("dano_direto", "dano_coletivo"):
+                eventos.emitir(eventos.IAUsaFeiticoNoCampo(nome, carta.nome))
+            # Os demais efeitos já são anunciados pelo próprio `jogar_carta`.
@@ -1,33 +1,55 @@
-from colorama import Fore, init
-init(autoreset=True)
+from jogo_estrutura import eventos, tela
+
+_cores = None
+
+def _iniciar_cores():
+    """Importa e inicializa o colorama só na primeira vez que o tabuleiro é exibido."""
+    global _cores
+    if _cores is None:
+        from colorama import Fore, init
+        init(autoreset=True)
+        _cores = Fore
+    return _cores
 
 class JogadorTabuleiro:
     """Métodos para exibição do tabuleiro e interatividade do jogador."""
     
     def exibir_tabuleiro(self, jogador_alvo):
-        print("\n--- TABULEIRO DO JOGO ---")
-        print("\nCampo de Batalha:")
-        print(f"{Fore.BLUE}{self.nome}'s Campo de Batalha:")
-        for i, criatura in enumerate(self.campo_de_batalha):
-            print(f"  [{i}] {Fore.BLUE}{criatura}")
-        print(f"{Fore.RED}{jogador_alvo.nome}'s Campo de Batalha:")
-        for i, criatura in enumerate(jogador_alvo.campo_de_batalha):
-            print(f"  [{i}] {Fore.RED}{criatura}")
-        print("\nInformações dos Jogadores:")
+        linhas = self.linhas_tabuleiro(jogador_alvo)
+        terminal = tela.terminal()
+        if terminal is None:
+            for linha in linhas:
+                print(linha)
+        else:
+            terminal.desenhar(linhas)
+
+    def linhas_tabuleiro(self, jogador_alvo):
+        """Monta as linhas do tabuleiro visto por este jogador."""
+        Fore = _iniciar_cores()
+        linhas = ["", "--- TABULEIRO DO JOGO ---", "", "Campo de Batalha:"]
+        linhas.append(f"{Fore.BLUE}{self.nome}'s Campo de Batalha:")
+        linhas.extend(f"  [{i}] {Fore.BLUE}{criatura}" for i, criatura in enumerate(self.campo_de_batalha))
+        linhas.append(f"{Fore.RED}{jogador_alvo.nome}'s Campo de Batalha:")
+        linhas.extend(f"  [{i}] {Fore.RED}{criatura}" for i, criatura in enumerate(jogador_alvo.campo_de_batalha))
+        linhas.extend(["", "Informações dos Jogadores:"])
         for jogador in [self, jogador_alvo]:
             cor = Fore.BLUE if jogador == self else Fore.RED
-            print(f"{cor}{jogador.nome} - Saúde: {jogador.saude}, Mana: {jogador.mana}")
+            linhas.append(f"{cor}{jogador.nome} - Saúde: {jogador.saude}, Mana: {jogador.mana}")
             if jogador.eh_humano:
-                print("Mão:")
-                for i, carta in enumerate(jogador.mao):
-                    print(f"  [{i}] {carta}")
+                linhas.append("Mão:")
+                linhas.extend(f"  [{i}] {carta}" for i, carta in enumerate(jogador.mao))
             else:
-                print(f"Mão: {len(jogador.mao)} cartas escondidas")
-            print("----------------------")
+                linhas.append(f"Mão: {len(jogador.mao)} cartas escondidas")
+            linhas.append("----------------------")
+        return linhas
 
     def escolher_acao(self, jogador_alvo, jogo):
         """Método que permite ao jogador (ou IA) escolher uma ação."""
-        self.exibir_tabuleiro(jogador_alvo)
+        if jogo.perfil is None:
+            self.exibir_tabuleiro(jogador_alvo)
+        else:
+            with jogo.perfil.fase("renderizacao"):
+                self.exibir_tabuleiro(jogador_alvo)
         
         if self.eh_humano:
             print(f"\n{self.nome}, é a sua vez!")
@@ -67,12 +89,12 @@ class JogadorTabuleiro:
                     break
                 elif acao == "3":
                     print("Passando a vez.")
-                    jogo.historico.append(f"Rodada {jogo.turno + 1} - {self.nome}: Passou a vez.")
+                    jogo.passar_a_vez(self)
                     break
                 elif acao == "4":
                     print("\n--- HISTÓRICO DAS ÚLTIMAS AÇÕES ---")
-                    for h in jogo.historico[-10:]:
-                        print(h)
+                    for registro in jogo.historico.ultimos(10):
+                        print(registro if isinstance(registro, str) else registro.texto())
                     print("-----------------------------------")
                     continue
                 elif acao == "5":
@@ -84,7 +106,7 @@ class JogadorTabuleiro:
                 else:
                     print("Ação inválida. Tente novamente.")
         else:
-            print(f"{self.nome} está escolhendo uma ação...")
+            eventos.emitir(eventos.IAEscolhendo(self.nome))
             # Lógica simplificada para IA
             import jogo_estrutura.utils as utils
             utils.custom_sleep(1.5)
@@ -92,5 +114,5 @@ class JogadorTabuleiro:
             if self.mao and self.mana >= self.mao[0].custo_mana:
                 self.jogar_carta(0, jogador_alvo=jogador_alvo, jogo=jogo)
             else:
-                print(f"{self.nome} passou a vez.")
-                jogo.historico.append(f"Rodada {jogo.turno + 1} - {self.nome}: Passou a vez.")
+                eventos.emitir(eventos.JogadorPassaAVez(self.nome))
+                jogo.passar_a_vez(self)
@@ -0,0 +1,123 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from banco.cartas import Carta, CartaCriatura, CartaFeitico
+
+# Categorias usadas pela IA para escolher a jogada.
+OUTRA, CURA, DANO, CRIATURA = range(4)
+MAGIAS_DE_DANO_IA = ("dano_unico", "dano_coletivo")
+
+def categoria(carta: Carta) -> int:
+    """Categoria da carta para a IA: cura, feitiço de dano, criatura ou outra."""
+    if isinstance(carta, CartaCriatura):
+        return CRIATURA
+    if isinstance(carta, CartaFeitico):
+        if carta.tipo_magia == "cura":
+            return CURA
+        if carta.tipo_magia in MAGIAS_DE_DANO_IA:
+            return DANO
+    return OUTRA
+
+class Mao:
+    """Cartas na mão do jogador, na ordem em que entraram, com um índice por categoria e custo.
+
+    Cada carta recebe um número de sequência crescente ao entrar, então a ordem da mão é a
+    ordem das sequências. O índice guarda, para cada (categoria, custo), as sequências em uma
+    fila; as que saem da mão só são descartadas quando chegam à frente da fila. Assim
+    `primeira_jogavel` olha só a frente de uma fila por custo, sem percorrer a mão.
+    """
+    __slots__ = ("_cartas", "_seqs", "_vivas", "_filas", "_custos", "_descartadas", "_proxima")
+
+    def __init__(self, cartas: Iterable[Carta] = ()):
+        self._cartas: List[Carta] = []
+        self._seqs: List[int] = []  # sequência de cada posição, em ordem crescente
+        self._vivas: Set[int] = set()
+        self._filas: Dict[Tuple[int, int], Deque[int]] = {}
+        self._custos: Dict[int, List[int]] = {}  # custos com fila, em ordem, por categoria
+        self._descartadas = 0  # sequências mortas ainda presentes nas filas
+        self._proxima = 0  # sequência da próxima carta
+        self.extend(cartas)
+
+    def __len__(self) -> int:
+        return len(self._cartas)
+
+    def __iter__(self) -> Iterator[Carta]:
+        return iter(self._cartas)
+
+    def __getitem__(self, indice):
+        return self._cartas[indice]
+
+    def __contains__(self, carta) -> bool:
+        return carta in self._cartas
+
+    def __eq__(self, outra) -> bool:
+        if isinstance(outra, Mao):
+            return self._cartas == outra._cartas
+        if isinstance(outra, list):
+            return self._cartas == outra
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Mao({self._cartas!r})"
+
+    def index(self, carta) -> int:
+        return self._cartas.index(carta)
+
+    def append(self, carta: Carta):
+        seq = self._proxima
+        self._proxima += 1
+        self._cartas.append(carta)
+        self._seqs.append(seq)
+        self._vivas.add(seq)
+        chave = (categoria(carta), carta.custo_mana)
+        fila = self._filas.get(chave)
+        if fila is None:
+            fila = self._filas[chave] = deque()
+            insort(self._custos.setdefault(chave[0], []), chave[1])
+        fila.append(seq)
+
+    def extend(self, cartas: Iterable[Carta]):
+        for carta in cartas:
+            self.append(carta)
+
+    def pop(self, indice: int = -1) -> Carta:
+        carta = self._cartas.pop(indice)
+        self._vivas.discard(self._seqs.pop(indice))
+        self._descartadas += 1
+        if self._descartadas > 32 and self._descartadas > 2 * len(self._cartas):
+            self._reconstruir()
+        return carta
+
+    def remove(self, carta: Carta):
+        self.pop(self._cartas.index(carta))
+
+    def clear(self):
+        self._cartas.clear()
+        self._seqs.clear()
+        self._reconstruir()
+
+    def primeira_jogavel(self, categoria_carta: int, mana: int) -> Optional[int]:
+        """Posição da primeira carta da categoria com custo até `mana`, ou None se não houver."""
+        custos = self._custos.get(categoria_carta)
+        if not custos:
+            return None
+        melhor = None
+        for custo in custos[:bisect_right(custos, mana)]:
+            fila = self._filas[(categoria_carta, custo)]
+            while fila and fila[0] not in self._vivas:
+                fila.popleft()
+                self._descartadas -= 1
+            if not fila:
+                del self._filas[(categoria_carta, custo)]
+                custos.remove(custo)
+            elif melhor is None or fila[0] < melhor:
+                melhor = fila[0]
+        return None if melhor is None else bisect_left(self._seqs, melhor)
+
+    def _reconstruir(self):
+        """Refaz o índice só com as cartas que estão na mão."""
+        cartas = self._cartas
+        self._cartas, self._seqs = [], []
+        self._vivas, self._filas, self._custos = set(), {}, {}
+        self._descartadas = 0
+        self.extend(cartas)
@@ -1,9 +1,28 @@
+"""Constantes derivadas do banco de cartas.
+
+Os valores são calculados no primeiro acesso (PEP 562), e não na importação, para que
+importar o pacote `jogador` não precise ler o CSV de cartas.
+"""
 from banco.cartas import CartaCriatura
-from banco.banco_de_dados import BancoSimulado
 
-# Carrega cartas do banco
-banco = BancoSimulado('cartas_game.csv')
-cartas = banco.obter_cartas()
+def _carregar_banco():
+    from banco.banco_de_dados import BancoSimulado
+    return BancoSimulado('cartas_game.csv')
+
+def _banco():
+    # Depois do primeiro acesso `banco` já está no módulo e o `__getattr__` não é mais chamado.
+    banco = globals().get("banco")
+    return banco if banco is not None else __getattr__("banco")
 
-# Gera o dicionário de criaturas disponíveis
-CRIATURAS_DISPONIVEIS = {carta.nome: carta.resistencia for carta in cartas if isinstance(carta, CartaCriatura)}
+def __getattr__(nome):
+    if nome == "banco":
+        valor = _carregar_banco()
+    elif nome == "cartas":
+        valor = _banco().obter_cartas()
+    elif nome == "CRIATURAS_DISPONIVEIS":
+        # Gera o dicionário de criaturas disponíveis
+        valor = {carta.nome: carta.resistencia for carta in _banco().consultar(tipo=CartaCriatura)}
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    globals()[nome] = valor
+    return valor
@@ -0,0 +1,270 @@
+"""Eventos emitidos pelo motor do jogo e as saídas que os consomem.
+
+O motor não formata nem imprime mensagens: cada passo emite um evento tipado e leve
+com `emitir`, e a saída ativa decide o que fazer com ele. O texto em português só é
+montado quando alguma saída chama `formatar`.
+"""
+import abc
+import contextlib
+from contextvars import ContextVar
+from typing import Iterator, List, NamedTuple
+from jogo_estrutura import tela
+
+# --- Eventos das cartas ---
+
+class CartaSofreDano(NamedTuple):
+    carta: str
+    dano: int
+    modelo = "{carta} sofre {dano} de dano."
+
+class CartaRecuperaSaude(NamedTuple):
+    carta: str
+    quantidade: int
+    modelo = "{carta} recupera {quantidade} de saúde."
+
+class CriaturaSofreDano(NamedTuple):
+    criatura: str
+    dano: int
+    resistencia: int
+    modelo = "{criatura} sofre {dano} de dano. Resistência restante: {resistencia}"
+
+class CriaturaDestruida(NamedTuple):
+    criatura: str
+    modelo = "{criatura} foi removida do campo de batalha e enviada ao cemitério."
+
+class ManaInsuficiente(NamedTuple):
+    carta: str
+    acao: str
+    modelo = "Mana insuficiente para {acao} {carta}."
+
+class FeiticoCausaDano(NamedTuple):
+    feitico: str
+    dano: int
+    alvo: str
+    modelo = "{feitico} causa {dano} de dano a {alvo}."
+
+class FeiticoCausaDanoAdversario(NamedTuple):
+    feitico: str
+    dano: int
+    modelo = "{feitico} causa {dano} de dano ao jogador adversário."
+
+class FeiticoCura(NamedTuple):
+    feitico: str
+    quantidade: int
+    jogador: str
+    modelo = "{feitico} cura {quantidade} de saúde de {jogador}."
+
+class FeiticoFortalece(NamedTuple):
+    feitico: str
+    jogador: str
+    modelo = "{feitico} fortalece as criaturas de {jogador}."
+
+class FeiticoDanoColetivo(NamedTuple):
+    feitico: str
+    dano: int
+    modelo = "{feitico} causa {dano} de dano a todas as criaturas do adversário."
+
+class CriaturaRevivida(NamedTuple):
+    jogador: str
+    criatura: str
+    modelo = "{jogador} reviveu {criatura} do cemitério!"
+
+class ReviverSemCriaturas(NamedTuple):
+    jogador: str
+    modelo = "{jogador} tentou reviver uma criatura, mas não há nenhuma no cemitério."
+
+class TerrenoManaExtra(NamedTuple):
+    jogador: str
+    terreno: str
+    modelo = "{jogador} ganha 1 mana extra devido ao efeito do terreno {terreno}."
+
+class TerrenoCura(NamedTuple):
+    jogador: str
+    terreno: str
+    modelo = "{jogador} recupera 3 pontos de saúde devido ao efeito do terreno {terreno}."
+
+class EfeitoAleatorioAtivado(NamedTuple):
+    jogador: str
+    carta: str
+    efeito: str
+    modelo = "{jogador} ativa {carta} com efeito aleatório: {efeito}."
+
+# --- Eventos do jogador ---
+
+class BaralhoVazio(NamedTuple):
+    jogador: str
+    modelo = "{jogador} não pode comprar uma carta, o baralho está vazio!"
+
+class CartaComprada(NamedTuple):
+    jogador: str
+    carta: str
+    modelo = "{jogador} comprou a carta: {carta}."
+
+class JogadorRecebeDano(NamedTuple):
+    jogador: str
+    dano: int
+    saude: int
+    modelo = "{jogador} recebe {dano} de dano. Saúde restante: {saude}"
+
+class IndiceInvalido(NamedTuple):
+    descricao: str
+    modelo = "Índice de {descricao} inválido."
+
+class CemiterioVazio(NamedTuple):
+    carta: str
+    modelo = "Não é possível utilizar {carta} pois o cemitério está vazio!"
+
+class CriaturaJogada(NamedTuple):
+    jogador: str
+    carta: str
+    modelo = "{jogador} jogou {carta}."
+
+class TerrenoJogado(NamedTuple):
+    jogador: str
+    carta: str
+    modelo = "{jogador} joga o terreno {carta}."
+
+class CartaAleatoriaJogada(NamedTuple):
+    jogador: str
+    carta: str
+    modelo = "{jogador} joga {carta}."
+
+class FeiticoLancado(NamedTuple):
+    jogador: str
+    carta: str
+    modelo = "{jogador} lançou {carta}."
+
+class AtaqueDireto(NamedTuple):
+    jogador: str
+    atacante: str
+    alvo: str
+    modelo = "{jogador}'s {atacante} ataca {alvo} diretamente."
+
+class AtaqueCriatura(NamedTuple):
+    jogador: str
+    atacante: str
+    poder_atacante: int
+    resistencia_atacante: int
+    adversario: str
+    alvo: str
+    poder_alvo: int
+    resistencia_alvo: int
+    modelo = ("{jogador}'s {atacante} (Poder: {poder_atacante}, Resistência: {resistencia_atacante}) "
+              "ataca {adversario}'s {alvo} (Poder: {poder_alvo}, Resistência: {resistencia_alvo}).")
+
+# --- Eventos da IA ---
+
+class IAEscolhendo(NamedTuple):
+    jogador: str
+    modelo = "{jogador} está escolhendo uma ação..."
+
+class IADecideCurar(NamedTuple):
+    jogador: str
+    carta: str
+    modelo = "{jogador} decidiu se curar jogando {carta}"
+
+class IAUsaFeiticoEmCriatura(NamedTuple):
+    jogador: str
+    carta: str
+    criatura: str
+    modelo = "{jogador} usa {carta} na criatura inimiga {criatura}"
+
+class IAUsaFeiticoNoCampo(NamedTuple):
+    jogador: str
+    carta: str
+    modelo = "{jogador} usa {carta} para danificar o campo inimigo."
+
+class IADecideInvocar(NamedTuple):
+    jogador: str
+    carta: str
+    modelo = "{jogador} decide invocar a criatura {carta}"
+
+class IADecideAtacar(NamedTuple):
+    jogador: str
+    atacante: str
+    poder: int
+    modelo = "{jogador} decide atacar com {atacante} (Poder: {poder})."
+
+class IAPassaAVez(NamedTuple):
+    jogador: str
+    modelo = "{jogador} não jogou cartas e nem atacou. Passando a vez..."
+
+class JogadorPassaAVez(NamedTuple):
+    jogador: str
+    modelo = "{jogador} passou a vez."
+
+# --- Eventos do jogo ---
+
+class JogoIniciado(NamedTuple):
+    modelo = "Iniciando o jogo!"
+
+class RodadaIniciada(NamedTuple):
+    rodada: int
+    jogador: str
+    modelo = "\nRodada número {rodada}.\nÉ a vez de {jogador}!"
+
+class ManaGanha(NamedTuple):
+    jogador: str
+    mana: int
+    modelo = "{jogador} ganha 1 mana. Mana total: {mana}"
+
+class JogadorDerrotado(NamedTuple):
+    jogador: str
+    modelo = "{jogador} foi derrotado!"
+
+class VencedorDefinido(NamedTuple):
+    jogador: str
+    modelo = "{jogador} é o vencedor!"
+
+
+def formatar(evento) -> str:
+    """Monta o texto em português de um evento."""
+    return evento.modelo.format_map(evento._asdict())
+
+
+class Saida(abc.ABC):
+    """Destino dos eventos emitidos pelo motor."""
+    @abc.abstractmethod
+    def receber(self, evento):
+        """Trata um evento emitido pelo motor."""
+
+class SaidaConsole(Saida):
+    """Imprime cada evento no terminal com o texto original do jogo, respeitando as pausas da animação."""
+    def receber(self, evento):
+        tela.ritmo.aguardar()
+        print(formatar(evento))
+
+class SaidaNula(Saida):
+    """Descarta todos os eventos."""
+    def receber(self, evento):
+        pass
+
+class SaidaColetora(Saida):
+    """Guarda os eventos recebidos, útil para testes e ferramentas."""
+    def __init__(self):
+        self.eventos: List[NamedTuple] = []
+
+    def receber(self, evento):
+        self.eventos.append(evento)
+
+    def mensagens(self) -> List[str]:
+        return [formatar(evento) for evento in self.eventos]
+
+
+_saida_atual: "ContextVar[Saida]" = ContextVar("saida_atual", default=SaidaConsole())
+
+def emitir(evento):
+    """Entrega um evento à saída ativa no contexto atual."""
+    _saida_atual.get().receber(evento)
+
+def saida_atual() -> Saida:
+    return _saida_atual.get()
+
+@contextlib.contextmanager
+def usar_saida(saida: Saida) -> Iterator[Saida]:
+    """Direciona os eventos emitidos dentro do bloco para `saida`."""
+    token = _saida_atual.set(saida)
+    try:
+        yield saida
+    finally:
+        _saida_atual.reset(token)
@@ -0,0 +1,119 @@
+from collections import deque
+from enum import IntEnum
+from itertools import islice
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+from banco.cartas import ModeloCarta
+
+class AcaoHistorico(IntEnum):
+    """Tipos de ação guardados no histórico."""
+    JOGOU = 0
+    USOU = 1
+    ATAQUE_DIRETO = 2
+    ATAQUE = 3
+    PASSOU = 4
+    DERROTADO = 5
+    VENCEDOR = 6
+
+class RegistroHistorico(NamedTuple):
+    """Uma ação do histórico, guardada sem formatação.
+
+    As cartas são referências aos modelos compartilhados e `estatisticas` guarda o poder e a
+    resistência do atacante (e do alvo) no momento do ataque.
+    """
+    rodada: int
+    ator: str
+    acao: AcaoHistorico
+    carta: Optional[ModeloCarta] = None
+    alvo: Union[ModeloCarta, str, None] = None
+    estatisticas: Tuple[int, ...] = ()
+
+    def texto(self) -> str:
+        """Monta o texto exibido no menu de histórico."""
+        acao = self.acao
+        prefixo = f"Rodada {self.rodada} - {self.ator}: "
+        if acao == AcaoHistorico.JOGOU:
+            return f"{prefixo}Jogou {self.carta.nome}"
+        if acao == AcaoHistorico.USOU:
+            return f"{prefixo}Usou {self.carta.nome}"
+        if acao == AcaoHistorico.ATAQUE_DIRETO:
+            poder, resistencia = self.estatisticas
+            return f"{prefixo}{self.carta.nome}(P:{poder}, R:{resistencia}) atacou diretamente {self.alvo}"
+        if acao == AcaoHistorico.ATAQUE:
+            poder, resistencia, poder_alvo, resistencia_alvo = self.estatisticas
+            return (f"{prefixo}{self.carta.nome}(P:{poder}, R:{resistencia}) "
+                    f"atacou {self.alvo.nome}(P:{poder_alvo}, R:{resistencia_alvo})")
+        if acao == AcaoHistorico.PASSOU:
+            return f"{prefixo}Passou a vez"
+        if acao == AcaoHistorico.DERROTADO:
+            return f"Rodada {self.rodada}: {self.ator} foi derrotado!"
+        return f"Rodada {self.rodada}: {self.ator} é o vencedor!"
+
+Entrada = Union[RegistroHistorico, str]
+
+def _texto(entrada: Entrada) -> str:
+    return entrada if isinstance(entrada, str) else entrada.texto()
+
+class Historico:
+    """Histórico de ações do jogo com política de retenção configurável.
+
+    - "anel": guarda apenas os `capacidade` registros mais recentes;
+    - "completo": guarda todos os registros;
+    - "desligado": não guarda nada (nem chega a criar os registros).
+
+    Iterar sobre o histórico devolve o texto de cada ação, montado só nesse momento.
+    """
+    ANEL = "anel"
+    COMPLETO = "completo"
+    DESLIGADO = "desligado"
+
+    def __init__(self, politica: str = ANEL, capacidade: int = 100, entradas: Iterable[Entrada] = ()):
+        if politica == self.ANEL:
+            self._entradas: Optional[deque] = deque(maxlen=capacidade)
+        elif politica == self.COMPLETO:
+            self._entradas = deque()
+        elif politica == self.DESLIGADO:
+            self._entradas = None
+        else:
+            raise ValueError(f"Política de histórico desconhecida: {politica}")
+        self.politica = politica
+        self.extend(entradas)
+
+    def registrar(self, rodada: int, ator: str, acao: AcaoHistorico, carta: Optional[ModeloCarta] = None,
+                  alvo: Union[ModeloCarta, str, None] = None, estatisticas: Tuple[int, ...] = ()):
+        """Registra uma ação do jogo."""
+        if self._entradas is not None:
+            self._entradas.append(RegistroHistorico(rodada, ator, acao, carta, alvo, estatisticas))
+
+    def append(self, entrada: Entrada):
+        """Acrescenta um registro pronto ou uma linha de texto livre."""
+        if self._entradas is not None:
+            self._entradas.append(entrada)
+
+    def extend(self, entradas: Iterable[Entrada]):
+        for entrada in entradas:
+            self.append(entrada)
+
+    def ultimos(self, quantidade: int) -> List[Entrada]:
+        """Devolve os `quantidade` registros mais recentes, do mais antigo para o mais novo."""
+        if not self._entradas:
+            return []
+        recentes = list(islice(reversed(self._entradas), quantidade))
+        recentes.reverse()
+        return recentes
+
+    def registros(self) -> Iterator[Entrada]:
+        """Percorre os registros guardados sem formatá-los."""
+        return iter(self._entradas or ())
+
+    def __len__(self) -> int:
+        return len(self._entradas) if self._entradas is not None else 0
+
+    def __iter__(self) -> Iterator[str]:
+        return (_texto(entrada) for entrada in self.registros())
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [_texto(entrada) for entrada in list(self.registros())[indice]]
+        if self._entradas is None:
+            raise IndexError("histórico desligado")
+        return _texto(self._entradas[indice])
@@ -1,52 +1,179 @@
+import copy
 import random
 import jogo_estrutura.utils as utils
-from typing import List
+from jogo_estrutura import eventos
+from jogo_estrutura.historico import AcaoHistorico, Historico
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+class EstadoJogo(NamedTuple):
+    """Fotografia de uma partida, usada por `Jogo.restaurar`."""
+    turno: int
+    encerrar_jogo: bool
+    jogadores: tuple  # jogadores ainda em jogo, na ordem dos turnos
+    estados: Tuple[tuple, ...]  # pares (jogador, EstadoJogador), incluindo quem for derrotado depois
+    rng: Optional[tuple]  # estado do gerador da partida, se capturado
 
 class Jogo:
     """Representa o jogo de cartas."""
-    def __init__(self, jogadores: list):
+    def __init__(self, jogadores: list, tamanho_baralho: int = 30, cartas_iniciais: int = 3,
+                 politica_historico: str = Historico.ANEL, capacidade_historico: int = 100,
+                 semente: Optional[int] = None, rng: Optional[random.Random] = None, perfil=None):
         self.jogadores = jogadores
+        # Todos os sorteios da partida (baralhos, embaralhamento e efeitos das cartas) usam este
+        # gerador, então a mesma semente repete a partida sem depender do gerador global. Sem
+        # semente nem gerador, a semente é sorteada, para que toda partida possa ser gravada.
+        if semente is None and rng is None:
+            semente = random.getrandbits(64)
+        self.semente = semente
+        self.rng = rng if rng is not None else random.Random(semente)
         self.turno = 0
-        self.historico: List[str] = []
+        self.politica_historico = politica_historico
+        self.capacidade_historico = capacidade_historico
+        self.historico = Historico(politica_historico, capacidade_historico)
         self.encerrar_jogo = False
+        self.tamanho_baralho = tamanho_baralho
+        self.cartas_iniciais = cartas_iniciais
+        self.gravacao = None  # `GravacaoPartida` que recebe as ações, veja `jogo_estrutura.replay`
+        self.perfil = perfil  # `Perfil` que mede as fases do turno, veja `jogo_estrutura.perfil`
+
+    @property
+    def historico(self) -> Historico:
+        return self._historico
+
+    @historico.setter
+    def historico(self, entradas: Iterable):
+        if not isinstance(entradas, Historico):
+            entradas = Historico(self.politica_historico, self.capacidade_historico, entradas)
+        self._historico = entradas
+
+    def capturar(self, incluir_rng: bool = False) -> EstadoJogo:
+        """Guarda o estado da partida em poucos microssegundos.
+
+        O histórico não faz parte do estado. Com `incluir_rng`, o estado do gerador da partida
+        também é guardado, para repetir os mesmos sorteios depois de restaurar.
+        """
+        return EstadoJogo(self.turno, self.encerrar_jogo, tuple(self.jogadores),
+                          tuple((jogador, jogador.capturar()) for jogador in self.jogadores),
+                          self.rng.getstate() if incluir_rng else None)
+
+    def restaurar(self, estado: EstadoJogo):
+        """Volta a partida para um estado guardado por `capturar`."""
+        self.turno = estado.turno
+        self.encerrar_jogo = estado.encerrar_jogo
+        self.jogadores = list(estado.jogadores)
+        for jogador, estado_jogador in estado.estados:
+            jogador.restaurar(estado_jogador)
+        if estado.rng is not None:
+            self.rng.setstate(estado.rng)
+
+    def clonar(self, manter_historico: bool = False) -> "Jogo":
+        """Cria uma partida independente com o mesmo estado, para buscas e análises "e se".
+
+        Por padrão o clone não guarda histórico; com `manter_historico` ele recebe uma
+        cópia dos registros atuais, que são imutáveis e por isso compartilhados. O clone tem
+        o próprio gerador, no mesmo estado do gerador da partida.
+        """
+        clone = copy.copy(self)
+        clone.rng = random.Random()
+        clone.rng.setstate(self.rng.getstate())
+        clone.jogadores = [jogador.clonar(clone.rng) for jogador in self.jogadores]
+        clone.gravacao = None
+        clone.perfil = None
+        if manter_historico:
+            clone._historico = Historico(self.politica_historico, self.capacidade_historico, self.historico.registros())
+        else:
+            clone._historico = Historico(Historico.DESLIGADO)
+        return clone
+
+    def distribuir_baralhos(self, cartas: list):
+        """Sorteia `tamanho_baralho` cartas do catálogo para o baralho de cada jogador."""
+        for jogador in self.jogadores:
+            jogador.baralho.extend(carta.nova_copia() for carta in self.rng.choices(cartas, k=self.tamanho_baralho))
 
     def iniciar(self):
         """Inicia o jogo."""
-        print("Iniciando o jogo!")
+        eventos.emitir(eventos.JogoIniciado())
         for jogador in self.jogadores:
-            random.shuffle(jogador.baralho)
-            for _ in range(3):
+            jogador.baralho.embaralhar(self.rng)
+            for _ in range(self.cartas_iniciais):
                 jogador.comprar_carta()
 
     def jogar_turno(self):
         """Joga um turno do jogo."""
         if self.encerrar_jogo: 
             return False
+        if self.perfil is not None:
+            return self._jogar_turno_com_perfil(self.perfil)
         utils.limpar_tela()
-        rodada_atual = self.turno + 1
+        jogador_atual, jogador_alvo = self.iniciar_turno()
+
+        # Ação do jogador
+        self._acao_do_jogador(jogador_atual, jogador_alvo)
+
+        return self.finalizar_turno(jogador_alvo)
+
+    def _acao_do_jogador(self, jogador_atual, jogador_alvo):
+        if self.gravacao is None:
+            jogador_atual.escolher_acao(jogador_alvo, self)
+        else:
+            gravadas = len(self.gravacao.acoes)
+            jogador_atual.escolher_acao(jogador_alvo, self)
+            self.gravacao.encerrar_turno(gravadas, self.encerrar_jogo)
+
+    def _jogar_turno_com_perfil(self, perfil) -> bool:
+        """`jogar_turno` medindo cada fase no perfil da partida."""
+        with perfil.fase("renderizacao"):
+            utils.limpar_tela()
+        with perfil.fase("compra"):
+            jogador_atual, jogador_alvo = self.iniciar_turno()
+
+        # No turno do jogador atual só as criaturas do alvo que morrem vão para o cemitério dele.
+        cemiterio_alvo = len(jogador_alvo.cemiterio)
+        perfil.entrar("decisao")
+        try:
+            self._acao_do_jogador(jogador_atual, jogador_alvo)
+        finally:
+            perfil.registrar_decisao(jogador_atual.nome, perfil.sair())
+        perfil.contar("criaturas_mortas", len(jogador_alvo.cemiterio) - cemiterio_alvo)
+        perfil.contar("turnos")
+
+        with perfil.fase("fim_turno"):
+            return self.finalizar_turno(jogador_alvo)
+
+    def passar_a_vez(self, jogador):
+        """Registra que `jogador` passou a vez no turno atual."""
+        self.historico.registrar(self.turno + 1, jogador.nome, AcaoHistorico.PASSOU)
+        if self.gravacao is not None:
+            self.gravacao.passar()
+        if self.perfil is not None:
+            self.perfil.contar("passes")
+
+    def iniciar_turno(self):
+        """Começa o turno do jogador da vez (mana e compra) e devolve o jogador atual e o seu alvo."""
         jogador_atual = self.jogadores[self.turno % len(self.jogadores)]
-        print(f"\nRodada número {rodada_atual}.\nÉ a vez de {jogador_atual.nome}!")
+        eventos.emitir(eventos.RodadaIniciada(self.turno + 1, jogador_atual.nome))
         jogador_atual.mana += 1
-        print(f"{jogador_atual.nome} ganha 1 mana. Mana total: {jogador_atual.mana}")
+        eventos.emitir(eventos.ManaGanha(jogador_atual.nome, jogador_atual.mana))
         jogador_atual.comprar_carta()
-
-        # Ação do jogador
         jogador_alvo = self.jogadores[(self.turno + 1) % len(self.jogadores)]
-        jogador_atual.escolher_acao(jogador_alvo, self)
+        return jogador_atual, jogador_alvo
 
+    def finalizar_turno(self, jogador_alvo) -> bool:
+        """Encerra o turno depois da ação do jogador; devolve False se o jogo acabou."""
         if self.encerrar_jogo:
             return False
 
         # Verificar se algum jogador perdeu
+        rodada_atual = self.turno + 1
         if jogador_alvo.saude <= 0:
-            print(f"{jogador_alvo.nome} foi derrotado!")
-            self.historico.append(f"Rodada {rodada_atual}: {jogador_alvo.nome} foi derrotado!")
+            eventos.emitir(eventos.JogadorDerrotado(jogador_alvo.nome))
+            self.historico.registrar(rodada_atual, jogador_alvo.nome, AcaoHistorico.DERROTADO)
             self.jogadores.remove(jogador_alvo)
 
         self.turno += 1
         if len(self.jogadores) == 1:
             vencedor = self.jogadores[0].nome
-            print(f"{vencedor} é o vencedor!")
-            self.historico.append(f"Rodada {rodada_atual}: {vencedor} é o vencedor!")
+            eventos.emitir(eventos.VencedorDefinido(vencedor))
+            self.historico.registrar(rodada_atual, vencedor, AcaoHistorico.VENCEDOR)
             return False
-        return True
\ No newline at end of file
+        return True
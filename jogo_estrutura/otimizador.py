@@ -0,0 +1,254 @@
+"""Otimização de baralhos por algoritmo genético contra um adversário de referência.
+
+Cada baralho é avaliado pela taxa de pontos (empates valem meio ponto) em partidas simuladas
+contra a referência, alternando quem começa. As partidas rodam em um pool de processos com o
+jogo de `jogo_estrutura.torneio`, e a avaliação é adaptativa:
+
+- todo baralho novo joga `amostra_inicial` partidas;
+- os que ainda podem estar entre os `elite` melhores (limite superior do intervalo de Wilson
+  acima do limite inferior do `elite`-ésimo colocado) têm a amostra dobrada, até
+  `amostra_maxima`; os demais param por aí;
+- os resultados ficam guardados por baralho (a ordem das cartas não importa), então um
+  baralho que reaparece em outra geração só joga as partidas que faltam.
+
+A partida `i` de qualquer baralho usa a mesma semente, derivada da semente da otimização:
+os baralhos são comparados nas mesmas condições, e o resultado não depende da quantidade de
+processos. O melhor baralho é gravado no formato de `--arquivo-baralhos` do torneio.
+
+    python -m jogo_estrutura.otimizador --geracoes 30 -p 0 --saida otimizado.json
+    python -m jogo_estrutura.torneio --arquivo-baralhos otimizado.json
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from jogador.jogador_ia import JogadorIA
+from jogo_estrutura.simulacao import carregar_catalogo
+from jogo_estrutura.torneio import (Participante, conferir_baralhos, conferir_nomes, iniciar_trabalhador, intervalo_wilson,
+                                    jogar_lote, sortear_baralho)
+
+Baralho = Tuple[str, ...]  # nomes das cartas em ordem alfabética
+
+def normalizar(cartas: Iterable[str]) -> Baralho:
+    """Forma única do baralho, usada como chave: a ordem das cartas não importa, já que ele é embaralhado."""
+    return tuple(sorted(cartas))
+
+class Aptidao:
+    """Partidas e pontos acumulados de um baralho contra a referência."""
+    __slots__ = ("partidas", "pontos")
+
+    def __init__(self):
+        self.partidas = 0
+        self.pontos = 0.0
+
+    @property
+    def taxa(self) -> float:
+        return self.pontos / self.partidas if self.partidas else 0.0
+
+class OtimizadorBaralhos:
+    """Algoritmo genético sobre baralhos de `tamanho` cartas do catálogo.
+
+    A cada geração, os `elite` melhores passam direto e o resto da população vem de
+    cruzamentos entre baralhos escolhidos por torneio de três, seguidos de mutação: cada carta
+    do filho é trocada por uma carta sorteada do catálogo com probabilidade `taxa_mutacao`.
+    """
+    def __init__(self, referencia: Participante, arquivo_csv: str = 'cartas_game.csv', tamanho: int = 30,
+                 populacao: int = 24, elite: int = 4, taxa_mutacao: float = 0.05, amostra_inicial: int = 20,
+                 amostra_maxima: int = 320, partidas_por_lote: int = 20, confianca: float = 0.95,
+                 estrategia: Callable = JogadorIA, max_turnos: int = 500, cartas_iniciais: int = 3,
+                 semente: Optional[int] = None):
+        self.referencia = referencia
+        # As partidas são contadas pelo nome de cada lado, então o candidato não pode ter o nome da referência.
+        self.nome_candidato = "Candidato" if referencia.nome != "Candidato" else "Candidato otimizado"
+        conferir_nomes([Participante(self.nome_candidato, ()), referencia])
+        self.arquivo_csv = arquivo_csv
+        self.cartas = carregar_catalogo(arquivo_csv)
+        conferir_baralhos([referencia], {carta.nome: carta for carta in self.cartas})
+        self.nomes = sorted({carta.nome for carta in self.cartas})
+        self.tamanho = tamanho
+        self.populacao = populacao
+        self.elite = elite
+        self.taxa_mutacao = taxa_mutacao
+        self.amostra_inicial = amostra_inicial
+        self.amostra_maxima = amostra_maxima
+        self.partidas_por_lote = partidas_por_lote
+        self.z = statistics.NormalDist().inv_cdf(1 - (1 - confianca) / 2)
+        self.estrategia = estrategia
+        self.max_turnos = max_turnos
+        self.cartas_iniciais = cartas_iniciais
+        self.semente = semente if semente is not None else random.getrandbits(64)
+        self.rng = random.Random(self.semente)
+        self.aptidoes: Dict[Baralho, Aptidao] = {}
+        self.partidas_jogadas = 0
+        self.geracoes: List[dict] = []
+
+    def intervalo(self, baralho: Baralho) -> Tuple[float, float]:
+        aptidao = self.aptidoes[baralho]
+        return intervalo_wilson(aptidao.pontos, aptidao.partidas, self.z)
+
+    def executar(self, geracoes: int = 30, processos: Optional[int] = None,
+                 ao_terminar_geracao: Optional[Callable[[dict], None]] = None) -> dict:
+        """Evolui a população por `geracoes` gerações e devolve `relatorio()`.
+
+        Com `processos=None` é usado um processo por núcleo; com 1, tudo roda neste processo.
+        `ao_terminar_geracao` recebe o resumo de cada geração.
+        """
+        processos = processos or os.cpu_count() or 1
+        if processos == 1:
+            cartas_por_nome = {carta.nome: carta for carta in self.cartas}
+            return self._evoluir(geracoes, lambda tarefas: [jogar_lote(tarefa, cartas_por_nome) for tarefa in tarefas],
+                                 ao_terminar_geracao)
+        with ProcessPoolExecutor(processos, initializer=iniciar_trabalhador, initargs=(self.arquivo_csv,)) as pool:
+            return self._evoluir(geracoes, lambda tarefas: list(pool.map(jogar_lote, tarefas)), ao_terminar_geracao)
+
+    def _evoluir(self, geracoes: int, executar_lotes, ao_terminar_geracao) -> dict:
+        populacao = [normalizar(sortear_baralho(self.cartas, self.tamanho, self.rng)) for _ in range(self.populacao)]
+        for numero in range(geracoes):
+            jogadas = self.partidas_jogadas
+            classificados = self._avaliar(populacao, executar_lotes)
+            melhor = classificados[0]
+            resumo = {
+                "geracao": numero + 1,
+                "melhor_taxa": round(self.aptidoes[melhor].taxa, 4),
+                "melhor_intervalo": [round(limite, 4) for limite in self.intervalo(melhor)],
+                "taxa_media": round(statistics.mean(self.aptidoes[baralho].taxa for baralho in populacao), 4),
+                "partidas": self.partidas_jogadas - jogadas,
+                "baralhos_distintos": len(classificados),
+            }
+            self.geracoes.append(resumo)
+            if ao_terminar_geracao:
+                ao_terminar_geracao(resumo)
+            if numero + 1 < geracoes:
+                populacao = self._proxima_geracao(classificados)
+        return self.relatorio()
+
+    def _avaliar(self, populacao: Sequence[Baralho], executar_lotes) -> List[Baralho]:
+        """Joga as partidas que faltam para a população e devolve os baralhos distintos, do melhor ao pior."""
+        distintos = list(dict.fromkeys(populacao))
+        alvos = {baralho: self.amostra_inicial for baralho in distintos}
+        while alvos:
+            self._completar(alvos, executar_lotes)
+            classificados = self._classificar(distintos)
+            limiar = self.intervalo(classificados[min(self.elite, len(classificados)) - 1])[0]
+            alvos = {}
+            for baralho in distintos:
+                partidas = self.aptidoes[baralho].partidas
+                if partidas < self.amostra_maxima and self.intervalo(baralho)[1] >= limiar:
+                    alvos[baralho] = min(2 * partidas, self.amostra_maxima)
+        return classificados
+
+    def _classificar(self, baralhos: Iterable[Baralho]) -> List[Baralho]:
+        return sorted(baralhos, key=lambda baralho: (-self.aptidoes[baralho].taxa, baralho))
+
+    def _completar(self, alvos: Dict[Baralho, int], executar_lotes):
+        """Joga, em lotes paralelos, as partidas que faltam para cada baralho chegar ao seu alvo."""
+        tarefas, donos = [], []
+        for baralho, alvo in alvos.items():
+            aptidao = self.aptidoes.setdefault(baralho, Aptidao())
+            candidato = Participante(self.nome_candidato, baralho, self.estrategia)
+            for inicio in range(aptidao.partidas, alvo, self.partidas_por_lote):
+                quantidade = min(self.partidas_por_lote, alvo - inicio)
+                tarefas.append((candidato, self.referencia, self.semente, inicio, quantidade,
+                                self.max_turnos, self.cartas_iniciais))
+                donos.append(baralho)
+        for baralho, resultado in zip(donos, executar_lotes(tarefas)):
+            aptidao = self.aptidoes[baralho]
+            aptidao.partidas += resultado.vitorias + resultado.empates + resultado.derrotas
+            aptidao.pontos += resultado.vitorias + resultado.empates / 2
+            self.partidas_jogadas += resultado.vitorias + resultado.empates + resultado.derrotas
+
+    def _proxima_geracao(self, classificados: List[Baralho]) -> List[Baralho]:
+        nova = classificados[:self.elite]
+        while len(nova) < self.populacao:
+            filho = self._cruzar(self._selecionar(classificados), self._selecionar(classificados))
+            nova.append(normalizar(self._mutar(filho)))
+        return nova
+
+    def _selecionar(self, classificados: List[Baralho]) -> Baralho:
+        # Torneio de três: a lista está do melhor para o pior, então vence o menor índice sorteado.
+        return classificados[min(self.rng.randrange(len(classificados)) for _ in range(3))]
+
+    def _cruzar(self, pai: Baralho, mae: Baralho) -> List[str]:
+        """Filho com `tamanho` cartas sorteadas das cartas dos dois baralhos juntos."""
+        return self.rng.sample(pai + mae, self.tamanho)
+
+    def _mutar(self, cartas: List[str]) -> List[str]:
+        return [self.rng.choice(self.nomes) if self.rng.random() < self.taxa_mutacao else carta for carta in cartas]
+
+    def melhor(self) -> Baralho:
+        """O baralho avaliado com o maior limite inferior do intervalo, para não premiar sorte em amostras pequenas."""
+        return max(self.aptidoes, key=lambda baralho: (self.intervalo(baralho)[0], baralho))
+
+    def relatorio(self) -> dict:
+        melhor = self.melhor()
+        return {
+            "semente": self.semente,
+            "partidas": self.partidas_jogadas,
+            "baralhos_avaliados": len(self.aptidoes),
+            "melhor": {
+                "cartas": dict(sorted(Counter(melhor).items(), key=lambda item: (-item[1], item[0]))),
+                "taxa": round(self.aptidoes[melhor].taxa, 4),
+                "intervalo": [round(limite, 4) for limite in self.intervalo(melhor)],
+                "partidas": self.aptidoes[melhor].partidas,
+            },
+            "geracoes": self.geracoes,
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--geracoes", type=int, default=30)
+    parser.add_argument("--populacao", type=int, default=24)
+    parser.add_argument("--elite", type=int, default=4, help="baralhos que passam direto para a próxima geração")
+    parser.add_argument("--mutacao", type=float, default=0.05, help="probabilidade de trocar cada carta do filho")
+    parser.add_argument("--amostra-inicial", type=int, default=20, help="partidas de cada baralho novo")
+    parser.add_argument("--amostra-maxima", type=int, default=320, help="partidas dos baralhos que disputam a elite")
+    parser.add_argument("--tamanho-baralho", type=int, default=30)
+    parser.add_argument("--referencia", metavar="ARQUIVO",
+                        help='JSON {"nome": ["carta", ...]} com o baralho de referência (o primeiro); padrão: sorteado do catálogo')
+    parser.add_argument("--banco", default="cartas_game.csv", help="CSV de cartas ou banco SQLite (.db)")
+    parser.add_argument("-p", "--processos", type=int, default=0, help="processos trabalhadores (0 usa todos os núcleos)")
+    parser.add_argument("--semente", type=int, default=None)
+    parser.add_argument("--saida", help="grava o melhor baralho no formato de --arquivo-baralhos do torneio")
+    parser.add_argument("--relatorio", help="grava o relatório JSON com a evolução das gerações")
+    args = parser.parse_args()
+
+    semente = args.semente if args.semente is not None else random.getrandbits(64)
+    if args.referencia:
+        with open(args.referencia, encoding="utf-8") as arquivo:
+            nome, cartas = next(iter(json.load(arquivo).items()))
+        referencia = Participante(nome, tuple(cartas))
+    else:
+        referencia = Participante("Referência", sortear_baralho(carregar_catalogo(args.banco), args.tamanho_baralho,
+                                                                random.Random(semente)))
+
+    otimizador = OtimizadorBaralhos(referencia, arquivo_csv=args.banco, tamanho=args.tamanho_baralho,
+                                    populacao=args.populacao, elite=args.elite, taxa_mutacao=args.mutacao,
+                                    amostra_inicial=args.amostra_inicial, amostra_maxima=args.amostra_maxima,
+                                    semente=semente)
+
+    def ao_terminar_geracao(resumo: dict):
+        inferior, superior = resumo["melhor_intervalo"]
+        print(f"Geração {resumo['geracao']}: melhor {100 * resumo['melhor_taxa']:.1f}% "
+              f"[{100 * inferior:.1f}%, {100 * superior:.1f}%], média {100 * resumo['taxa_media']:.1f}%, "
+              f"{resumo['partidas']} partidas", flush=True)
+
+    relatorio = otimizador.executar(args.geracoes, args.processos or None, ao_terminar_geracao)
+    melhor = relatorio["melhor"]
+    print(f"\nPartidas jogadas: {relatorio['partidas']}, baralhos avaliados: {relatorio['baralhos_avaliados']}")
+    print(f"Melhor baralho: {100 * melhor['taxa']:.1f}% contra {referencia.nome} em {melhor['partidas']} partidas")
+    for carta, copias in melhor["cartas"].items():
+        print(f"  {copias}x {carta}")
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            cartas = [carta for carta, copias in melhor["cartas"].items() for _ in range(copias)]
+            json.dump({"Otimizado": cartas, referencia.nome: list(referencia.baralho)}, arquivo, ensure_ascii=False, indent=2)
+    if args.relatorio:
+        with open(args.relatorio, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
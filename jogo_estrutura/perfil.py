@@ -0,0 +1,126 @@
+"""Medição opcional de onde o tempo das partidas é gasto.
+
+Um `Perfil` passado a `Jogo(perfil=...)` acumula, para todas as partidas que o usarem:
+
+- o tempo exclusivo de cada fase do turno (`FASES`); uma fase aninhada em outra, como um
+  feitiço lançado durante a decisão da IA, é descontada da fase de fora;
+- contadores de cartas jogadas, feitiços lançados, criaturas mortas, ataques, passes e turnos;
+- histogramas da latência de decisão de cada jogador, em faixas de potências de 2 microssegundos.
+
+Sem perfil (`Jogo.perfil is None`) o custo é um teste de atributo por turno e por ação.
+"""
+import contextlib
+import json
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+FASES = ("renderizacao", "compra", "decisao", "cartas", "feiticos", "combate", "fim_turno")
+
+class Histograma:
+    """Contagem de latências em faixas [2^(k-1), 2^k) microssegundos."""
+    __slots__ = ("faixas", "quantidade", "total", "maximo")
+
+    def __init__(self):
+        self.faixas = Counter()
+        self.quantidade = 0
+        self.total = 0.0
+        self.maximo = 0.0
+
+    def registrar(self, segundos: float):
+        self.faixas[int(segundos * 1e6).bit_length()] += 1
+        self.quantidade += 1
+        self.total += segundos
+        if segundos > self.maximo:
+            self.maximo = segundos
+
+    def combinar(self, outro: "Histograma"):
+        self.faixas.update(outro.faixas)
+        self.quantidade += outro.quantidade
+        self.total += outro.total
+        self.maximo = max(self.maximo, outro.maximo)
+
+    def percentil(self, fracao: float) -> float:
+        """Limite superior, em microssegundos, da faixa que contém o percentil pedido."""
+        alvo = fracao * self.quantidade
+        acumulado = 0
+        for faixa in sorted(self.faixas):
+            acumulado += self.faixas[faixa]
+            if acumulado >= alvo:
+                return float(2 ** faixa)
+        return 0.0
+
+    def para_dict(self) -> dict:
+        return {
+            "quantidade": self.quantidade,
+            "media_us": round(self.total / self.quantidade * 1e6, 2) if self.quantidade else 0.0,
+            "maximo_us": round(self.maximo * 1e6, 2),
+            "p50_us": self.percentil(0.5),
+            "p99_us": self.percentil(0.99),
+            "faixas_us": {str(2 ** faixa): self.faixas[faixa] for faixa in sorted(self.faixas)},
+        }
+
+class Perfil:
+    """Acumula tempos por fase, contadores e latências de decisão de uma ou mais partidas."""
+    def __init__(self):
+        self.tempos: Dict[str, float] = defaultdict(float)
+        self.chamadas = Counter()
+        self.contadores = Counter()
+        self.latencias: Dict[str, Histograma] = defaultdict(Histograma)
+        self._pilha: List[list] = []  # [fase, início, tempo das fases aninhadas]
+
+    def entrar(self, fase: str):
+        self._pilha.append([fase, time.perf_counter(), 0.0])
+
+    def sair(self) -> float:
+        """Fecha a fase aberta por último e devolve a sua duração total, com as aninhadas."""
+        fase, inicio, aninhadas = self._pilha.pop()
+        duracao = time.perf_counter() - inicio
+        self.tempos[fase] += duracao - aninhadas
+        self.chamadas[fase] += 1
+        if self._pilha:
+            self._pilha[-1][2] += duracao
+        return duracao
+
+    @contextlib.contextmanager
+    def fase(self, fase: str):
+        self.entrar(fase)
+        try:
+            yield
+        finally:
+            self.sair()
+
+    def contar(self, contador: str, quantidade: int = 1):
+        self.contadores[contador] += quantidade
+
+    def registrar_decisao(self, jogador: str, segundos: float):
+        self.latencias[jogador].registrar(segundos)
+
+    def combinar(self, outro: "Perfil"):
+        """Soma outro perfil a este, por exemplo o de cada processo de uma simulação paralela."""
+        for fase, tempo in outro.tempos.items():
+            self.tempos[fase] += tempo
+        self.chamadas.update(outro.chamadas)
+        self.contadores.update(outro.contadores)
+        for jogador, histograma in outro.latencias.items():
+            self.latencias[jogador].combinar(histograma)
+
+    def para_dict(self) -> dict:
+        total = sum(self.tempos.values())
+        return {
+            "fases": {
+                fase: {
+                    "total_s": round(tempo, 6),
+                    "chamadas": self.chamadas[fase],
+                    "fracao": round(tempo / total, 4) if total else 0.0,
+                }
+                for fase, tempo in sorted(self.tempos.items(), key=lambda item: -item[1])
+            },
+            "contadores": dict(sorted(self.contadores.items())),
+            "latencia_decisao": {jogador: histograma.para_dict() for jogador, histograma in sorted(self.latencias.items())},
+        }
+
+    def salvar(self, caminho: str):
+        """Grava o resumo agregado em JSON."""
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            json.dump(self.para_dict(), arquivo, ensure_ascii=False, indent=2)
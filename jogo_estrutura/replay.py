@@ -0,0 +1,336 @@
+"""Gravação compacta de partidas e reprodução a partir da gravação.
+
+Uma partida gravada guarda só a semente, a configuração e uma ação por turno; como todos os
+sorteios vêm do gerador da partida, repetir as ações com a mesma semente reconstrói a
+partida inteira por `Jogo.jogar_turno`. As partidas precisam começar com
+`Jogo.distribuir_baralhos` seguido de `Jogo.iniciar`, como em `main.py` e na simulação.
+
+Formato do arquivo de gravação: o cabeçalho `MAGICO` e, para cada partida, o tamanho do
+bloco (4 bytes) seguido do bloco. Ao lado fica o índice (`<arquivo>.idx`), com a posição
+de cada partida em 8 bytes, então a partida N é lida com dois `seek`, sem percorrer o arquivo.
+"""
+import hashlib
+import os
+import struct
+from typing import Iterator, NamedTuple, Optional, Sequence, Tuple
+from banco.cartas import Carta
+from jogador import Jogador
+from jogo_estrutura.historico import Historico
+from jogo_estrutura.jogo import Jogo
+import jogo_estrutura.utils as utils
+
+MAGICO = b"CJRP\x01"
+
+# Códigos de ação, nos três bits baixos do primeiro byte de cada ação; cada turno grava uma ação.
+PASSAR, JOGAR, ATACAR, SAIR, NADA = range(5)  # NADA: o turno terminou sem nenhuma ação válida
+_COM_JOGADOR_ALVO = 0x08  # JOGAR: o adversário foi informado em `jogador_alvo`
+_COM_ALVO = 0x10          # JOGAR/ATACAR: há uma criatura alvo
+
+_TAMANHO = struct.Struct("<I")
+_POSICAO = struct.Struct("<Q")
+
+def _escrever_varint(saida: bytearray, valor: int):
+    while valor >= 0x80:
+        saida.append((valor & 0x7F) | 0x80)
+        valor >>= 7
+    saida.append(valor)
+
+def _ler_varint(dados: bytes, posicao: int) -> Tuple[int, int]:
+    valor = deslocamento = 0
+    while True:
+        byte = dados[posicao]
+        posicao += 1
+        valor |= (byte & 0x7F) << deslocamento
+        if byte < 0x80:
+            return valor, posicao
+        deslocamento += 7
+
+def impressao_catalogo(cartas: Sequence[Carta]) -> bytes:
+    """Resumo de 8 bytes do catálogo; a reprodução só vale com o mesmo catálogo da gravação."""
+    resumo = hashlib.blake2b(digest_size=8)
+    for carta in cartas:
+        # Os opcodes dependem da ordem em que os efeitos foram registrados no processo, não do catálogo.
+        resumo.update(f"{type(carta).__name__}{carta.modelo._replace(opcodes=())!r}\n".encode())
+    return resumo.digest()
+
+class GravacaoPartida:
+    """Ações de uma partida em andamento, já codificadas; fica em `Jogo.gravacao`."""
+    __slots__ = ("nomes", "acoes")
+
+    def __init__(self, nomes):
+        self.nomes = tuple(nomes)
+        self.acoes = bytearray()
+
+    def jogar(self, indice_carta: int, indice_alvo: Optional[int], com_jogador_alvo: bool):
+        self._registrar(JOGAR | (_COM_JOGADOR_ALVO if com_jogador_alvo else 0), indice_carta, indice_alvo)
+
+    def atacar(self, indice_atacante: int, indice_alvo: Optional[int]):
+        self._registrar(ATACAR, indice_atacante, indice_alvo)
+
+    def passar(self):
+        self.acoes.append(PASSAR)
+
+    def encerrar_turno(self, tamanho_anterior: int, encerrar_jogo: bool):
+        """Chamado por `Jogo.jogar_turno`: completa turnos que não gravaram nenhuma ação."""
+        if len(self.acoes) == tamanho_anterior:
+            self.acoes.append(SAIR if encerrar_jogo else NADA)
+
+    def _registrar(self, cabecalho: int, indice: int, indice_alvo: Optional[int]):
+        if indice_alvo is not None:
+            cabecalho |= _COM_ALVO
+        self.acoes.append(cabecalho)
+        _escrever_varint(self.acoes, indice)
+        if indice_alvo is not None:
+            _escrever_varint(self.acoes, indice_alvo)
+
+def decodificar_acoes(dados: bytes) -> Iterator[Tuple[int, Optional[int], Optional[int], bool]]:
+    """Percorre ações codificadas por `GravacaoPartida` como tuplas (código, índice, alvo, com_jogador_alvo)."""
+    posicao = 0
+    while posicao < len(dados):
+        cabecalho = dados[posicao]
+        posicao += 1
+        codigo = cabecalho & 0x07
+        indice = alvo = None
+        if codigo in (JOGAR, ATACAR):
+            indice, posicao = _ler_varint(dados, posicao)
+        if cabecalho & _COM_ALVO:
+            alvo, posicao = _ler_varint(dados, posicao)
+        yield codigo, indice, alvo, bool(cabecalho & _COM_JOGADOR_ALVO)
+
+class PartidaGravada(NamedTuple):
+    """Uma partida lida da gravação."""
+    semente: int
+    tamanho_baralho: int
+    cartas_iniciais: int
+    nomes: Tuple[str, ...]
+    catalogo: bytes  # `impressao_catalogo` do catálogo usado
+    acoes: bytes
+
+    def decodificar_acoes(self) -> Iterator[Tuple[int, Optional[int], Optional[int], bool]]:
+        """Percorre as ações como tuplas (código, índice, alvo, com_jogador_alvo)."""
+        return decodificar_acoes(self.acoes)
+
+    def codificar(self) -> bytes:
+        bloco = bytearray(struct.pack("<Q", self.semente))
+        bloco += self.catalogo
+        _escrever_varint(bloco, self.tamanho_baralho)
+        _escrever_varint(bloco, self.cartas_iniciais)
+        _escrever_varint(bloco, len(self.nomes))
+        for nome in self.nomes:
+            codificado = nome.encode()
+            _escrever_varint(bloco, len(codificado))
+            bloco += codificado
+        bloco += self.acoes
+        return bytes(bloco)
+
+    @classmethod
+    def decodificar(cls, bloco: bytes) -> "PartidaGravada":
+        semente, = struct.unpack_from("<Q", bloco)
+        catalogo = bloco[8:16]
+        tamanho_baralho, posicao = _ler_varint(bloco, 16)
+        cartas_iniciais, posicao = _ler_varint(bloco, posicao)
+        quantidade, posicao = _ler_varint(bloco, posicao)
+        nomes = []
+        for _ in range(quantidade):
+            tamanho, posicao = _ler_varint(bloco, posicao)
+            nomes.append(bloco[posicao:posicao + tamanho].decode())
+            posicao += tamanho
+        return cls(semente, tamanho_baralho, cartas_iniciais, tuple(nomes), catalogo, bloco[posicao:])
+
+def _caminho_indice(caminho: str) -> str:
+    return caminho + ".idx"
+
+class GravadorReplay:
+    """Acrescenta partidas a um arquivo de gravação e ao seu índice.
+
+    A memória usada não depende de quantas partidas já foram gravadas: cada partida fica em
+    memória só até `finalizar` escrevê-la no arquivo.
+    """
+    def __init__(self, caminho: str, cartas: Sequence[Carta]):
+        self.caminho = caminho
+        self._catalogo = impressao_catalogo(cartas)
+        novo = not os.path.exists(caminho) or os.path.getsize(caminho) == 0
+        if not novo and not _indice_confere(caminho):
+            # Índice ausente ou de outra versão da gravação, ou um bloco final incompleto
+            # deixado por uma falha: refaz o índice e descarta o bloco antes de acrescentar.
+            _, fim = _reconstruir_indice(caminho)
+            os.truncate(caminho, fim)
+        self._arquivo = open(caminho, "ab")
+        if novo:
+            self._arquivo.write(MAGICO)
+            open(_caminho_indice(caminho), "wb").close()
+        self._indice = open(_caminho_indice(caminho), "ab")
+        self.partidas = self._indice.tell() // _POSICAO.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def iniciar(self, jogo: Jogo):
+        """Passa a gravar as ações de `jogo`; chame antes do primeiro turno."""
+        if jogo.semente is None:
+            raise ValueError("Só partidas com semente conhecida podem ser gravadas")
+        if not 0 <= jogo.semente < 2 ** 64:
+            # A semente é gravada em 8 bytes; a falha vem antes da partida, e não ao gravá-la.
+            raise ValueError(f"A semente {jogo.semente} não cabe na gravação (use um inteiro entre 0 e 2**64 - 1)")
+        jogo.gravacao = GravacaoPartida(jogador.nome for jogador in jogo.jogadores)
+
+    def finalizar(self, jogo: Jogo) -> int:
+        """Grava a partida no arquivo e devolve o número dela na gravação."""
+        partida = PartidaGravada(jogo.semente, jogo.tamanho_baralho, jogo.cartas_iniciais,
+                                 jogo.gravacao.nomes, self._catalogo, bytes(jogo.gravacao.acoes))
+        jogo.gravacao = None
+        bloco = partida.codificar()
+        posicao = self._arquivo.tell()
+        self._arquivo.write(_TAMANHO.pack(len(bloco)))
+        self._arquivo.write(bloco)
+        self._indice.write(_POSICAO.pack(posicao))
+        self.partidas += 1
+        return self.partidas - 1
+
+    def fechar(self):
+        self._arquivo.close()
+        self._indice.close()
+
+class LeitorReplay:
+    """Lê partidas de um arquivo de gravação, em sequência ou pelo número via índice."""
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self._arquivo = open(caminho, "rb")
+        if self._arquivo.read(len(MAGICO)) != MAGICO:
+            self._arquivo.close()
+            raise ValueError(f"{caminho} não é uma gravação de partidas")
+        if not os.path.exists(_caminho_indice(caminho)):
+            reconstruir_indice(caminho)
+        self._indice = open(_caminho_indice(caminho), "rb")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def __len__(self) -> int:
+        return os.path.getsize(_caminho_indice(self.caminho)) // _POSICAO.size
+
+    def ler(self, numero: int) -> PartidaGravada:
+        """Lê a partida `numero` sem percorrer as anteriores."""
+        if not 0 <= numero < len(self):
+            raise IndexError("partida fora da gravação")
+        self._indice.seek(numero * _POSICAO.size)
+        posicao, = _POSICAO.unpack(self._indice.read(_POSICAO.size))
+        self._arquivo.seek(posicao)
+        return self._ler_bloco()
+
+    def __iter__(self) -> Iterator[PartidaGravada]:
+        """Percorre todas as partidas em ordem, lendo uma de cada vez."""
+        self._arquivo.seek(len(MAGICO))
+        while True:
+            partida = self._ler_bloco()
+            if partida is None:
+                return
+            yield partida
+
+    def _ler_bloco(self) -> Optional[PartidaGravada]:
+        tamanho = self._arquivo.read(_TAMANHO.size)
+        if len(tamanho) < _TAMANHO.size:
+            return None
+        return PartidaGravada.decodificar(self._arquivo.read(_TAMANHO.unpack(tamanho)[0]))
+
+    def fechar(self):
+        self._arquivo.close()
+        self._indice.close()
+
+def reconstruir_indice(caminho: str) -> int:
+    """Refaz o índice percorrendo a gravação inteira; devolve quantas partidas encontrou.
+
+    Um bloco final incompleto, deixado por uma gravação interrompida, fica fora do índice.
+    """
+    return _reconstruir_indice(caminho)[0]
+
+def _reconstruir_indice(caminho: str) -> Tuple[int, int]:
+    """`reconstruir_indice` que devolve também a posição onde termina o último bloco completo."""
+    partidas = 0
+    tamanho_arquivo = os.path.getsize(caminho)
+    with open(caminho, "rb") as arquivo, open(_caminho_indice(caminho), "wb") as indice:
+        if arquivo.read(len(MAGICO)) != MAGICO:
+            raise ValueError(f"{caminho} não é uma gravação de partidas")
+        posicao = len(MAGICO)
+        while True:
+            tamanho = arquivo.read(_TAMANHO.size)
+            if len(tamanho) < _TAMANHO.size:
+                break
+            fim = posicao + _TAMANHO.size + _TAMANHO.unpack(tamanho)[0]
+            if fim > tamanho_arquivo:
+                break
+            indice.write(_POSICAO.pack(posicao))
+            partidas += 1
+            posicao = fim
+            arquivo.seek(posicao)
+    return partidas, posicao
+
+def _indice_confere(caminho: str) -> bool:
+    """Diz se o índice existe e a sua última entrada aponta para o bloco que termina no fim da gravação."""
+    caminho_indice = _caminho_indice(caminho)
+    if not os.path.exists(caminho_indice):
+        return False
+    tamanho_indice = os.path.getsize(caminho_indice)
+    tamanho_arquivo = os.path.getsize(caminho)
+    if tamanho_indice % _POSICAO.size:
+        return False
+    if tamanho_indice == 0:
+        return tamanho_arquivo == len(MAGICO)
+    with open(caminho_indice, "rb") as indice, open(caminho, "rb") as arquivo:
+        indice.seek(tamanho_indice - _POSICAO.size)
+        posicao, = _POSICAO.unpack(indice.read(_POSICAO.size))
+        arquivo.seek(posicao)
+        tamanho = arquivo.read(_TAMANHO.size)
+    return len(tamanho) == _TAMANHO.size and posicao + _TAMANHO.size + _TAMANHO.unpack(tamanho)[0] == tamanho_arquivo
+
+class ControladorReplay:
+    """Estratégia que repete as ações gravadas em vez de decidir a jogada."""
+    def __init__(self, jogador, acoes: Iterator[Tuple[int, Optional[int], Optional[int], bool]]):
+        self.jogador = jogador
+        self.acoes = acoes
+
+    def escolher_acao(self, jogador_alvo, jogo):
+        codigo, indice, indice_alvo, com_jogador_alvo = next(self.acoes)
+        if codigo == JOGAR:
+            alvo = jogador_alvo.campo_de_batalha[indice_alvo] if indice_alvo is not None else None
+            self.jogador.jogar_carta(indice, alvo=alvo, jogador_alvo=jogador_alvo if com_jogador_alvo else None, jogo=jogo)
+        elif codigo == ATACAR:
+            self.jogador.atacar(jogador_alvo, indice, indice_alvo, jogo=jogo)
+        elif codigo == PASSAR:
+            jogo.passar_a_vez(self.jogador)
+        elif codigo == SAIR:
+            jogo.encerrar_jogo = True
+
+def reproduzir(partida: PartidaGravada, cartas: Sequence[Carta], silencioso: bool = True,
+               politica_historico: str = Historico.COMPLETO) -> Jogo:
+    """Reconstrói a partida gravada jogando-a de novo e devolve o jogo no estado final.
+
+    Com `silencioso=False` os eventos são exibidos como em uma partida normal.
+    """
+    if impressao_catalogo(cartas) != partida.catalogo:
+        raise ValueError("O catálogo de cartas não é o mesmo usado na gravação")
+    acoes = list(partida.decodificar_acoes())
+    fluxo = iter(acoes)
+    jogadores = [Jogador(nome, eh_humano=False, estrategia=lambda jogador: ControladorReplay(jogador, fluxo))
+                 for nome in partida.nomes]
+    jogo = Jogo(jogadores, tamanho_baralho=partida.tamanho_baralho, cartas_iniciais=partida.cartas_iniciais,
+                politica_historico=politica_historico, semente=partida.semente)
+    if silencioso:
+        with utils.modo_headless():
+            _jogar_gravadas(jogo, cartas, len(acoes))
+    else:
+        _jogar_gravadas(jogo, cartas, len(acoes))
+    return jogo
+
+def _jogar_gravadas(jogo: Jogo, cartas: Sequence[Carta], turnos: int):
+    jogo.distribuir_baralhos(cartas)
+    jogo.iniciar()
+    # Uma ação por turno: partidas interrompidas por limite de turnos terminam no mesmo ponto.
+    while jogo.turno < turnos and jogo.jogar_turno():
+        pass
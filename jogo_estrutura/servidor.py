@@ -0,0 +1,337 @@
+"""Servidor de partidas Jogador contra Máquina para muitas sessões ao mesmo tempo.
+
+Cada conexão (TCP ou socket Unix) é uma sessão: o cliente troca mensagens JSON, uma por
+linha, e joga pelo protocolo as mesmas ações do menu do terminal. Todas as partidas ficam no
+laço de eventos e as jogadas humanas chegam pela conexão. Com `processos`, as decisões da
+máquina vão para um pool de processos, para que uma busca demorada (como a `JogadorMCTS`)
+não trave as outras sessões: o processo trabalhador recebe uma cópia da partida, decide e
+devolve só a ação, no formato da gravação de `jogo_estrutura.replay`. A ação é aplicada à
+partida no laço, com o gerador da partida, então o resultado é o mesmo de decidir no laço.
+
+Mensagens do cliente (campo "tipo"):
+
+    {"tipo": "nova_partida", "nome": "Ana", "semente": 42}
+    {"tipo": "jogar", "carta": 0}
+    {"tipo": "atacar", "atacante": 0, "alvo": 1}
+    {"tipo": "passar"}, {"tipo": "sair"}, {"tipo": "historico"}, {"tipo": "estatisticas"}
+
+Respostas do servidor: "partida", "sua_vez" (com o estado que o jogador pode ver),
+"invalida" (a ação não valeu e a vez continua), "historico", "estatisticas", "fim" e "erro".
+Toda resposta traz em "eventos" os textos do jogo emitidos desde a resposta anterior, se houver.
+
+    python -m jogo_estrutura.servidor --porta 8765
+    python -m jogo_estrutura.servidor --unix /tmp/cartas.sock --ia mcts --simulacoes 300
+"""
+import argparse
+import asyncio
+import contextlib
+import functools
+import itertools
+import json
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Optional, Sequence, Tuple
+from banco.cartas import Carta, CartaCriatura
+from jogador import Jogador
+from jogador.jogador_ia import JogadorIA
+from jogador.jogador_mcts import JogadorMCTS
+from jogo_estrutura import eventos
+from jogo_estrutura.jogo import Jogo
+from jogo_estrutura.perfil import Histograma
+from jogo_estrutura.replay import NADA, ControladorReplay, GravacaoPartida, decodificar_acoes
+from jogo_estrutura.simulacao import carregar_catalogo
+import jogo_estrutura.utils as utils
+
+LIMITE_LINHA = 64 * 1024  # bytes por mensagem
+
+def estrategia_da_ia(ia: str = "regras", simulacoes: int = 300) -> Callable:
+    """Estratégia da máquina pelo nome usado na linha de comando: "regras" ou "mcts"."""
+    if ia == "mcts":
+        return functools.partial(JogadorMCTS, simulacoes=simulacoes)
+    return JogadorIA
+
+def decidir_jogada(jogo: Jogo) -> Tuple[int, Optional[int], Optional[int], bool]:
+    """Decide a jogada de quem tem a vez em `jogo` e devolve a ação como (código, índice, alvo, com_jogador_alvo).
+
+    Roda no processo trabalhador, sobre uma cópia da partida, que é alterada e descartada.
+    """
+    atual = jogo.jogadores[jogo.turno % len(jogo.jogadores)]
+    alvo = jogo.jogadores[(jogo.turno + 1) % len(jogo.jogadores)]
+    jogo.gravacao = GravacaoPartida(jogador.nome for jogador in jogo.jogadores)
+    with utils.modo_headless():
+        atual.escolher_acao(alvo, jogo)
+    return next(decodificar_acoes(bytes(jogo.gravacao.acoes)), (NADA, None, None, False))
+
+def _carta(carta: Carta) -> dict:
+    dados = {"nome": carta.nome, "custo": carta.custo_mana}
+    if isinstance(carta, CartaCriatura):
+        dados["poder"] = carta.poder
+        dados["resistencia"] = carta.resistencia
+    elif carta.tipo_magia:
+        dados["tipo_magia"] = carta.tipo_magia
+    return dados
+
+def estado_visivel(jogo: Jogo, jogador: Jogador) -> dict:
+    """Estado da partida como `jogador` o vê: das outras mãos, só a quantidade de cartas."""
+    return {
+        "turno": jogo.turno + 1,
+        "jogadores": [{
+            "nome": outro.nome,
+            "saude": outro.saude,
+            "mana": outro.mana,
+            "baralho": len(outro.baralho),
+            "cemiterio": len(outro.cemiterio),
+            "campo": [_carta(carta) for carta in outro.campo_de_batalha],
+            "mao": [_carta(carta) for carta in outro.mao] if outro is jogador else len(outro.mao),
+        } for outro in jogo.jogadores],
+    }
+
+class Sessao:
+    """Uma conexão e os eventos do jogo emitidos para ela ainda não enviados."""
+    def __init__(self, numero: int, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        self.numero = numero
+        self.leitor = leitor
+        self.escritor = escritor
+        self.saida = eventos.SaidaColetora()
+        self.tarefa = asyncio.current_task()
+        self.aguardando_desde: Optional[float] = None  # quando chegou a jogada ainda sem resposta
+
+    async def receber(self, tempo_ocioso: Optional[float]) -> Optional[dict]:
+        """Próxima mensagem do cliente, ou None se a conexão acabou ou ficou ociosa demais."""
+        while True:
+            try:
+                linha = await asyncio.wait_for(self.leitor.readline(), tempo_ocioso)
+            except (asyncio.TimeoutError, ConnectionError, ValueError):
+                return None
+            if not linha:
+                return None
+            try:
+                mensagem = json.loads(linha)
+            except ValueError:
+                mensagem = None
+            if isinstance(mensagem, dict):
+                return mensagem
+            await self.enviar({"tipo": "erro", "mensagem": "mensagem não é um objeto JSON"})
+
+    async def enviar(self, mensagem: dict):
+        if self.saida.eventos:
+            mensagem["eventos"] = self.saida.mensagens()
+            self.saida.eventos.clear()
+        self.escritor.write(json.dumps(mensagem, ensure_ascii=False).encode() + b"\n")
+        await self.escritor.drain()
+
+class ServidorJogo:
+    """Hospeda partidas de um jogador humano contra a máquina, uma por conexão.
+
+    `estrategia` é o controlador da máquina (veja `Jogador`). Com `processos` > 0, as decisões
+    da máquina rodam nesse número de processos; a estratégia precisa poder ser enviada a eles
+    (classes ou `functools.partial`). Sessões sem mensagem por `tempo_ocioso` segundos são fechadas.
+    """
+    def __init__(self, cartas: Sequence[Carta], estrategia: Callable = JogadorIA, processos: int = 0,
+                 max_sessoes: int = 10000, max_turnos: int = 500, tempo_ocioso: Optional[float] = 300.0,
+                 tamanho_baralho: int = 30, cartas_iniciais: int = 3):
+        self.cartas = cartas
+        self.estrategia = estrategia
+        self.processos = processos
+        self.max_sessoes = max_sessoes
+        self.max_turnos = max_turnos
+        self.tempo_ocioso = tempo_ocioso
+        self.tamanho_baralho = tamanho_baralho
+        self.cartas_iniciais = cartas_iniciais
+        self.sessoes: Dict[int, Sessao] = {}
+        self.partidas_encerradas = 0
+        # "resposta": da jogada recebida até a resposta enviada; "maquina": cada turno da máquina.
+        self.latencias: Dict[str, Histograma] = defaultdict(Histograma)
+        self._numeros = itertools.count(1)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @contextlib.asynccontextmanager
+    async def ouvir(self, host: str = "127.0.0.1", porta: int = 8765, unix: Optional[str] = None):
+        """Aceita conexões enquanto o bloco estiver aberto e devolve o servidor asyncio.
+
+        Com `porta=0` o sistema escolhe uma porta livre, lida em `servidor.sockets[0].getsockname()`.
+        O bloco roda sem pausas nem limpeza de tela, como a simulação.
+        """
+        with utils.modo_headless():
+            self._pool = ProcessPoolExecutor(self.processos) if self.processos else None
+            if unix:
+                servidor = await asyncio.start_unix_server(self.atender, path=unix, limit=LIMITE_LINHA)
+            else:
+                servidor = await asyncio.start_server(self.atender, host, porta, limit=LIMITE_LINHA)
+            try:
+                yield servidor
+            finally:
+                servidor.close()
+                for sessao in list(self.sessoes.values()):
+                    sessao.escritor.close()
+                # Com as conexões fechadas, as sessões terminam ao ler o fim da conexão.
+                await asyncio.gather(*(sessao.tarefa for sessao in list(self.sessoes.values())), return_exceptions=True)
+                await servidor.wait_closed()
+                if self._pool is not None:
+                    self._pool.shutdown()
+                    self._pool = None
+
+    async def atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        """Conduz uma conexão: partidas em sequência até o cliente desconectar."""
+        sessao = Sessao(next(self._numeros), leitor, escritor)
+        if len(self.sessoes) >= self.max_sessoes:
+            with contextlib.suppress(ConnectionError):
+                await sessao.enviar({"tipo": "erro", "mensagem": "servidor cheio"})
+            escritor.close()
+            return
+        self.sessoes[sessao.numero] = sessao
+        try:
+            # Os eventos emitidos nesta tarefa vão só para esta sessão.
+            with eventos.usar_saida(sessao.saida):
+                while True:
+                    pedido = await sessao.receber(self.tempo_ocioso)
+                    if pedido is None:
+                        break
+                    tipo = pedido.get("tipo")
+                    if tipo == "nova_partida":
+                        if not await self._jogar(sessao, pedido):
+                            break
+                    elif tipo == "estatisticas":
+                        await sessao.enviar(self.estatisticas())
+                    else:
+                        await sessao.enviar({"tipo": "erro", "mensagem": "nenhuma partida em andamento"})
+        except ConnectionError:
+            pass
+        finally:
+            del self.sessoes[sessao.numero]
+            escritor.close()
+
+    def estatisticas(self) -> dict:
+        return {
+            "tipo": "estatisticas",
+            "sessoes": len(self.sessoes),
+            "partidas_encerradas": self.partidas_encerradas,
+            "latencia": {nome: histograma.para_dict() for nome, histograma in sorted(self.latencias.items())},
+        }
+
+    async def _jogar(self, sessao: Sessao, pedido: dict) -> bool:
+        """Joga uma partida inteira; devolve False se a conexão acabou no meio."""
+        semente = pedido.get("semente")
+        if semente is not None and not isinstance(semente, int):
+            await sessao.enviar({"tipo": "erro", "mensagem": "a semente precisa ser um número inteiro"})
+            return True
+        humano = Jogador(str(pedido.get("nome") or "Jogador"), eh_humano=True)
+        maquina = Jogador("Máquina", eh_humano=False, estrategia=self.estrategia)
+        jogo = Jogo([humano, maquina], tamanho_baralho=self.tamanho_baralho, cartas_iniciais=self.cartas_iniciais,
+                    semente=semente)
+        jogo.distribuir_baralhos(self.cartas)
+        jogo.iniciar()
+        await sessao.enviar({"tipo": "partida", "sessao": sessao.numero, "semente": jogo.semente,
+                             "jogadores": [humano.nome, maquina.nome]})
+
+        while jogo.turno < self.max_turnos:
+            jogador_atual, jogador_alvo = jogo.iniciar_turno()
+            if jogador_atual is humano:
+                if not await self._turno_humano(sessao, jogo, humano, jogador_alvo):
+                    return False
+            else:
+                await self._turno_maquina(jogo, jogador_atual, jogador_alvo)
+            if not jogo.finalizar_turno(jogador_alvo):
+                break
+
+        self.partidas_encerradas += 1
+        vencedor = jogo.jogadores[0].nome if len(jogo.jogadores) == 1 else None
+        await self._responder(sessao, {"tipo": "fim", "vencedor": vencedor, "turnos": jogo.turno, "semente": jogo.semente})
+        return True
+
+    async def _turno_humano(self, sessao: Sessao, jogo: Jogo, humano: Jogador, jogador_alvo: Jogador) -> bool:
+        """Espera jogadas até uma valer, como o menu do terminal; devolve False se a conexão acabou."""
+        await self._responder(sessao, {"tipo": "sua_vez", "estado": estado_visivel(jogo, humano)})
+        while True:
+            pedido = await sessao.receber(self.tempo_ocioso)
+            if pedido is None:
+                return False
+            tipo = pedido.get("tipo")
+            if tipo == "historico":
+                await sessao.enviar({"tipo": "historico", "registros": [
+                    registro if isinstance(registro, str) else registro.texto() for registro in jogo.historico.ultimos(10)]})
+                continue
+            if tipo == "estatisticas":
+                await sessao.enviar(self.estatisticas())
+                continue
+            sessao.aguardando_desde = time.perf_counter()
+            if self._aplicar(jogo, humano, jogador_alvo, pedido):
+                return True
+            await self._responder(sessao, {"tipo": "invalida"})
+
+    @staticmethod
+    def _aplicar(jogo: Jogo, humano: Jogador, jogador_alvo: Jogador, pedido: dict) -> bool:
+        """Aplica a jogada pedida; devolve False se ela não valeu e a vez continua."""
+        tipo = pedido.get("tipo")
+        if tipo == "jogar":
+            indice = pedido.get("carta")
+            return isinstance(indice, int) and humano.jogar_carta(indice, jogador_alvo=jogador_alvo, jogo=jogo)
+        if tipo == "atacar":
+            # Como no terminal: sem alvo informado, ataca a primeira criatura do adversário, se houver.
+            atacante = pedido.get("atacante")
+            indice_alvo = pedido.get("alvo", 0 if jogador_alvo.campo_de_batalha else None)
+            if not humano.campo_de_batalha or not isinstance(atacante, int) or not isinstance(indice_alvo, (int, type(None))):
+                return False
+            humano.atacar(jogador_alvo, atacante, indice_alvo, jogo=jogo)
+            return True
+        if tipo == "passar":
+            jogo.passar_a_vez(humano)
+            return True
+        if tipo == "sair":
+            jogo.encerrar_jogo = True
+            return True
+        return False
+
+    async def _turno_maquina(self, jogo: Jogo, maquina: Jogador, jogador_alvo: Jogador):
+        inicio = time.perf_counter()
+        if self._pool is None:
+            maquina.escolher_acao(jogador_alvo, jogo)
+        else:
+            acao = await asyncio.get_running_loop().run_in_executor(self._pool, decidir_jogada, jogo.clonar())
+            ControladorReplay(maquina, iter([acao])).escolher_acao(jogador_alvo, jogo)
+        self.latencias["maquina"].registrar(time.perf_counter() - inicio)
+
+    async def _responder(self, sessao: Sessao, mensagem: dict):
+        """Envia a resposta a uma jogada e mede quanto ela levou desde a chegada da jogada."""
+        if sessao.aguardando_desde is not None:
+            self.latencias["resposta"].registrar(time.perf_counter() - sessao.aguardando_desde)
+            sessao.aguardando_desde = None
+        await sessao.enviar(mensagem)
+
+def processos_padrao(ia: str) -> int:
+    """Com a IA de regras, decidir no laço custa menos que enviar a partida a outro processo."""
+    return 0 if ia == "regras" else (os.cpu_count() or 1)
+
+async def _servir(servidor: ServidorJogo, args):
+    async with servidor.ouvir(args.host, args.porta, args.unix) as ouvinte:
+        endereco = args.unix or "{}:{}".format(*ouvinte.sockets[0].getsockname()[:2])
+        print(f"Servidor ouvindo em {endereco}", flush=True)
+        await ouvinte.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765, help="porta TCP (0 escolhe uma porta livre)")
+    parser.add_argument("--unix", metavar="CAMINHO", help="ouve em um socket Unix em vez de TCP")
+    parser.add_argument("--banco", default="cartas_game.csv", help="CSV de cartas ou banco SQLite (.db) usado nos baralhos")
+    parser.add_argument("--ia", choices=("regras", "mcts"), default="regras", help="estratégia da máquina")
+    parser.add_argument("--simulacoes", type=int, default=300, help="simulações por jogada da IA mcts")
+    parser.add_argument("--processos", type=int, default=None,
+                        help="processos para as decisões da máquina (0 decide no laço; padrão: 0 com regras, um por núcleo com mcts)")
+    parser.add_argument("--max-sessoes", type=int, default=10000)
+    parser.add_argument("--max-turnos", type=int, default=500)
+    parser.add_argument("--tempo-ocioso", type=float, default=300.0, help="segundos sem mensagem até fechar a sessão")
+    args = parser.parse_args()
+
+    processos = processos_padrao(args.ia) if args.processos is None else args.processos
+    servidor = ServidorJogo(carregar_catalogo(args.banco), estrategia_da_ia(args.ia, args.simulacoes), processos,
+                            max_sessoes=args.max_sessoes, max_turnos=args.max_turnos, tempo_ocioso=args.tempo_ocioso)
+    try:
+        asyncio.run(_servir(servidor, args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import hashlib
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from banco.banco_de_dados import BancoSimulado
+from banco.cartas import Carta
+from jogador import Jogador
+from jogador.jogador_ia import JogadorIA
+from jogo_estrutura.historico import Historico
+from jogo_estrutura.jogo import Jogo
+import jogo_estrutura.utils as utils
+
+class ResultadoPartida(NamedTuple):
+    """Resumo de uma partida simulada."""
+    vencedor: Optional[str]
+    turnos: int
+    saude_final: Dict[str, int]
+    semente: Optional[int] = None  # repete a partida com `simular_partida(..., semente=semente)`
+
+EXTENSOES_SQLITE = ('.db', '.sqlite', '.sqlite3')
+
+def carregar_catalogo(arquivo_csv: str = 'cartas_game.csv') -> Sequence[Carta]:
+    """Carrega as cartas disponíveis para montar os baralhos.
+
+    Arquivos SQLite (.db, .sqlite, .sqlite3) são abertos com `BancoSQLite`, que lê as cartas sob demanda.
+    """
+    if arquivo_csv.endswith(EXTENSOES_SQLITE):
+        from banco.banco_sqlite import BancoSQLite
+        return BancoSQLite(arquivo_csv).obter_cartas()
+    return BancoSimulado(arquivo_csv).obter_cartas()
+
+def semente_da_partida(semente_raiz: int, indice: int) -> int:
+    """Deriva a semente da partida `indice` de um lote a partir da semente do lote.
+
+    O hash torna as sementes de partidas vizinhas independentes entre si, então cada partida
+    pode ser repetida isoladamente, em qualquer processo, sem depender das demais.
+    """
+    dados = f"{semente_raiz}:{indice}".encode()
+    return int.from_bytes(hashlib.blake2b(dados, digest_size=8).digest(), "little")
+
+ESTRATEGIAS_PADRAO: Tuple[Callable, Callable] = (JogadorIA, JogadorIA)
+
+def simular_partida(cartas: List[Carta], tamanho_baralho: int = 30, max_turnos: int = 500,
+                    cartas_iniciais: int = 3, estrategias: Tuple[Callable, Callable] = ESTRATEGIAS_PADRAO,
+                    semente: Optional[int] = None, gravador=None, perfil=None) -> ResultadoPartida:
+    """Joga uma partida completa Máquina contra Máquina, sem nenhuma saída no terminal.
+
+    `estrategias` define o controlador de cada máquina (veja `Jogador`) e `semente` torna a
+    partida reprodutível. Com `gravador` (um `GravadorReplay`), a partida é gravada, e com
+    `perfil` (um `Perfil`), as fases dos turnos são medidas nele.
+    Se a partida atingir `max_turnos` sem vencedor, ela é considerada empate.
+    """
+    jogador1 = Jogador("Máquina 1", eh_humano=False, estrategia=estrategias[0])
+    jogador2 = Jogador("Máquina 2", eh_humano=False, estrategia=estrategias[1])
+
+    with utils.modo_headless():
+        jogo = Jogo([jogador1, jogador2], tamanho_baralho=tamanho_baralho, cartas_iniciais=cartas_iniciais,
+                    politica_historico=Historico.DESLIGADO, semente=semente, perfil=perfil)
+        jogo.distribuir_baralhos(cartas)
+        if gravador is not None:
+            gravador.iniciar(jogo)
+        jogo.iniciar()
+        while jogo.turno < max_turnos and jogo.jogar_turno():
+            pass
+        if gravador is not None:
+            gravador.finalizar(jogo)
+
+    vencedor = jogo.jogadores[0].nome if len(jogo.jogadores) == 1 else None
+    return ResultadoPartida(
+        vencedor=vencedor,
+        turnos=jogo.turno,
+        saude_final={jogador1.nome: jogador1.saude, jogador2.nome: jogador2.saude},
+        semente=jogo.semente,
+    )
+
+def simular_partidas(quantidade: int, cartas: Optional[List[Carta]] = None, tamanho_baralho: int = 30,
+                     max_turnos: int = 500, cartas_iniciais: int = 3,
+                     estrategias: Tuple[Callable, Callable] = ESTRATEGIAS_PADRAO,
+                     semente: Optional[int] = None, inicio: int = 0, gravador=None,
+                     perfil=None) -> Iterator[ResultadoPartida]:
+    """Simula `quantidade` partidas em sequência, devolvendo os resultados conforme terminam.
+
+    Com `semente`, a partida de número `inicio + i` usa `semente_da_partida(semente, inicio + i)`.
+    """
+    if cartas is None:
+        cartas = carregar_catalogo()
+    for indice in range(inicio, inicio + quantidade):
+        semente_partida = semente_da_partida(semente, indice) if semente is not None else None
+        yield simular_partida(cartas, tamanho_baralho, max_turnos, cartas_iniciais, estrategias, semente_partida, gravador, perfil)
@@ -0,0 +1,49 @@
+import multiprocessing
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+from banco.cartas import Carta
+from jogo_estrutura.perfil import Perfil
+from jogo_estrutura.simulacao import ESTRATEGIAS_PADRAO, ResultadoPartida, carregar_catalogo, simular_partidas
+
+# Catálogo do processo trabalhador, carregado uma única vez pelo inicializador do pool.
+_cartas: Optional[Sequence[Carta]] = None
+
+def _iniciar_trabalhador(arquivo_csv: str):
+    global _cartas
+    _cartas = carregar_catalogo(arquivo_csv)
+
+def _simular_lote(tarefa: Tuple[int, int, int, int, int, Tuple[Callable, Callable], Optional[int], bool]
+                  ) -> Tuple[List[ResultadoPartida], Optional[Perfil]]:
+    # Cada partida tem o próprio gerador, então os processos não compartilham o gerador global.
+    inicio, quantidade, tamanho_baralho, max_turnos, cartas_iniciais, estrategias, semente, medir = tarefa
+    perfil = Perfil() if medir else None
+    resultados = list(simular_partidas(quantidade, _cartas, tamanho_baralho, max_turnos, cartas_iniciais, estrategias,
+                                       semente, inicio, perfil=perfil))
+    return resultados, perfil
+
+def dividir_em_lotes(quantidade: int, tamanho_lote: int) -> List[int]:
+    """Divide `quantidade` partidas em lotes de no máximo `tamanho_lote`."""
+    completos, resto = divmod(quantidade, tamanho_lote)
+    return [tamanho_lote] * completos + ([resto] if resto else [])
+
+def simular_em_paralelo(quantidade: int, processos: Optional[int] = None, tamanho_lote: int = 250,
+                        arquivo_csv: str = 'cartas_game.csv', tamanho_baralho: int = 30,
+                        max_turnos: int = 500, cartas_iniciais: int = 3,
+                        estrategias: Tuple[Callable, Callable] = ESTRATEGIAS_PADRAO,
+                        semente: Optional[int] = None, perfil: Optional[Perfil] = None) -> Iterator[List[ResultadoPartida]]:
+    """Distribui partidas independentes entre processos e devolve os resultados lote a lote.
+
+    Cada lote é entregue assim que termina, em qualquer ordem, para que quem consome
+    possa agregar os resultados sem manter todas as partidas em memória.
+    Com `processos=None` é usado um processo por núcleo. As `estrategias` precisam poder ser
+    enviadas aos processos (classes ou `functools.partial`, não funções lambda).
+    Com `semente`, cada partida recebe a semente derivada da sua posição no lote inteiro,
+    então os resultados não dependem da quantidade de processos nem do tamanho dos lotes.
+    Com `perfil`, cada lote é medido no processo que o jogou e somado a `perfil` quando chega.
+    """
+    tarefas = ((inicio, lote, tamanho_baralho, max_turnos, cartas_iniciais, estrategias, semente, perfil is not None)
+               for inicio, lote in zip(range(0, quantidade, tamanho_lote), dividir_em_lotes(quantidade, tamanho_lote)))
+    with multiprocessing.Pool(processos, initializer=_iniciar_trabalhador, initargs=(arquivo_csv,)) as pool:
+        for resultados, perfil_lote in pool.imap_unordered(_simular_lote, tarefas):
+            if perfil is not None:
+                perfil.combinar(perfil_lote)
+            yield resultados
@@ -0,0 +1,238 @@
+"""Simulador de partidas em lote com NumPy.
+
+Cada partida do lote é uma linha de um conjunto de matrizes (saúde, mana, baralhos, campo de
+batalha), e um turno de todas as partidas é avançado com operações vetorizadas. As regras e
+as decisões são as mesmas de `Jogo.jogar_turno` com dois `JogadorIA`:
+
+- cura (com saúde abaixo de 10), depois feitiços de dano (se o adversário tem criaturas),
+  depois invocar uma criatura e por fim atacar com a criatura de maior poder, sempre
+  escolhendo a primeira carta da mão, na ordem de compra, que atende ao critério;
+- o ataque segue `JogadorCombate.atacar` e `CartaCriatura.sofrer_dano`: o alvo é a criatura
+  adversária de menor resistência, o atacante não sofre dano de volta e, sem criaturas no
+  campo adversário, o dano vai direto ao jogador;
+- os feitiços seguem `CartaFeitico.lancar` ("dano_direto", "cura", "buff_coletivo" e
+  "dano_coletivo"; os demais tipos gastam a carta e a mana sem efeito).
+
+A `JogadorIA` nunca joga terrenos, cartas aleatórias nem feitiços de reviver, então eles só
+ocupam espaço na mão, como no jogo normal. Não há histórico nem eventos.
+"""
+from typing import NamedTuple, Optional, Sequence
+import numpy as np
+from banco.cartas import Carta, CartaCriatura, CartaFeitico
+from jogador.mao import CRIATURA, CURA, DANO, MAGIAS_DE_DANO_IA, OUTRA
+from jogo_estrutura.simulacao import carregar_catalogo
+
+class ResultadoLote(NamedTuple):
+    """Resultados de um lote de partidas, um elemento por partida."""
+    vencedor: np.ndarray     # 0 ou 1 (índice do jogador) ou -1 para empate
+    turnos: np.ndarray
+    saude_final: np.ndarray  # matriz (partidas, 2)
+
+class CatalogoVetorizado:
+    """Atributos das cartas do catálogo em vetores indexados pela posição da carta."""
+    def __init__(self, cartas: Sequence[Carta]):
+        modelos = [carta.modelo for carta in cartas]
+        self.tamanho = len(modelos)
+        self.custo = np.array([m.custo_mana for m in modelos], dtype=np.int32)
+        self.poder = np.array([m.poder for m in modelos], dtype=np.int32)
+        self.resistencia = np.array([m.resistencia for m in modelos], dtype=np.int32)
+        feitico = np.array([isinstance(c, CartaFeitico) for c in cartas])
+        magia = np.array([m.tipo_magia or "" for m in modelos])
+        self.criatura = np.array([isinstance(c, CartaCriatura) for c in cartas])
+        self.cura = feitico & (magia == "cura")
+        self.dano_ia = feitico & np.isin(magia, MAGIAS_DE_DANO_IA)
+        self.dano_direto = feitico & (magia == "dano_direto")
+        self.buff_coletivo = feitico & (magia == "buff_coletivo")
+        self.dano_coletivo = feitico & (magia == "dano_coletivo")
+        # Categoria usada pelas decisões da `JogadorIA`; as cartas de outras categorias nunca são escolhidas.
+        self.categoria = np.select([self.cura, self.dano_ia, self.criatura], [CURA, DANO, CRIATURA], OUTRA).astype(np.int8)
+
+class SimuladorVetorizado:
+    """Mantém o estado de `partidas` partidas simultâneas em arrays e as avança turno a turno.
+
+    A mão de cada jogador não é guardada à parte: as cartas compradas são as primeiras `topo`
+    posições do baralho, e `usada` marca as que já saíram da mão. Assim a ordem da mão é a
+    ordem de compra, como na lista `Jogador.mao`. O campo de batalha guarda as criaturas na
+    ordem em que foram invocadas, com `viva` indicando as que continuam em jogo.
+    """
+    def __init__(self, cartas: Sequence[Carta], partidas: int, tamanho_baralho: int = 30,
+                 cartas_iniciais: int = 3, rng: Optional[np.random.Generator] = None):
+        self.catalogo = CatalogoVetorizado(cartas)
+        self.partidas = partidas
+        self.tamanho_baralho = tamanho_baralho
+        rng = rng if rng is not None else np.random.default_rng()
+
+        # `random.choices` seguido de embaralhar equivale a sortear cada posição de forma independente.
+        self.baralho = rng.integers(0, self.catalogo.tamanho, size=(partidas, 2, tamanho_baralho), dtype=np.int32)
+        # Custo e categoria de cada posição dos baralhos, consultados a cada turno.
+        self.custo = self.catalogo.custo[self.baralho].astype(np.int16)
+        self.categoria = self.catalogo.categoria[self.baralho]
+        self.topo = np.full((partidas, 2), min(cartas_iniciais, tamanho_baralho), dtype=np.int32)
+        self.usada = np.zeros((partidas, 2, tamanho_baralho), dtype=bool)
+        self.saude = np.full((partidas, 2), 20, dtype=np.int32)
+        self.mana = np.zeros((partidas, 2), dtype=np.int32)
+        # Cada carta de criatura entra no campo no máximo uma vez, então o campo cabe em `tamanho_baralho` posições.
+        self.poder = np.zeros((partidas, 2, tamanho_baralho), dtype=np.int32)
+        self.resistencia = np.zeros((partidas, 2, tamanho_baralho), dtype=np.int32)
+        self.viva = np.zeros((partidas, 2, tamanho_baralho), dtype=bool)
+        self.invocadas = np.zeros((partidas, 2), dtype=np.int32)
+
+        self.turno = 0
+        self.ativa = np.ones(partidas, dtype=bool)
+        # Linhas das partidas ainda guardadas nos arrays de estado, que são compactados conforme as partidas terminam.
+        self.ids = np.arange(partidas)
+        self.vencedor = np.full(partidas, -1, dtype=np.int8)
+        self.turnos = np.zeros(partidas, dtype=np.int32)
+        self.saude_final = np.zeros((partidas, 2), dtype=np.int32)
+        self._posicoes = np.arange(tamanho_baralho)
+        self._vagas = 1
+
+    def jogar(self, max_turnos: int = 500) -> ResultadoLote:
+        """Avança todas as partidas até terminarem ou atingirem `max_turnos` (empate)."""
+        while self.turno < max_turnos and len(self.ids):
+            self.jogar_turno()
+            if self.ativa.sum() * 2 < len(self.ativa):
+                self._compactar()
+        restantes = self.ids[self.ativa]
+        self.turnos[restantes] = self.turno
+        self.saude_final[restantes] = self.saude[self.ativa]
+        return ResultadoLote(self.vencedor.copy(), self.turnos.copy(), self.saude_final.copy())
+
+    def _compactar(self):
+        """Descarta as linhas das partidas já terminadas, para que os próximos turnos custem menos."""
+        ativa = self.ativa
+        for nome in ("baralho", "custo", "categoria", "topo", "usada", "saude", "mana", "poder", "resistencia", "viva", "invocadas", "ids"):
+            setattr(self, nome, getattr(self, nome)[ativa])
+        self.ativa = np.ones(len(self.ids), dtype=bool)
+
+    def jogar_turno(self):
+        """Joga um turno em todas as partidas ainda ativas."""
+        p = self.turno % 2
+        o = 1 - p
+        ativa = self.ativa
+
+        # Início do turno: mana e compra
+        self.mana[ativa, p] += 1
+        compra = ativa & (self.topo[:, p] < self.tamanho_baralho)
+        self.topo[compra, p] += 1
+
+        # Só as posições já compradas em alguma partida e as vagas de campo já usadas precisam ser examinadas.
+        limite = int(self.topo[:, p].max(initial=0))
+        self._vagas = max(int(self.invocadas.max(initial=0)), 1)
+        categoria = self.categoria[:, p, :limite]
+        na_mao = (self._posicoes[:limite] < self.topo[:, p, None]) & ~self.usada[:, p, :limite]
+        acessivel = na_mao & (self.custo[:, p, :limite] <= self.mana[:, p, None])
+        campo_adversario = self.viva[:, o, :self._vagas].any(axis=1)
+        pendente = ativa.copy()
+
+        # Se a saúde estiver baixa, tenta se curar
+        opcoes = acessivel & (categoria == CURA)
+        escolha = pendente & (self.saude[:, p] < 10) & opcoes.any(axis=1)
+        self._lancar(np.flatnonzero(escolha), opcoes.argmax(axis=1), p, o)
+        pendente &= ~escolha
+
+        # Se o oponente tiver criaturas, tenta usar cartas de dano
+        opcoes = acessivel & (categoria == DANO)
+        escolha = pendente & campo_adversario & opcoes.any(axis=1)
+        self._lancar(np.flatnonzero(escolha), opcoes.argmax(axis=1), p, o)
+        pendente &= ~escolha
+
+        # Tenta invocar uma criatura
+        opcoes = acessivel & (categoria == CRIATURA)
+        escolha = pendente & opcoes.any(axis=1)
+        self._invocar(np.flatnonzero(escolha), opcoes.argmax(axis=1), p)
+        pendente &= ~escolha
+
+        # Ataca com a criatura de maior poder
+        escolha = pendente & self.viva[:, p, :self._vagas].any(axis=1)
+        self._atacar(np.flatnonzero(escolha), p, o)
+
+        # Fim do turno: o adversário pode ter sido derrotado
+        derrotado = ativa & (self.saude[:, o] <= 0)
+        terminadas = self.ids[derrotado]
+        self.vencedor[terminadas] = p
+        self.turnos[terminadas] = self.turno + 1
+        self.saude_final[terminadas] = self.saude[derrotado]
+        self.ativa &= ~derrotado
+        self.turno += 1
+
+    def _usar(self, jogos: np.ndarray, posicoes: np.ndarray, p: int) -> np.ndarray:
+        """Tira as cartas da mão, paga o custo e devolve os índices das cartas no catálogo."""
+        cartas = self.baralho[jogos, p, posicoes]
+        self.usada[jogos, p, posicoes] = True
+        self.mana[jogos, p] -= self.catalogo.custo[cartas]
+        return cartas
+
+    def _lancar(self, jogos: np.ndarray, posicoes: np.ndarray, p: int, o: int):
+        if not len(jogos):
+            return
+        cat = self.catalogo
+        cartas = self._usar(jogos, posicoes[jogos], p)
+        poder = cat.poder[cartas]
+
+        cura = cat.cura[cartas]
+        self.saude[jogos[cura], p] += poder[cura]
+
+        # Sem alvo, o dano direto vai para o jogador adversário.
+        dano = cat.dano_direto[cartas]
+        self.saude[jogos[dano], o] -= poder[dano]
+
+        buff = cat.buff_coletivo[cartas]
+        if buff.any():
+            alvo = jogos[buff]
+            self.resistencia[alvo, p] += np.where(self.viva[alvo, p], poder[buff, None], 0)
+
+        coletivo = cat.dano_coletivo[cartas]
+        if coletivo.any():
+            alvo = jogos[coletivo]
+            viva = self.viva[alvo, o]
+            resistencia = self.resistencia[alvo, o] - np.where(viva, poder[coletivo, None], 0)
+            self.resistencia[alvo, o] = resistencia
+            self.viva[alvo, o] = viva & (resistencia > 0)
+
+    def _invocar(self, jogos: np.ndarray, posicoes: np.ndarray, p: int):
+        if not len(jogos):
+            return
+        cartas = self._usar(jogos, posicoes[jogos], p)
+        vaga = self.invocadas[jogos, p]
+        self.poder[jogos, p, vaga] = self.catalogo.poder[cartas]
+        self.resistencia[jogos, p, vaga] = self.catalogo.resistencia[cartas]
+        self.viva[jogos, p, vaga] = True
+        self.invocadas[jogos, p] += 1
+
+    def _atacar(self, jogos: np.ndarray, p: int, o: int):
+        if not len(jogos):
+            return
+        # argmax/argmin devolvem a primeira ocorrência, como max/min sobre a lista do campo.
+        vagas = self._vagas
+        atacante = np.where(self.viva[jogos, p, :vagas], self.poder[jogos, p, :vagas], np.iinfo(np.int32).min).argmax(axis=1)
+        poder = self.poder[jogos, p, atacante]
+
+        viva_adversario = self.viva[jogos, o, :vagas]
+        direto = ~viva_adversario.any(axis=1)
+        self.saude[jogos[direto], o] -= poder[direto]
+
+        combate = ~direto
+        alvo_jogos = jogos[combate]
+        alvo = np.where(viva_adversario[combate], self.resistencia[alvo_jogos, o, :vagas], np.iinfo(np.int32).max).argmin(axis=1)
+        resistencia = self.resistencia[alvo_jogos, o, alvo] - poder[combate]
+        self.resistencia[alvo_jogos, o, alvo] = resistencia
+        self.viva[alvo_jogos, o, alvo] = resistencia > 0
+
+def simular_lote(quantidade: int, cartas: Optional[Sequence[Carta]] = None, tamanho_baralho: int = 30,
+                 max_turnos: int = 500, cartas_iniciais: int = 3, semente: Optional[int] = None,
+                 tamanho_bloco: int = 16384) -> ResultadoLote:
+    """Simula `quantidade` partidas Máquina contra Máquina com o simulador vetorizado.
+
+    As partidas são jogadas em blocos de `tamanho_bloco`, o que limita a memória usada e faz
+    com que uma partida longa só atrase as outras do mesmo bloco.
+    """
+    if cartas is None:
+        cartas = carregar_catalogo()
+    cartas = list(cartas)
+    rng = np.random.default_rng(semente)
+    blocos = [SimuladorVetorizado(cartas, min(tamanho_bloco, quantidade - inicio), tamanho_baralho, cartas_iniciais, rng)
+              .jogar(max_turnos) for inicio in range(0, quantidade, tamanho_bloco)]
+    if not blocos:
+        return ResultadoLote(np.empty(0, dtype=np.int8), np.empty(0, dtype=np.int32), np.empty((0, 2), dtype=np.int32))
+    return ResultadoLote(*(np.concatenate(partes) for partes in zip(*blocos)))
@@ -0,0 +1,148 @@
+"""Desenho do tabuleiro no terminal por diferença, com sequências ANSI.
+
+A `Tela` guarda as linhas do último quadro desenhado. O tabuleiro ocupa as primeiras linhas do
+terminal e o resto vira uma região de rolagem para as mensagens e os menus; a cada novo quadro
+só as linhas que mudaram são reescritas, em uma única escrita, sem limpar a tela nem chamar
+subprocessos. A área do tabuleiro reserva algumas linhas de folga e quadros menores são
+completados com linhas vazias; o quadro inteiro só é redesenhado na primeira vez, quando o
+tabuleiro passa da área reservada ou quando o terminal é redimensionado.
+
+No Windows o processamento de ANSI do console é ligado antes do primeiro quadro; se o console
+não o aceitar, o tabuleiro volta a ser impresso linha a linha e a tela é limpa com `cls`.
+
+As pausas de animação (`Ritmo`) não bloqueiam quem as pede: `adiar` só marca um prazo, e a
+espera acontece antes da próxima escrita no terminal. A IA decide durante a pausa e a leitura
+da entrada nunca espera.
+"""
+import atexit
+import os
+import shutil
+import sys
+import time
+from typing import Callable, List, Optional, TextIO
+
+CSI = "\x1b["
+FOLGA = 4
+
+class Ritmo:
+    """Prazo até o qual a próxima escrita no terminal deve esperar."""
+    __slots__ = ("prazo",)
+
+    def __init__(self):
+        self.prazo = 0.0
+
+    def adiar(self, segundos: float):
+        """Acrescenta uma pausa de `segundos` antes da próxima escrita, sem esperar agora."""
+        self.prazo = max(self.prazo, time.monotonic()) + segundos
+
+    def pendente(self) -> float:
+        """Segundos que ainda faltam para o prazo."""
+        return max(0.0, self.prazo - time.monotonic())
+
+    def aguardar(self):
+        """Espera o que falta do prazo; é chamado logo antes de escrever no terminal."""
+        restante = self.prazo - time.monotonic()
+        if restante > 0:
+            time.sleep(restante)
+
+ritmo = Ritmo()
+
+class Tela:
+    """Modelo da tela: o tabuleiro no topo e as mensagens rolando abaixo dele."""
+
+    def __init__(self, saida: TextIO, tamanho: Callable[[], os.terminal_size] = shutil.get_terminal_size):
+        self.saida = saida
+        self.tamanho = tamanho
+        self.linhas: List[str] = []
+        self._tamanho_desenhado: Optional[os.terminal_size] = None
+
+    def desenhar(self, linhas: List[str]):
+        """Mostra o quadro `linhas`, reescrevendo só as linhas que mudaram desde o anterior."""
+        ritmo.aguardar()
+        tamanho = self.tamanho()
+        if self._tamanho_desenhado != tamanho or len(linhas) > len(self.linhas) or len(self.linhas) + 2 > tamanho.lines:
+            # Reserva a folga só se ainda sobrarem duas linhas para as mensagens.
+            altura = max(len(linhas), min(len(linhas) + FOLGA, tamanho.lines - 2))
+            linhas = list(linhas) + [""] * (altura - len(linhas))
+            texto = self._quadro_inteiro(linhas, tamanho)
+        else:
+            linhas = list(linhas) + [""] * (len(self.linhas) - len(linhas))
+            texto = self._diferenca(linhas)
+        self.linhas = linhas
+        self._tamanho_desenhado = tamanho
+        if texto:
+            self.saida.write(texto)
+            self.saida.flush()
+
+    def _quadro_inteiro(self, linhas: List[str], tamanho: os.terminal_size) -> str:
+        # Sem quebra automática o tabuleiro nunca passa da sua altura, mesmo com linhas largas.
+        partes = [f"{CSI}r{CSI}2J{CSI}H{CSI}?7l"]
+        partes.extend(f"{CSI}{numero};1H{linha}{CSI}0m{CSI}K" for numero, linha in enumerate(linhas, 1))
+        partes.append(f"{CSI}?7h")
+        if len(linhas) + 2 <= tamanho.lines:
+            # A região de rolagem também leva o cursor ao topo, então ele é posicionado depois.
+            partes.append(f"{CSI}{len(linhas) + 1};{tamanho.lines}r")
+        partes.append(f"{CSI}{len(linhas) + 1};1H")
+        return "".join(partes)
+
+    def _diferenca(self, linhas: List[str]) -> str:
+        partes = [f"{CSI}{numero};1H{linha}{CSI}0m{CSI}K"
+                  for numero, (linha, anterior) in enumerate(zip(linhas, self.linhas), 1) if linha != anterior]
+        if not partes:
+            return ""
+        # Salva e restaura o cursor para que as mensagens continuem de onde estavam.
+        return f"\x1b7{CSI}?7l{''.join(partes)}{CSI}?7h\x1b8"
+
+    def limpar_mensagens(self):
+        """Apaga a área de mensagens abaixo do tabuleiro (a tela toda, se ainda não há quadro)."""
+        ritmo.aguardar()
+        if self._tamanho_desenhado is None:
+            self.saida.write(f"{CSI}2J{CSI}H")
+        else:
+            self.saida.write(f"{CSI}{len(self.linhas) + 1};1H{CSI}J")
+        self.saida.flush()
+
+    def restaurar(self):
+        """Devolve a rolagem do terminal inteiro e leva o cursor para a última linha."""
+        if self._tamanho_desenhado is not None:
+            self.saida.write(f"{CSI}r{CSI}{self._tamanho_desenhado.lines};1H\n")
+            self.saida.flush()
+            self._tamanho_desenhado = None
+
+_terminal: Optional[Tela] = None
+_vt: Optional[bool] = None
+
+def _ativar_vt() -> bool:
+    """Liga o processamento de sequências ANSI no console do Windows; nos outros sistemas ele já existe."""
+    if sys.platform != "win32":
+        return True
+    try:
+        import ctypes
+        from ctypes import wintypes
+        kernel32 = ctypes.windll.kernel32
+        saida = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        modo = wintypes.DWORD()
+        if not kernel32.GetConsoleMode(saida, ctypes.byref(modo)):
+            return False
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING; consoles anteriores ao Windows 10 recusam o modo.
+        return bool(modo.value & 0x0004 or kernel32.SetConsoleMode(saida, modo.value | 0x0004))
+    except (AttributeError, OSError):
+        return False
+
+def console_sem_ansi() -> bool:
+    """Indica se a saída é um console em que não foi possível ligar as sequências ANSI."""
+    return _vt is False
+
+def terminal() -> Optional[Tela]:
+    """Tela da saída padrão, ou None quando ela não é um terminal que aceita ANSI (ou durante os testes)."""
+    global _terminal, _vt
+    if _terminal is None:
+        if os.getenv("RUNNING_TESTS") == "1" or not sys.stdout.isatty():
+            return None
+        if _vt is None:
+            _vt = _ativar_vt()
+        if not _vt:
+            return None
+        _terminal = Tela(sys.stdout)
+        atexit.register(_terminal.restaurar)
+    return _terminal
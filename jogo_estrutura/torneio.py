@@ -0,0 +1,386 @@
+"""Torneio todos contra todos entre baralhos e estratégias da máquina.
+
+Cada participante é um baralho (lista de nomes de cartas do catálogo) jogado por uma
+estratégia. Todo par de participantes joga em lotes de partidas; dentro do lote, quem começa
+alterna a cada partida, já que o primeiro da lista de `Jogo.jogadores` joga o turno 0. Os
+lotes rodam em um pool de processos e, conforme chegam, atualizam as tabelas: vitórias,
+empates, derrotas, taxa de pontos com intervalo de Wilson e Elo. Um confronto para de receber
+lotes assim que o intervalo da taxa de pontos deixa de conter 50% (depois de um mínimo de
+partidas), ou ao chegar ao máximo de partidas.
+
+Os resultados não dependem da quantidade de processos: cada partida tem a semente derivada
+do confronto e da sua posição, os lotes de um confronto são contados na ordem em que foram
+enviados e lotes que chegam depois de o confronto estar decidido são descartados.
+
+    python -m jogo_estrutura.torneio --baralhos 4 --estrategias regras -p 0
+    python -m jogo_estrutura.torneio --arquivo-baralhos baralhos.json --estrategias regras mcts:50 --saida torneio.json
+"""
+import argparse
+import functools
+import itertools
+import json
+import math
+import os
+import random
+import statistics
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from banco.cartas import Carta
+from jogador import Jogador
+from jogador.jogador_ia import JogadorIA
+from jogador.jogador_mcts import JogadorMCTS
+from jogo_estrutura.historico import Historico
+from jogo_estrutura.jogo import Jogo
+from jogo_estrutura.simulacao import carregar_catalogo, semente_da_partida
+import jogo_estrutura.utils as utils
+
+class Participante(NamedTuple):
+    """Um baralho e a estratégia da máquina que o joga; o nome precisa ser único no torneio."""
+    nome: str
+    baralho: Tuple[str, ...]  # nomes das cartas do catálogo, com repetição
+    estrategia: Callable = JogadorIA
+
+class ResultadoLote(NamedTuple):
+    """Placar de um lote do ponto de vista do primeiro participante do confronto."""
+    vitorias: int
+    empates: int
+    derrotas: int
+    vitorias_de_quem_comeca: int
+
+def sortear_baralho(cartas: Sequence[Carta], tamanho: int = 30, rng: random.Random = random) -> Tuple[str, ...]:
+    """Lista de baralho com `tamanho` cartas sorteadas do catálogo, como em `Jogo.distribuir_baralhos`."""
+    return tuple(carta.nome for carta in rng.choices(cartas, k=tamanho))
+
+def intervalo_wilson(pontos: float, partidas: int, z: float) -> Tuple[float, float]:
+    """Intervalo de Wilson da taxa `pontos / partidas` (empates valem meio ponto)."""
+    if partidas == 0:
+        return 0.0, 1.0
+    taxa = pontos / partidas
+    denominador = 1 + z * z / partidas
+    centro = (taxa + z * z / (2 * partidas)) / denominador
+    margem = z * math.sqrt(taxa * (1 - taxa) / partidas + z * z / (4 * partidas * partidas)) / denominador
+    return max(0.0, centro - margem), min(1.0, centro + margem)
+
+# Catálogo do processo trabalhador por nome, carregado uma única vez pelo inicializador do pool.
+_cartas_por_nome: Optional[Dict[str, Carta]] = None
+
+def iniciar_trabalhador(arquivo_csv: str):
+    """Inicializador do pool: carrega o catálogo usado por `jogar_lote` no processo trabalhador."""
+    global _cartas_por_nome
+    _cartas_por_nome = {carta.nome: carta for carta in carregar_catalogo(arquivo_csv)}
+
+def jogar_partida(primeiro: Participante, segundo: Participante, cartas_por_nome: Dict[str, Carta],
+                  semente: int, max_turnos: int = 500, cartas_iniciais: int = 3) -> Optional[str]:
+    """Joga uma partida sem saída no terminal, com `primeiro` jogando o turno 0; devolve o nome do vencedor ou None."""
+    jogadores = [Jogador(participante.nome, eh_humano=False, estrategia=participante.estrategia)
+                 for participante in (primeiro, segundo)]
+    with utils.modo_headless():
+        jogo = Jogo(jogadores, cartas_iniciais=cartas_iniciais, politica_historico=Historico.DESLIGADO, semente=semente)
+        for jogador, participante in zip(jogadores, (primeiro, segundo)):
+            jogador.baralho = [cartas_por_nome[nome].nova_copia() for nome in participante.baralho]
+        jogo.iniciar()
+        while jogo.turno < max_turnos and jogo.jogar_turno():
+            pass
+    return jogo.jogadores[0].nome if len(jogo.jogadores) == 1 else None
+
+def jogar_lote(tarefa: Tuple[Participante, Participante, int, int, int, int, int],
+               cartas_por_nome: Optional[Dict[str, Carta]] = None) -> ResultadoLote:
+    """Joga as partidas `inicio` a `inicio + quantidade - 1` de `a` contra `b`, alternando quem começa.
+
+    A tarefa é (a, b, semente, inicio, quantidade, max_turnos, cartas_iniciais) e a partida `i`
+    usa `semente_da_partida(semente, i)`. Sem `cartas_por_nome`, usa o catálogo carregado por
+    `iniciar_trabalhador`.
+    """
+    a, b, semente, inicio, quantidade, max_turnos, cartas_iniciais = tarefa
+    cartas_por_nome = cartas_por_nome if cartas_por_nome is not None else _cartas_por_nome
+    vitorias = empates = derrotas = de_quem_comeca = 0
+    for indice in range(inicio, inicio + quantidade):
+        primeiro, segundo = (a, b) if indice % 2 == 0 else (b, a)
+        vencedor = jogar_partida(primeiro, segundo, cartas_por_nome, semente_da_partida(semente, indice),
+                                 max_turnos, cartas_iniciais)
+        if vencedor is None:
+            empates += 1
+            continue
+        vitorias += vencedor == a.nome
+        derrotas += vencedor == b.nome
+        de_quem_comeca += vencedor == primeiro.nome
+    return ResultadoLote(vitorias, empates, derrotas, de_quem_comeca)
+
+class Confronto:
+    """Placar de um par de participantes, do ponto de vista de `a`."""
+    def __init__(self, a: Participante, b: Participante, semente: int):
+        self.a = a
+        self.b = b
+        self.semente = semente
+        self.vitorias = self.empates = self.derrotas = self.vitorias_de_quem_comeca = 0
+        self.lotes_enviados = 0
+        self.lotes_contados = 0
+        self.decidido = False
+        self._chegados: Dict[int, ResultadoLote] = {}  # lotes que chegaram antes dos anteriores
+
+    @property
+    def partidas(self) -> int:
+        return self.vitorias + self.empates + self.derrotas
+
+    @property
+    def pontos(self) -> float:
+        return self.vitorias + self.empates / 2
+
+    def vencedor(self, z: float) -> Optional[str]:
+        """Nome de quem está à frente com o intervalo de confiança fora de 50%, ou None."""
+        inferior, superior = intervalo_wilson(self.pontos, self.partidas, z)
+        if inferior > 0.5:
+            return self.a.nome
+        if superior < 0.5:
+            return self.b.nome
+        return None
+
+    def receber(self, numero: int, resultado: ResultadoLote, z: float, minimo: int, maximo: int) -> bool:
+        """Conta os lotes na ordem de envio; devolve True se o confronto ficou decidido agora."""
+        self._chegados[numero] = resultado
+        while not self.decidido and self.lotes_contados in self._chegados:
+            lote = self._chegados.pop(self.lotes_contados)
+            self.lotes_contados += 1
+            self.vitorias += lote.vitorias
+            self.empates += lote.empates
+            self.derrotas += lote.derrotas
+            self.vitorias_de_quem_comeca += lote.vitorias_de_quem_comeca
+            if self.partidas >= maximo or (self.partidas >= minimo and self.vencedor(z) is not None):
+                self.decidido = True
+                self._chegados.clear()
+                return True
+        return False
+
+    def para_dict(self, z: float) -> dict:
+        inferior, superior = intervalo_wilson(self.pontos, self.partidas, z)
+        return {
+            "a": self.a.nome,
+            "b": self.b.nome,
+            "partidas": self.partidas,
+            "vitorias_a": self.vitorias,
+            "empates": self.empates,
+            "vitorias_b": self.derrotas,
+            "taxa_a": round(self.pontos / self.partidas, 4) if self.partidas else None,
+            "intervalo_a": [round(inferior, 4), round(superior, 4)],
+            "vencedor": self.vencedor(z),
+            "vitorias_de_quem_comeca": self.vitorias_de_quem_comeca,
+        }
+
+def calcular_elo(nomes: Iterable[str], confrontos: Iterable[Confronto], iteracoes: int = 200) -> Dict[str, float]:
+    """Elo de cada participante pelo modelo de Bradley-Terry ajustado a todos os resultados.
+
+    Diferente da atualização partida a partida, o ajuste não depende da ordem dos resultados.
+    Cada confronto recebe um empate fictício, para que placares de 100% tenham Elo finito, e a
+    média dos Elos é 1500.
+    """
+    nomes = list(nomes)
+    pontos = dict.fromkeys(nomes, 0.0)
+    pares = []
+    for confronto in confrontos:
+        if confronto.partidas:
+            pontos[confronto.a.nome] += confronto.pontos + 0.5
+            pontos[confronto.b.nome] += confronto.partidas - confronto.pontos + 0.5
+            pares.append((confronto.a.nome, confronto.b.nome, confronto.partidas + 1))
+    forca = dict.fromkeys(nomes, 1.0)
+    for _ in range(iteracoes):
+        soma = dict.fromkeys(nomes, 0.0)
+        for a, b, partidas in pares:
+            parcela = partidas / (forca[a] + forca[b])
+            soma[a] += parcela
+            soma[b] += parcela
+        forca = {nome: pontos[nome] / soma[nome] if soma[nome] else forca[nome] for nome in nomes}
+    elo = {nome: 400 * math.log10(forca[nome]) for nome in nomes}
+    media = statistics.mean(elo.values()) if elo else 0.0
+    return {nome: round(1500 + valor - media, 1) for nome, valor in elo.items()}
+
+def conferir_nomes(participantes: Sequence[Participante]):
+    """Levanta ValueError se dois participantes têm o mesmo nome (os resultados são contados pelo nome)."""
+    nomes = [participante.nome for participante in participantes]
+    if len(set(nomes)) != len(nomes):
+        raise ValueError("Os nomes dos participantes precisam ser únicos")
+
+def conferir_baralhos(participantes: Sequence[Participante], cartas_por_nome: Dict[str, Carta]):
+    """Levanta ValueError se algum baralho usa cartas fora do catálogo, antes de qualquer partida."""
+    for participante in participantes:
+        desconhecidas = set(participante.baralho) - cartas_por_nome.keys()
+        if desconhecidas:
+            raise ValueError(f"Cartas fora do catálogo no baralho de {participante.nome}: {sorted(desconhecidas)}")
+
+class Torneio:
+    """Todos contra todos entre `participantes`, com parada antecipada dos confrontos decididos.
+
+    As estratégias precisam poder ser enviadas aos processos (classes ou `functools.partial`).
+    `confianca` é o nível do intervalo de Wilson usado nas tabelas e na parada; como o
+    confronto é conferido a cada lote, o padrão é alto.
+    """
+    def __init__(self, participantes: Sequence[Participante], arquivo_csv: str = 'cartas_game.csv',
+                 partidas_por_lote: int = 20, minimo_partidas: int = 40, maximo_partidas: int = 400,
+                 confianca: float = 0.99, max_turnos: int = 500, cartas_iniciais: int = 3,
+                 semente: Optional[int] = None):
+        conferir_nomes(participantes)
+        self.participantes = list(participantes)
+        self.arquivo_csv = arquivo_csv
+        self.partidas_por_lote = partidas_por_lote
+        self.minimo_partidas = minimo_partidas
+        self.maximo_partidas = maximo_partidas
+        self.z = statistics.NormalDist().inv_cdf(1 - (1 - confianca) / 2)
+        self.max_turnos = max_turnos
+        self.cartas_iniciais = cartas_iniciais
+        self.semente = semente if semente is not None else random.getrandbits(64)
+        self.confrontos = [Confronto(a, b, semente_da_partida(self.semente, indice))
+                           for indice, (a, b) in enumerate(itertools.combinations(self.participantes, 2))]
+
+    def executar(self, processos: Optional[int] = None, ao_decidir: Optional[Callable[[Confronto], None]] = None) -> dict:
+        """Joga os confrontos até todos estarem decididos e devolve `relatorio()`.
+
+        Com `processos=None` é usado um processo por núcleo; com 1, tudo roda neste processo.
+        `ao_decidir` é chamada com cada confronto assim que ele termina.
+        """
+        cartas_por_nome = {carta.nome: carta for carta in carregar_catalogo(self.arquivo_csv)}
+        conferir_baralhos(self.participantes, cartas_por_nome)
+        processos = processos or os.cpu_count() or 1
+        if processos == 1:
+            while True:
+                confronto = self._proximo_confronto()
+                if confronto is None:
+                    break
+                numero, tarefa = self._enviar(confronto)
+                self._receber(confronto, numero, jogar_lote(tarefa, cartas_por_nome), ao_decidir)
+            return self.relatorio()
+
+        with ProcessPoolExecutor(processos, initializer=iniciar_trabalhador, initargs=(self.arquivo_csv,)) as pool:
+            # Dois lotes por processo mantêm o pool ocupado sem adiantar muito trabalho que pode ser descartado.
+            limite = 2 * processos
+            em_andamento = {}
+            while True:
+                while len(em_andamento) < limite:
+                    confronto = self._proximo_confronto()
+                    if confronto is None:
+                        break
+                    numero, tarefa = self._enviar(confronto)
+                    em_andamento[pool.submit(jogar_lote, tarefa)] = (confronto, numero)
+                if not em_andamento:
+                    break
+                prontos, _ = wait(em_andamento, return_when=FIRST_COMPLETED)
+                for futuro in prontos:
+                    confronto, numero = em_andamento.pop(futuro)
+                    self._receber(confronto, numero, futuro.result(), ao_decidir)
+        return self.relatorio()
+
+    def _proximo_confronto(self) -> Optional[Confronto]:
+        """O confronto ainda aberto com menos lotes enviados, ou None se todos já receberam o bastante."""
+        abertos = [confronto for confronto in self.confrontos
+                   if not confronto.decidido and confronto.lotes_enviados * self.partidas_por_lote < self.maximo_partidas]
+        return min(abertos, key=lambda confronto: confronto.lotes_enviados, default=None)
+
+    def _enviar(self, confronto: Confronto) -> Tuple[int, tuple]:
+        numero = confronto.lotes_enviados
+        confronto.lotes_enviados += 1
+        inicio = numero * self.partidas_por_lote
+        quantidade = min(self.partidas_por_lote, self.maximo_partidas - inicio)
+        return numero, (confronto.a, confronto.b, confronto.semente, inicio, quantidade, self.max_turnos, self.cartas_iniciais)
+
+    def _receber(self, confronto: Confronto, numero: int, resultado: ResultadoLote,
+                 ao_decidir: Optional[Callable[[Confronto], None]]):
+        if confronto.decidido:
+            return
+        if confronto.receber(numero, resultado, self.z, self.minimo_partidas, self.maximo_partidas) and ao_decidir:
+            ao_decidir(confronto)
+
+    def tabela(self) -> List[dict]:
+        """Uma linha por participante, do maior Elo para o menor, com o que já foi contado."""
+        elo = calcular_elo((participante.nome for participante in self.participantes), self.confrontos)
+        linhas = []
+        for participante in self.participantes:
+            vitorias = empates = derrotas = 0
+            for confronto in self.confrontos:
+                if confronto.a is participante:
+                    vitorias, derrotas = vitorias + confronto.vitorias, derrotas + confronto.derrotas
+                elif confronto.b is participante:
+                    vitorias, derrotas = vitorias + confronto.derrotas, derrotas + confronto.vitorias
+                else:
+                    continue
+                empates += confronto.empates
+            partidas = vitorias + empates + derrotas
+            pontos = vitorias + empates / 2
+            inferior, superior = intervalo_wilson(pontos, partidas, self.z)
+            linhas.append({
+                "nome": participante.nome,
+                "elo": elo[participante.nome],
+                "partidas": partidas,
+                "vitorias": vitorias,
+                "empates": empates,
+                "derrotas": derrotas,
+                "taxa": round(pontos / partidas, 4) if partidas else None,
+                "intervalo": [round(inferior, 4), round(superior, 4)],
+            })
+        return sorted(linhas, key=lambda linha: -linha["elo"])
+
+    def relatorio(self) -> dict:
+        partidas = sum(confronto.partidas for confronto in self.confrontos)
+        return {
+            "semente": self.semente,
+            "partidas": partidas,
+            "partidas_poupadas": self.maximo_partidas * len(self.confrontos) - partidas,
+            "participantes": self.tabela(),
+            "confrontos": [confronto.para_dict(self.z) for confronto in self.confrontos],
+        }
+
+def estrategia_pelo_nome(nome: str) -> Callable:
+    """"regras" é a `JogadorIA`; "mcts:N" é a `JogadorMCTS` com N simulações por jogada."""
+    if nome == "regras":
+        return JogadorIA
+    if nome.startswith("mcts"):
+        _, _, simulacoes = nome.partition(":")
+        return functools.partial(JogadorMCTS, simulacoes=int(simulacoes or 300))
+    raise ValueError(f"Estratégia desconhecida: {nome}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baralhos", type=int, default=4, help="baralhos sorteados do catálogo")
+    parser.add_argument("--arquivo-baralhos", metavar="ARQUIVO",
+                        help='JSON {"nome": ["carta", ...]} com os baralhos, em vez de sorteá-los')
+    parser.add_argument("--tamanho-baralho", type=int, default=30, help="cartas de cada baralho sorteado")
+    parser.add_argument("--estrategias", nargs="+", default=["regras"], help='"regras" ou "mcts:SIMULACOES"')
+    parser.add_argument("--banco", default="cartas_game.csv", help="CSV de cartas ou banco SQLite (.db)")
+    parser.add_argument("-p", "--processos", type=int, default=0, help="processos trabalhadores (0 usa todos os núcleos)")
+    parser.add_argument("--lote", type=int, default=20, help="partidas por lote enviado a um processo")
+    parser.add_argument("--minimo", type=int, default=40, help="partidas de um confronto antes de ele poder parar")
+    parser.add_argument("--maximo", type=int, default=400, help="partidas de um confronto que não se decide")
+    parser.add_argument("--confianca", type=float, default=0.99, help="nível do intervalo de confiança")
+    parser.add_argument("--semente", type=int, default=None, help="semente do torneio")
+    parser.add_argument("--saida", help="grava o relatório JSON neste arquivo")
+    args = parser.parse_args()
+
+    semente = args.semente if args.semente is not None else random.getrandbits(64)
+    if args.arquivo_baralhos:
+        with open(args.arquivo_baralhos, encoding="utf-8") as arquivo:
+            baralhos = {nome: tuple(cartas) for nome, cartas in json.load(arquivo).items()}
+    else:
+        cartas = carregar_catalogo(args.banco)
+        rng = random.Random(semente)
+        baralhos = {f"Baralho {i + 1}": sortear_baralho(cartas, args.tamanho_baralho, rng) for i in range(args.baralhos)}
+    participantes = [Participante(f"{nome}/{estrategia}" if len(args.estrategias) > 1 else nome, baralho,
+                                  estrategia_pelo_nome(estrategia))
+                     for nome, baralho in baralhos.items() for estrategia in args.estrategias]
+
+    torneio = Torneio(participantes, arquivo_csv=args.banco, partidas_por_lote=args.lote, minimo_partidas=args.minimo,
+                      maximo_partidas=args.maximo, confianca=args.confianca, semente=semente)
+
+    def ao_decidir(confronto: Confronto):
+        vencedor = confronto.vencedor(torneio.z) or "sem vencedor"
+        print(f"{confronto.a.nome} x {confronto.b.nome}: {confronto.vitorias}-{confronto.empates}-{confronto.derrotas} "
+              f"em {confronto.partidas} partidas ({vencedor})", flush=True)
+
+    relatorio = torneio.executar(args.processos or None, ao_decidir)
+    print(f"\nPartidas jogadas: {relatorio['partidas']} (poupadas pela parada antecipada: {relatorio['partidas_poupadas']})")
+    for linha in relatorio["participantes"]:
+        inferior, superior = linha["intervalo"]
+        print(f"  {linha['nome']}: Elo {linha['elo']:.0f}, {linha['vitorias']}-{linha['empates']}-{linha['derrotas']}, "
+              f"taxa {100 * (linha['taxa'] or 0):.1f}% [{100 * inferior:.1f}%, {100 * superior:.1f}%]")
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,31 @@
+import contextlib
 import os
-import time
+from jogo_estrutura import eventos, tela
+
+_modo_headless = False
 
 def custom_sleep(duration: int):
-    if os.getenv("RUNNING_TESTS") != "1":
-        time.sleep(duration)
-        
+    """Pausa a animação: a próxima escrita no terminal espera `duration` segundos (veja `tela.Ritmo`)."""
+    if not _modo_headless and os.getenv("RUNNING_TESTS") != "1":
+        tela.ritmo.adiar(duration)
+
 def limpar_tela():
-    os.system('cls' if os.name == 'nt' else 'clear')
\ No newline at end of file
+    """Apaga as mensagens do turno anterior, mantendo o tabuleiro desenhado."""
+    if not _modo_headless:
+        terminal = tela.terminal()
+        if terminal is not None:
+            terminal.limpar_mensagens()
+        elif tela.console_sem_ansi():
+            os.system('cls')
+
+@contextlib.contextmanager
+def modo_headless():
+    """Desativa pausas e limpeza de tela e descarta os eventos emitidos dentro do bloco."""
+    global _modo_headless
+    anterior = _modo_headless
+    _modo_headless = True
+    try:
+        with eventos.usar_saida(eventos.SaidaNula()):
+            yield
+    finally:
+        _modo_headless = anterior
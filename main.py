@@ -1,5 +1,3 @@
-import random
-import copy
 from banco.banco_de_dados import BancoSimulado
 from  jogo_estrutura.jogo import Jogo
 from  jogador import Jogador
@@ -9,11 +7,10 @@ cartas = banco.obter_cartas()
 
 jogador1 = Jogador("Jogador", eh_humano=True)
 jogador2 = Jogador("Máquina", eh_humano=False)
-jogador1.baralho.extend([copy.deepcopy(carta) for carta in random.choices(cartas, k=30)])
-jogador2.baralho.extend([copy.deepcopy(carta) for carta in random.choices(cartas, k=30)])
 
 if __name__ == "__main__":
-    jogo = Jogo([jogador1, jogador2])
+    jogo = Jogo([jogador1, jogador2], tamanho_baralho=30, cartas_iniciais=3)
+    jogo.distribuir_baralhos(cartas)
     jogo.iniciar()
 
     while jogo.jogar_turno():
@@ -0,0 +1,86 @@
+import argparse
+import functools
+import time
+from collections import Counter
+from jogador.jogador_mcts import JogadorMCTS
+from jogo_estrutura.perfil import Perfil
+from jogo_estrutura.replay import GravadorReplay
+from jogo_estrutura.simulacao import ESTRATEGIAS_PADRAO, carregar_catalogo, simular_partidas
+from jogo_estrutura.simulacao_paralela import simular_em_paralelo
+
+def _lotes_vetorizados(args):
+    from jogo_estrutura.simulacao import ResultadoPartida
+    from jogo_estrutura.simulacao_vetorizada import simular_lote
+    resultado = simular_lote(args.partidas, carregar_catalogo(args.banco), tamanho_baralho=args.tamanho_baralho,
+                             max_turnos=args.max_turnos, cartas_iniciais=args.cartas_iniciais, semente=args.semente)
+    nomes = ("Máquina 1", "Máquina 2")
+    yield [ResultadoPartida(nomes[vencedor] if vencedor >= 0 else None, int(turnos), dict(zip(nomes, saude.tolist())))
+           for vencedor, turnos, saude in zip(resultado.vencedor, resultado.turnos, resultado.saude_final)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Simula partidas Máquina contra Máquina sem interface.")
+    parser.add_argument("-n", "--partidas", type=int, default=1000, help="quantidade de partidas a simular")
+    parser.add_argument("--tamanho-baralho", type=int, default=30, help="cartas em cada baralho")
+    parser.add_argument("--cartas-iniciais", type=int, default=3, help="cartas compradas por cada jogador no início")
+    parser.add_argument("--max-turnos", type=int, default=500, help="turnos até a partida ser declarada empate")
+    parser.add_argument("-p", "--processos", type=int, default=1, help="processos trabalhadores (0 usa todos os núcleos)")
+    parser.add_argument("--banco", default="cartas_game.csv", help="CSV de cartas ou banco SQLite (.db) usado nos baralhos")
+    parser.add_argument("--tamanho-lote", type=int, default=250, help="partidas por lote enviado a cada processo")
+    parser.add_argument("--mcts", type=int, default=0, metavar="SIMULACOES",
+                        help="a Máquina 1 joga com busca Monte Carlo usando SIMULACOES simulações por jogada")
+    parser.add_argument("--vetorizado", action="store_true",
+                        help="usa o simulador vetorizado com NumPy (apenas a IA padrão, em um processo)")
+    parser.add_argument("--semente", type=int, default=None,
+                        help="semente do lote; cada partida recebe uma semente derivada e pode ser repetida isoladamente")
+    parser.add_argument("--gravar", metavar="ARQUIVO",
+                        help="grava as partidas em ARQUIVO para reprodução (apenas em um processo, sem --vetorizado)")
+    parser.add_argument("--perfil", metavar="ARQUIVO",
+                        help="mede o tempo de cada fase dos turnos e grava o resumo em JSON (não vale com --vetorizado)")
+    args = parser.parse_args()
+    if args.perfil and args.vetorizado:
+        parser.error("--perfil não funciona com --vetorizado")
+    if args.gravar and (args.vetorizado or args.processos != 1):
+        parser.error("--gravar só funciona com um processo e sem --vetorizado")
+
+    estrategias = ESTRATEGIAS_PADRAO
+    gravador = None
+    perfil = Perfil() if args.perfil else None
+    if args.mcts:
+        estrategias = (functools.partial(JogadorMCTS, simulacoes=args.mcts), ESTRATEGIAS_PADRAO[1])
+
+    if args.vetorizado:
+        lotes = _lotes_vetorizados(args)
+    elif args.processos == 1:
+        cartas = carregar_catalogo(args.banco)
+        gravador = GravadorReplay(args.gravar, cartas) if args.gravar else None
+        lotes = ([resultado] for resultado in simular_partidas(
+            args.partidas, cartas, tamanho_baralho=args.tamanho_baralho, max_turnos=args.max_turnos,
+            cartas_iniciais=args.cartas_iniciais, estrategias=estrategias, semente=args.semente, gravador=gravador,
+            perfil=perfil))
+    else:
+        lotes = simular_em_paralelo(
+            args.partidas, processos=args.processos or None, tamanho_lote=args.tamanho_lote, arquivo_csv=args.banco,
+            tamanho_baralho=args.tamanho_baralho, max_turnos=args.max_turnos,
+            cartas_iniciais=args.cartas_iniciais, estrategias=estrategias, semente=args.semente, perfil=perfil)
+
+    vitorias = Counter()
+    turnos_totais = 0
+    inicio = time.perf_counter()
+    for lote in lotes:
+        for resultado in lote:
+            vitorias[resultado.vencedor or "Empate"] += 1
+            turnos_totais += resultado.turnos
+    duracao = time.perf_counter() - inicio
+    if gravador is not None:
+        gravador.fechar()
+
+    print(f"Partidas simuladas: {args.partidas} em {duracao:.2f}s ({args.partidas / duracao:.1f} partidas/s)")
+    print(f"Média de turnos: {turnos_totais / max(args.partidas, 1):.1f}")
+    for nome, total in vitorias.most_common():
+        print(f"  {nome}: {total} ({100 * total / args.partidas:.1f}%)")
+    if perfil is not None:
+        perfil.salvar(args.perfil)
+        print(f"Perfil gravado em {args.perfil}")
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,14 @@
 import unittest
+import asyncio
+import functools
+import importlib.util
+import io
+import json
 import os
+import struct
+import tempfile
+from contextlib import redirect_stdout
+from unittest.mock import patch
 from banco.cartas import (
     CartaCriatura,
     CartaFeitico,
@@ -7,6 +16,19 @@ from banco.cartas import (
     CartaTerreno
 )
 from jogador import Jogador
+from jogador.jogador_ia import JogadorIA
+from jogador.jogador_mcts import JogadorMCTS
+from jogo_estrutura.historico import Historico
+from jogo_estrutura.jogo import Jogo
+from jogo_estrutura.perfil import Perfil
+from jogo_estrutura.replay import GravadorReplay, LeitorReplay, reproduzir
+import jogo_estrutura.utils as utils
+from jogo_estrutura.otimizador import OtimizadorBaralhos
+from jogo_estrutura.servidor import ServidorJogo
+from jogo_estrutura.torneio import Participante, Torneio
+from jogo_estrutura.simulacao import carregar_catalogo, simular_partida, simular_partidas
+from jogo_estrutura.simulacao_paralela import simular_em_paralelo
+from benchmarks.carga_servidor import executar_carga, jogar_sessao
 
 os.environ["RUNNING_TESTS"] = "1" # Configura a variável de ambiente para desabilitar o sleep durante os testes.
 
@@ -96,5 +118,279 @@ class TestIntegracaoTurnos(unittest.TestCase):
         self.jogador1.atacar(self.jogador2, 0)
         self.assertEqual(self.jogador2.saude, 18)
 
+class TestSimulacaoHeadless(unittest.TestCase):
+    def setUp(self):
+        self.cartas = carregar_catalogo()
+
+    @patch('os.system')
+    def test_partidas_completas_sem_saida_no_terminal(self, mock_system):
+        """Testa se as partidas simuladas terminam sem escrever no terminal nem chamar subprocessos."""
+        saida = io.StringIO()
+        with redirect_stdout(saida):
+            resultados = list(simular_partidas(5, self.cartas))
+        self.assertEqual(saida.getvalue(), "")
+        mock_system.assert_not_called()
+        self.assertEqual(len(resultados), 5)
+        for resultado in resultados:
+            self.assertGreater(resultado.turnos, 0)
+            self.assertEqual(set(resultado.saude_final), {"Máquina 1", "Máquina 2"})
+            if resultado.vencedor is not None:
+                perdedor = next(nome for nome in resultado.saude_final if nome != resultado.vencedor)
+                self.assertLessEqual(resultado.saude_final[perdedor], 0)
+
+    def test_partida_interrompida_e_empate(self):
+        """Testa se uma partida que atinge o limite de turnos é registrada como empate."""
+        resultado = next(simular_partidas(1, self.cartas, max_turnos=1))
+        self.assertIsNone(resultado.vencedor)
+        self.assertEqual(resultado.turnos, 1)
+
+    def test_simulacao_paralela_em_lotes(self):
+        """Testa se o executor paralelo entrega todas as partidas em lotes limitados."""
+        lotes = list(simular_em_paralelo(7, processos=2, tamanho_lote=3))
+        self.assertEqual(sorted(len(lote) for lote in lotes), [1, 3, 3])
+        self.assertTrue(all(resultado.turnos > 0 for lote in lotes for resultado in lote))
+
+    def test_lote_com_semente_reprodutivel(self):
+        """Testa se o lote com semente dá o mesmo resultado em paralelo e se cada partida pode ser repetida sozinha."""
+        sequencial = list(simular_partidas(6, self.cartas, semente=99))
+        paralelo = [resultado for lote in simular_em_paralelo(6, processos=2, tamanho_lote=4, semente=99) for resultado in lote]
+        self.assertEqual(sorted(paralelo, key=lambda r: r.semente), sorted(sequencial, key=lambda r: r.semente))
+        self.assertEqual(len({resultado.semente for resultado in sequencial}), 6)
+        self.assertEqual(simular_partida(self.cartas, semente=sequencial[3].semente), sequencial[3])
+
+    def test_perfil_do_lote_paralelo(self):
+        """Testa se o perfil somado dos processos cobre todos os turnos do lote."""
+        perfil = Perfil()
+        lotes = list(simular_em_paralelo(6, processos=2, tamanho_lote=4, semente=3, perfil=perfil))
+        self.assertEqual(perfil.contadores["turnos"], sum(resultado.turnos for lote in lotes for resultado in lote))
+        self.assertEqual(perfil.chamadas["decisao"], perfil.contadores["turnos"])
+
+    def test_partida_com_busca_monte_carlo(self):
+        """Testa uma partida completa entre a IA de busca Monte Carlo e a IA padrão."""
+        estrategias = (functools.partial(JogadorMCTS, simulacoes=20), JogadorIA)
+        saida = io.StringIO()
+        with redirect_stdout(saida):
+            resultado = next(simular_partidas(1, self.cartas, max_turnos=60, estrategias=estrategias))
+        self.assertEqual(saida.getvalue(), "")
+        self.assertGreater(resultado.turnos, 0)
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.cartas = list(carregar_catalogo())
+        pasta = tempfile.TemporaryDirectory()
+        self.addCleanup(pasta.cleanup)
+        self.caminho = os.path.join(pasta.name, "partidas.rep")
+
+    def test_grava_lote_e_reproduz_pelo_indice(self):
+        """Testa se cada partida do lote gravado é lida pelo número e repetida com o mesmo resultado."""
+        with GravadorReplay(self.caminho, self.cartas) as gravador:
+            resultados = list(simular_partidas(6, self.cartas, max_turnos=80, semente=5, gravador=gravador))
+        with LeitorReplay(self.caminho) as leitor:
+            self.assertEqual(len(leitor), 6)
+            self.assertEqual(len(list(leitor)), 6)
+            for numero in (4, 0, 2):
+                jogo = reproduzir(leitor.ler(numero), self.cartas)
+                esperado = resultados[numero]
+                vencedor = jogo.jogadores[0].nome if len(jogo.jogadores) == 1 else None
+                self.assertEqual((vencedor, jogo.turno), (esperado.vencedor, esperado.turnos))
+                for jogador in jogo.jogadores:
+                    self.assertEqual(jogador.saude, esperado.saude_final[jogador.nome])
+        # Sem o índice, o leitor o reconstrói percorrendo a gravação.
+        os.remove(self.caminho + ".idx")
+        with LeitorReplay(self.caminho) as leitor:
+            self.assertEqual(len(leitor), 6)
+            self.assertEqual(leitor.ler(3).semente, resultados[3].semente)
+
+    def test_gravador_refaz_indice_e_descarta_bloco_incompleto(self):
+        """Testa se acrescentar partidas a uma gravação sem índice ou com um bloco final cortado mantém o índice certo."""
+        with GravadorReplay(self.caminho, self.cartas) as gravador:
+            list(simular_partidas(3, self.cartas, max_turnos=40, semente=5, gravador=gravador))
+        os.remove(self.caminho + ".idx")
+        with GravadorReplay(self.caminho, self.cartas) as gravador:
+            quarta, = simular_partidas(1, self.cartas, max_turnos=40, semente=50, gravador=gravador)
+        # Uma gravação interrompida: o cabeçalho promete 1000 bytes, mas só 3 chegaram ao arquivo.
+        with open(self.caminho, "ab") as arquivo:
+            arquivo.write(struct.pack("<I", 1000) + b"abc")
+        with GravadorReplay(self.caminho, self.cartas) as gravador:
+            self.assertEqual(gravador.partidas, 4)
+            quinta, = simular_partidas(1, self.cartas, max_turnos=40, semente=70, gravador=gravador)
+        with LeitorReplay(self.caminho) as leitor:
+            self.assertEqual(len(leitor), 5)
+            self.assertEqual([partida.semente for partida in leitor], [leitor.ler(i).semente for i in range(5)])
+            self.assertEqual((leitor.ler(3).semente, leitor.ler(4).semente), (quarta.semente, quinta.semente))
+
+    def test_semente_fora_de_64_bits_recusada_antes_da_partida(self):
+        """Testa se uma semente que não cabe na gravação é recusada ao iniciar, e não depois da partida."""
+        with GravadorReplay(self.caminho, self.cartas) as gravador:
+            for semente in (-1, 2 ** 64):
+                jogo = Jogo([Jogador("Máquina 1", eh_humano=False), Jogador("Máquina 2", eh_humano=False)], semente=semente)
+                with self.assertRaises(ValueError):
+                    gravador.iniciar(jogo)
+                self.assertIsNone(jogo.gravacao)
+        with LeitorReplay(self.caminho) as leitor:
+            self.assertEqual(len(leitor), 0)
+
+    def test_reproducao_repete_o_historico(self):
+        """Testa se a partida repetida registra o mesmo histórico da original, inclusive com a busca Monte Carlo."""
+        jogadores = [Jogador("Máquina 1", eh_humano=False, estrategia=functools.partial(JogadorMCTS, simulacoes=10)),
+                     Jogador("Máquina 2", eh_humano=False)]
+        with GravadorReplay(self.caminho, self.cartas) as gravador, utils.modo_headless():
+            jogo = Jogo(jogadores, politica_historico=Historico.COMPLETO)
+            jogo.distribuir_baralhos(self.cartas)
+            gravador.iniciar(jogo)
+            jogo.iniciar()
+            while jogo.turno < 60 and jogo.jogar_turno():
+                pass
+            gravador.finalizar(jogo)
+        with LeitorReplay(self.caminho) as leitor:
+            partida = leitor.ler(0)
+        repetido = reproduzir(partida, self.cartas)
+        self.assertEqual(list(repetido.historico.registros()), list(jogo.historico.registros()))
+        self.assertEqual([j.saude for j in repetido.jogadores], [j.saude for j in jogo.jogadores])
+        with self.assertRaises(ValueError):
+            reproduzir(partida, self.cartas[1:])
+
+class TestServidor(unittest.TestCase):
+    def setUp(self):
+        self.cartas = carregar_catalogo()
+
+    async def _com_servidor(self, servidor, cliente):
+        async with servidor.ouvir(porta=0) as ouvinte:
+            porta = ouvinte.sockets[0].getsockname()[1]
+            return await cliente(lambda: asyncio.open_connection("127.0.0.1", porta))
+
+    def test_sessoes_simultaneas_terminam(self):
+        """Testa se várias sessões simultâneas jogam partidas completas pelo servidor."""
+        servidor = ServidorJogo(self.cartas)
+        relatorio = asyncio.run(self._com_servidor(servidor, lambda conectar: executar_carga(conectar, 20)))
+        self.assertEqual(relatorio["erros"], {})
+        self.assertEqual(sum(relatorio["vencedores"].values()), 20)
+        self.assertEqual(servidor.partidas_encerradas, 20)
+        self.assertEqual(servidor.sessoes, {})
+        self.assertGreater(servidor.latencias["resposta"].quantidade, 0)
+
+    def test_decisao_no_pool_igual_a_decisao_no_laco(self):
+        """Testa se decidir a jogada da máquina em outro processo não muda as partidas."""
+        async def cliente(conectar):
+            latencias = []
+            return await asyncio.gather(*(jogar_sessao(conectar, "Cliente", semente, latencias) for semente in range(4)))
+
+        no_laco = asyncio.run(self._com_servidor(ServidorJogo(self.cartas), cliente))
+        no_pool = asyncio.run(self._com_servidor(ServidorJogo(self.cartas, processos=2), cliente))
+        self.assertEqual([(fim["vencedor"], fim["turnos"]) for fim in no_pool],
+                         [(fim["vencedor"], fim["turnos"]) for fim in no_laco])
+
+    def test_jogada_invalida_mantem_a_vez(self):
+        """Testa se uma jogada inválida é recusada sem passar a vez e se sair encerra a partida."""
+        async def cliente(conectar):
+            leitor, escritor = await conectar()
+            respostas = []
+            for pedido in ({"tipo": "nova_partida", "nome": "Ana", "semente": 7}, {"tipo": "jogar", "carta": 99},
+                           {"tipo": "sair"}):
+                escritor.write(json.dumps(pedido).encode() + b"\n")
+                while True:
+                    respostas.append(json.loads(await leitor.readline()))
+                    if respostas[-1]["tipo"] != "partida":
+                        break
+            escritor.close()
+            return respostas
+
+        partida, sua_vez, invalida, fim = asyncio.run(self._com_servidor(ServidorJogo(self.cartas), cliente))
+        self.assertEqual(partida["semente"], 7)
+        self.assertEqual(sua_vez["estado"]["jogadores"][0]["nome"], "Ana")
+        self.assertEqual(len(sua_vez["estado"]["jogadores"][0]["mao"]), 4)
+        self.assertIsInstance(sua_vez["estado"]["jogadores"][1]["mao"], int)
+        self.assertEqual(invalida["tipo"], "invalida")
+        self.assertEqual(invalida["eventos"], ["Índice de carta inválido."])
+        self.assertEqual((fim["tipo"], fim["vencedor"], fim["turnos"]), ("fim", None, 0))
+
+class TestTorneio(unittest.TestCase):
+    def setUp(self):
+        cartas = carregar_catalogo()
+        criaturas = sorted((carta for carta in cartas if isinstance(carta, CartaCriatura)), key=lambda carta: carta.poder)
+        # Um baralho só com a criatura mais forte contra um só com a mais fraca se decide cedo.
+        self.participantes = [Participante("Forte", (criaturas[-1].nome,) * 30),
+                              Participante("Fraco", (criaturas[0].nome,) * 30),
+                              Participante("Misto", tuple(carta.nome for carta in cartas) + (criaturas[-1].nome,) * 8)]
+
+    def test_parada_antecipada_e_resultado_independe_dos_processos(self):
+        """Testa se confrontos decididos param no mínimo e se o torneio dá o mesmo resultado com 1 ou 2 processos."""
+        decididos = []
+        sequencial = Torneio(self.participantes, partidas_por_lote=10, minimo_partidas=20, maximo_partidas=200,
+                             semente=5).executar(processos=1, ao_decidir=decididos.append)
+        paralelo = Torneio(self.participantes, partidas_por_lote=10, minimo_partidas=20, maximo_partidas=200,
+                           semente=5).executar(processos=2)
+        self.assertEqual(sequencial, paralelo)
+        self.assertEqual(len(decididos), 3)
+        forte_fraco = sequencial["confrontos"][0]
+        self.assertEqual((forte_fraco["a"], forte_fraco["b"], forte_fraco["vencedor"]), ("Forte", "Fraco", "Forte"))
+        self.assertEqual(forte_fraco["partidas"], 20)
+        self.assertGreater(sequencial["partidas_poupadas"], 0)
+        self.assertEqual(sequencial["participantes"][0]["nome"], "Forte")
+
+    def test_baralho_com_carta_fora_do_catalogo(self):
+        """Testa se um baralho com carta desconhecida é recusado antes de jogar."""
+        torneio = Torneio(self.participantes[:1] + [Participante("Inventado", ("Carta Inventada",) * 30)])
+        with self.assertRaises(ValueError):
+            torneio.executar(processos=1)
+
+class TestOtimizadorBaralhos(unittest.TestCase):
+    def test_otimizacao_independe_dos_processos(self):
+        """Testa se uma otimização curta dá o mesmo resultado com 1 ou 2 processos e se cada partida é contada uma vez."""
+        cartas = carregar_catalogo()
+        referencia = Participante("Referência", tuple(carta.nome for carta in cartas[:20]))
+
+        def otimizar(processos):
+            otimizador = OtimizadorBaralhos(referencia, tamanho=20, populacao=6, elite=2, amostra_inicial=4,
+                                            amostra_maxima=16, partidas_por_lote=4, semente=3)
+            return otimizador.executar(geracoes=3, processos=processos), otimizador
+
+        sequencial, otimizador = otimizar(1)
+        paralelo, _ = otimizar(2)
+        self.assertEqual(sequencial, paralelo)
+        self.assertEqual(len(sequencial["geracoes"]), 3)
+        self.assertEqual(sum(sequencial["melhor"]["cartas"].values()), 20)
+        self.assertEqual(sum(aptidao.partidas for aptidao in otimizador.aptidoes.values()), sequencial["partidas"])
+
+@unittest.skipUnless(importlib.util.find_spec("numpy"), "requer numpy")
+class TestSimulacaoVetorizada(unittest.TestCase):
+    def setUp(self):
+        self.cartas = list(carregar_catalogo())
+
+    def test_mesmos_resultados_do_jogo_normal(self):
+        """Testa se o simulador vetorizado chega ao mesmo resultado de `Jogo` com os mesmos baralhos."""
+        import numpy as np
+        from jogo_estrutura.simulacao_vetorizada import SimuladorVetorizado
+        simulador = SimuladorVetorizado(self.cartas, 40, rng=np.random.default_rng(7))
+        baralhos = simulador.baralho.copy()
+        resultado = simulador.jogar()
+        for partida in range(40):
+            jogadores = [Jogador("Máquina 1", eh_humano=False), Jogador("Máquina 2", eh_humano=False)]
+            with utils.modo_headless():
+                jogo = Jogo(list(jogadores), politica_historico=Historico.DESLIGADO)
+                for jogador, baralho in zip(jogadores, baralhos[partida]):
+                    jogador.baralho.extend(self.cartas[i].nova_copia() for i in baralho)
+                    for _ in range(3):
+                        jogador.comprar_carta()
+                while jogo.turno < 500 and jogo.jogar_turno():
+                    pass
+            vencedor = jogadores.index(jogo.jogadores[0]) if len(jogo.jogadores) == 1 else -1
+            self.assertEqual(
+                (vencedor, jogo.turno, jogadores[0].saude, jogadores[1].saude),
+                (resultado.vencedor[partida], resultado.turnos[partida], *resultado.saude_final[partida]))
+
+    def test_lote_em_blocos_reprodutivel(self):
+        """Testa se o lote dividido em blocos tem um resultado por partida e se a semente o reproduz."""
+        from jogo_estrutura.simulacao_vetorizada import simular_lote
+        resultado = simular_lote(250, self.cartas, semente=1, tamanho_bloco=100)
+        self.assertEqual(resultado.vencedor.shape, (250,))
+        self.assertEqual(resultado.saude_final.shape, (250, 2))
+        self.assertTrue((resultado.turnos > 0).all())
+        for vencedor, saude in zip(resultado.vencedor, resultado.saude_final):
+            if vencedor >= 0:
+                self.assertLessEqual(saude[1 - vencedor], 0)
+        repetido = simular_lote(250, self.cartas, semente=1, tamanho_bloco=100)
+        self.assertTrue((repetido.turnos == resultado.turnos).all())
+
 if __name__ == '__main__':
     unittest.main()
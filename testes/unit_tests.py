@@ -1,9 +1,47 @@
 import unittest
+import copy
+import functools
+import io
 import os
-from banco.cartas import CartaCriatura, CartaFeitico, CartaFeiticoRevive, CartaTerreno, CartaAleatoria
+import pickle
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from unittest.mock import patch
+from banco import cartas as modulo_cartas
+from banco.cartas import SEM_EFEITO, ModeloCarta, CartaCriatura, CartaFeitico, CartaFeiticoRevive, CartaTerreno, CartaAleatoria, registrar_efeito
+from banco import banco_de_dados
+from banco.banco_de_dados import BancoSimulado
+from banco.banco_sqlite import BancoSQLite, CartasSQLite
 from jogador import Jogador
+from jogador.baralho import Baralho
+from jogador.campo import CampoDeBatalha
+from jogador.jogador_ia import JogadorIA
+from jogador.mao import CRIATURA, CURA, DANO, Mao
+from jogador.jogador_mcts import PASSAR, Acao, JogadorMCTS, acoes_legais
+from jogo_estrutura.jogo import Jogo
+from jogo_estrutura.historico import AcaoHistorico, Historico
+from jogo_estrutura import eventos
+from jogo_estrutura.perfil import Perfil
+from jogo_estrutura.tela import Ritmo, Tela
+from jogo_estrutura.otimizador import OtimizadorBaralhos, normalizar
+from jogo_estrutura.torneio import Confronto, Participante, ResultadoLote, calcular_elo, intervalo_wilson
 
 
+def guardar_tabela_de_efeitos(teste: unittest.TestCase):
+    """Desfaz, ao fim do teste, os efeitos que ele registrar na tabela global."""
+    efeitos, opcodes = list(modulo_cartas.EFEITOS), dict(modulo_cartas._opcodes)
+
+    def restaurar():
+        modulo_cartas.EFEITOS[:] = efeitos
+        modulo_cartas._opcodes.clear()
+        modulo_cartas._opcodes.update(opcodes)
+
+    teste.addCleanup(restaurar)
+
 class UnitTests(unittest.TestCase):
     def setUp(self):
         os.environ["RUNNING_TESTS"] = "1"
@@ -150,5 +188,746 @@ class UnitTests(unittest.TestCase):
             self.jogador2.saude < 20
         )
 
+class TestBaralho(unittest.TestCase):
+    def setUp(self):
+        self.cartas = [CartaCriatura(f"Criatura {i}", 1, "", 1, 1) for i in range(50)]
+
+    def test_compra_na_ordem_sem_embaralhar(self):
+        """Testa se, sem embaralhar, as cartas saem na ordem em que entraram."""
+        baralho = Baralho(self.cartas)
+        self.assertEqual([baralho.comprar() for _ in range(50)], self.cartas)
+        self.assertIsNone(baralho.comprar())
+        self.assertEqual(len(baralho), 0)
+
+    def test_embaralhar_gera_permutacao_e_topo_antecipa_compras(self):
+        """Testa se o baralho embaralhado entrega todas as cartas e se `topo` mostra as próximas compras."""
+        baralho = Baralho(self.cartas)
+        baralho.embaralhar(random.Random(7))
+        proximas = baralho.topo(5)
+        compradas = [baralho.comprar() for _ in range(50)]
+        self.assertEqual(compradas[:5], proximas)
+        self.assertCountEqual(compradas, self.cartas)
+        self.assertNotEqual(compradas, self.cartas)
+
+    def test_cartas_adicionadas_apos_embaralhar_vao_para_o_fundo(self):
+        """Testa se cartas colocadas depois de embaralhar só são compradas no fim."""
+        baralho = Baralho(self.cartas[:10])
+        baralho.embaralhar(random.Random(1))
+        baralho.append(self.cartas[10])
+        compradas = [baralho.comprar() for _ in range(11)]
+        self.assertIs(compradas[-1], self.cartas[10])
+
+    def test_buscar_retira_carta_do_baralho(self):
+        """Testa se a busca encontra e retira a carta procurada."""
+        baralho = Baralho(self.cartas)
+        baralho.embaralhar(random.Random(3))
+        encontrada = baralho.buscar(lambda carta: carta.nome == "Criatura 42")
+        self.assertIs(encontrada, self.cartas[42])
+        self.assertEqual(len(baralho), 49)
+        self.assertNotIn(encontrada, [baralho.comprar() for _ in range(49)])
+
+    def test_jogo_configura_tamanho_do_baralho_e_mao_inicial(self):
+        """Testa se o tamanho do baralho e a mão inicial vêm da configuração do jogo."""
+        jogador1, jogador2 = Jogador("Jogador 1"), Jogador("Jogador 2")
+        jogo = Jogo([jogador1, jogador2], tamanho_baralho=200, cartas_iniciais=7)
+        jogo.distribuir_baralhos(self.cartas)
+        with eventos.usar_saida(eventos.SaidaNula()):
+            jogo.iniciar()
+        self.assertEqual(len(jogador1.mao), 7)
+        self.assertEqual(len(jogador2.baralho), 193)
+
+class TestMao(unittest.TestCase):
+    def setUp(self):
+        self.cura = CartaFeitico("Cura", 2, "Cura 3.", "cura", 3)
+        self.barata = CartaCriatura("Goblin", 1, "Pequeno.", 1, 1)
+        self.cara = CartaCriatura("Dragão", 6, "Grande.", 6, 6)
+        self.mao = Mao([self.cara, self.cura, self.barata])
+
+    def test_primeira_jogavel_respeita_ordem_e_mana(self):
+        """Testa se o índice devolve a primeira carta da categoria que cabe na mana."""
+        self.assertEqual(self.mao.primeira_jogavel(CRIATURA, 1), 2)
+        self.assertEqual(self.mao.primeira_jogavel(CRIATURA, 6), 0)
+        self.assertIsNone(self.mao.primeira_jogavel(CURA, 1))
+        self.assertIsNone(self.mao.primeira_jogavel(DANO, 10))
+
+    def test_indice_acompanha_remocoes(self):
+        """Testa se cartas que saíram da mão não são mais devolvidas e as posições se ajustam."""
+        self.mao.pop(0)
+        self.assertEqual(self.mao.primeira_jogavel(CRIATURA, 10), 1)
+        self.mao.append(self.cara)
+        self.mao.remove(self.barata)
+        self.assertEqual(self.mao.primeira_jogavel(CRIATURA, 10), 1)
+        self.assertEqual(self.mao, [self.cura, self.cara])
+        for _ in range(100):
+            self.mao.append(self.barata)
+            self.mao.pop()
+        self.assertEqual(self.mao.primeira_jogavel(CRIATURA, 1), None)
+
+    def test_controlador_persiste_por_jogador(self):
+        """Testa se a estratégia é criada uma vez por jogador e recriada ao trocar ou clonar."""
+        jogador = Jogador("Máquina", eh_humano=False)
+        self.assertIs(jogador.controlador, jogador.controlador)
+        self.assertIsInstance(jogador.controlador, JogadorIA)
+        clone = jogador.clonar()
+        self.assertIs(clone.controlador.jogador, clone)
+        jogador.estrategia = functools.partial(JogadorMCTS, simulacoes=5)
+        self.assertIsInstance(jogador.controlador, JogadorMCTS)
+        jogador.mao = [self.barata]
+        self.assertIsInstance(jogador.mao, Mao)
+
+class TestCampoDeBatalha(unittest.TestCase):
+    def setUp(self):
+        self.criaturas = [CartaCriatura(f"Criatura {i}", 1, "", poder, resistencia)
+                          for i, (poder, resistencia) in enumerate([(2, 3), (5, 1), (5, 4), (1, 1)])]
+        self.campo = CampoDeBatalha(self.criaturas)
+
+    def test_consultas_desempatam_pela_ordem(self):
+        """Testa se a mais fraca e a mais forte são as primeiras do campo em caso de empate, como min/max."""
+        self.assertIs(self.campo.mais_fraca(), min(self.criaturas, key=lambda c: c.resistencia))
+        self.assertIs(self.campo.mais_forte(), max(self.criaturas, key=lambda c: c.poder))
+
+    def test_indices_acompanham_dano_buff_e_remocao(self):
+        """Testa se as consultas e as posições continuam certas depois de mudanças nas criaturas."""
+        self.campo.mais_fraca(), self.campo.mais_forte()
+        self.campo.remove(self.criaturas[1])
+        self.assertIs(self.campo.mais_fraca(), self.criaturas[3])
+        self.assertIs(self.campo.mais_forte(), self.criaturas[2])
+        self.criaturas[3].resistencia += 10
+        self.criaturas[0].poder = 9
+        self.assertIs(self.campo.mais_fraca(), self.criaturas[0])
+        self.assertIs(self.campo.mais_forte(), self.criaturas[0])
+        self.assertEqual(self.campo.index(self.criaturas[3]), 2)
+        self.assertEqual(self.campo, [self.criaturas[0], self.criaturas[2], self.criaturas[3]])
+        self.assertNotIn(self.criaturas[1], self.campo)
+        with self.assertRaises(ValueError):
+            self.campo.remove(self.criaturas[1])
+
+    def test_morte_em_dano_coletivo_sai_do_campo(self):
+        """Testa se as criaturas mortas por dano coletivo vão para o cemitério e saem dos índices."""
+        jogador = Jogador("Dono", eh_humano=False)
+        jogador.campo_de_batalha = self.criaturas
+        jogador.campo_de_batalha.mais_fraca()
+        with eventos.usar_saida(eventos.SaidaNula()):
+            CartaFeitico("Terremoto", 0, "", "dano_coletivo", 1, False, True)._dano_coletivo(jogador)
+        self.assertEqual(jogador.cemiterio, [self.criaturas[1], self.criaturas[3]])
+        self.assertEqual(list(jogador.campo_de_batalha), [self.criaturas[0], self.criaturas[2]])
+        self.assertIs(jogador.campo_de_batalha.mais_fraca(), self.criaturas[0])
+        self.assertIs(jogador.campo_de_batalha[1], self.criaturas[2])
+
+    def test_dano_coletivo_mantem_ordem_dos_eventos(self):
+        """Testa se o dano coletivo em lote emite dano e destruição de cada criatura na ordem do campo."""
+        jogador = Jogador("Dono", eh_humano=False)
+        jogador.campo_de_batalha = self.criaturas
+        with eventos.usar_saida(eventos.SaidaColetora()) as saida:
+            CartaFeitico("Terremoto", 0, "", "dano_coletivo", 1, False, True)._dano_coletivo(jogador)
+        self.assertEqual([type(evento).__name__ for evento in saida.eventos], [
+            "FeiticoDanoColetivo",
+            "CriaturaSofreDano",
+            "CriaturaSofreDano", "CriaturaDestruida",
+            "CriaturaSofreDano",
+            "CriaturaSofreDano", "CriaturaDestruida",
+        ])
+        self.assertEqual([evento.criatura for evento in saida.eventos if isinstance(evento, eventos.CriaturaDestruida)],
+                         ["Criatura 1", "Criatura 3"])
+
+    def test_buff_coletivo_em_lote_refaz_indices(self):
+        """Testa se as consultas refletem as resistências depois de um buff em todo o campo."""
+        jogador = Jogador("Dono", eh_humano=False)
+        jogador.campo_de_batalha = self.criaturas
+        self.assertIs(jogador.campo_de_batalha.mais_fraca(), self.criaturas[1])
+        self.criaturas[1].resistencia = 2
+        with eventos.usar_saida(eventos.SaidaNula()):
+            CartaFeitico("Escudo", 0, "", "buff_coletivo", 2)._buffar_coletivo(jogador)
+        self.assertEqual([c.resistencia for c in jogador.campo_de_batalha], [5, 4, 6, 3])
+        self.assertIs(jogador.campo_de_batalha.mais_fraca(), self.criaturas[3])
+
+class TestHistorico(unittest.TestCase):
+    def setUp(self):
+        self.jogador1 = Jogador("Jogador 1")
+        self.jogador2 = Jogador("Jogador 2")
+
+    def test_registros_estruturados_geram_texto_original(self):
+        """Testa se os registros do histórico são montados como o texto de antes."""
+        jogo = Jogo([self.jogador1, self.jogador2])
+        atacante = CartaCriatura("Zumbi", 2, "Um zumbi comum.", 2, 2)
+        self.jogador1.campo_de_batalha.append(atacante)
+        with eventos.usar_saida(eventos.SaidaNula()):
+            self.jogador1.atacar(self.jogador2, 0, jogo=jogo)
+        registro = jogo.historico.ultimos(1)[0]
+        self.assertEqual(registro.acao, AcaoHistorico.ATAQUE_DIRETO)
+        self.assertIs(registro.carta, atacante.modelo)
+        self.assertEqual(list(jogo.historico), ["Rodada 1 - Jogador 1: Zumbi(P:2, R:2) atacou diretamente Jogador 2"])
+
+    def test_anel_guarda_apenas_os_mais_recentes(self):
+        """Testa se a política em anel descarta os registros mais antigos."""
+        historico = Historico(Historico.ANEL, capacidade=3)
+        for rodada in range(1, 11):
+            historico.registrar(rodada, "Jogador 1", AcaoHistorico.PASSOU)
+        self.assertEqual(len(historico), 3)
+        self.assertEqual([registro.rodada for registro in historico.ultimos(2)], [9, 10])
+
+    def test_historico_desligado_nao_guarda_nada(self):
+        """Testa se o histórico desligado ignora todos os registros."""
+        historico = Historico(Historico.DESLIGADO)
+        historico.registrar(1, "Jogador 1", AcaoHistorico.PASSOU)
+        historico.append("Ação livre")
+        self.assertEqual(len(historico), 0)
+        self.assertEqual(historico.ultimos(10), [])
+
+    def test_atribuir_lista_converte_para_historico(self):
+        """Testa se atribuir uma lista ao histórico do jogo mantém a política configurada."""
+        jogo = Jogo([self.jogador1, self.jogador2], politica_historico=Historico.ANEL, capacidade_historico=2)
+        jogo.historico = ["Ação 1", "Ação 2", "Ação 3"]
+        self.assertIsInstance(jogo.historico, Historico)
+        self.assertEqual(list(jogo.historico), ["Ação 2", "Ação 3"])
+
+class TestCatalogoCompilado(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.pasta, "cartas.csv")
+        self._escrever("Zumbi", 2)
+
+    def tearDown(self):
+        shutil.rmtree(self.pasta)
+        banco_de_dados._catalogos.pop(self.csv_path, None)
+
+    def _escrever(self, nome, poder):
+        with open(self.csv_path, "w", encoding="utf-8") as arquivo:
+            arquivo.write("tipo,nome,custo_mana,descricao,poder,resistencia,tipo_magia,tem_alvo,afeta_todos,efeitos\n")
+            arquivo.write(f"CartaCriatura,{nome},2,Desc.,{poder},2,,,,\n")
+
+    def test_instancias_compartilham_catalogo_do_processo(self):
+        """Testa se o CSV é lido uma vez e os modelos são compartilhados entre bancos."""
+        with patch.object(banco_de_dados, "ler_csv", wraps=banco_de_dados.ler_csv) as mock_ler:
+            primeiro = BancoSimulado(self.csv_path)
+            segundo = BancoSimulado(self.csv_path)
+        self.assertEqual(mock_ler.call_count, 1)
+        self.assertIs(primeiro.obter_cartas()[0].modelo, segundo.obter_cartas()[0].modelo)
+        self.assertIsNot(primeiro.obter_cartas()[0], segundo.obter_cartas()[0])
+
+    def test_cache_em_disco_evita_reler_o_csv(self):
+        """Testa se um novo processo (sem cache em memória) usa o arquivo compilado."""
+        BancoSimulado(self.csv_path)
+        banco_de_dados._catalogos.clear()
+        with patch.object(banco_de_dados, "ler_csv") as mock_ler:
+            banco = BancoSimulado(self.csv_path)
+        mock_ler.assert_not_called()
+        self.assertEqual(banco.obter_cartas()[0].nome, "Zumbi")
+
+    def test_falha_ao_gravar_cache_nao_deixa_temporario(self):
+        """Testa se uma falha ao gravar ou trocar o cache só o deixa de fora, sem arquivos temporários."""
+        pasta_cache = os.path.join(self.pasta, "__cache__")
+        for alvo, erro in (("os.replace", PermissionError("em uso")), ("pickle.dump", pickle.PicklingError("falhou"))):
+            banco_de_dados._catalogos.pop(self.csv_path, None)
+            with patch(f"banco.banco_de_dados.{alvo}", side_effect=erro):
+                self.assertEqual(BancoSimulado(self.csv_path).obter_cartas()[0].nome, "Zumbi")
+            self.assertEqual(os.listdir(pasta_cache), [], alvo)
+
+    def test_cache_invalidado_quando_csv_muda(self):
+        """Testa se alterar o CSV faz o catálogo ser recompilado."""
+        BancoSimulado(self.csv_path)
+        self._escrever("Vampiro", 30)
+        estado = os.stat(self.csv_path)
+        os.utime(self.csv_path, ns=(estado.st_atime_ns, estado.st_mtime_ns + 1_000_000_000))
+        carta = BancoSimulado(self.csv_path).obter_cartas()[0]
+        self.assertEqual((carta.nome, carta.poder), ("Vampiro", 30))
+
+    def test_efeito_registrado_depois_da_carga(self):
+        """Testa se um efeito novo citado no CSV passa a valer ao recarregar o catálogo, sem reler o CSV."""
+        guardar_tabela_de_efeitos(self)
+        with open(self.csv_path, "a", encoding="utf-8") as arquivo:
+            arquivo.write("CartaTerreno,Pântano,0,Desc.,0,0,teste_pantano,,,\n")
+        self.assertEqual(BancoSimulado(self.csv_path).obter_cartas()[1].modelo.opcodes, (SEM_EFEITO,))
+
+        opcode = registrar_efeito(CartaTerreno, "teste_pantano",
+                                  lambda carta, jogador, alvo, jogador_alvo, rng: setattr(jogador, "saude", 1))
+        with patch.object(banco_de_dados, "ler_csv") as mock_ler:
+            terreno = BancoSimulado(self.csv_path).obter_cartas()[1]
+        mock_ler.assert_not_called()
+        self.assertEqual(terreno.modelo.opcodes, (opcode,))
+        jogador = Jogador("Jogador")
+        jogador.mao.append(terreno)
+        with eventos.usar_saida(eventos.SaidaNula()):
+            self.assertTrue(jogador.jogar_carta(0))
+        self.assertEqual(jogador.saude, 1)
+
+class TestImportacaoPreguicosa(unittest.TestCase):
+    def test_importar_jogador_nao_le_csv_nem_inicia_terminal(self):
+        """Testa se importar o pacote jogador não carrega o banco de cartas nem o colorama."""
+        codigo = (
+            "import sys, jogador\n"
+            "carregados = [m for m in ('banco.banco_de_dados', 'colorama') if m in sys.modules]\n"
+            "print(','.join(carregados))"
+        )
+        raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        saida = subprocess.run([sys.executable, "-c", codigo], cwd=raiz, capture_output=True, text=True, check=True)
+        self.assertEqual(saida.stdout.strip(), "")
+
+    def test_constantes_carregadas_no_primeiro_acesso(self):
+        """Testa se as constantes do banco continuam disponíveis sob demanda."""
+        import jogo_estrutura.constantes as constantes
+        self.assertEqual(constantes.CRIATURAS_DISPONIVEIS["Zumbi"], 2)
+
+    def test_constantes_compartilham_um_so_banco(self):
+        """Testa se `cartas` e `CRIATURAS_DISPONIVEIS` usam o mesmo banco de `constantes.banco`."""
+        import jogo_estrutura.constantes as constantes
+        for nome in ("banco", "cartas", "CRIATURAS_DISPONIVEIS"):
+            self.addCleanup(vars(constantes).pop, nome, None)
+            vars(constantes).pop(nome, None)
+        banco = constantes.banco
+        constantes.cartas
+        constantes.CRIATURAS_DISPONIVEIS
+        self.assertIs(constantes.banco, banco)
+
+class TestConsultaCatalogo(unittest.TestCase):
+    def setUp(self):
+        self.banco = BancoSimulado('cartas_game.csv')
+
+    def _por_varredura(self, criterio):
+        return [carta for carta in self.banco.obter_cartas() if criterio(carta)]
+
+    def test_consultas_equivalem_a_varredura(self):
+        """Testa se as consultas indexadas devolvem o mesmo que uma varredura linear."""
+        self.assertEqual(
+            self.banco.consultar(tipo=CartaCriatura),
+            self._por_varredura(lambda c: isinstance(c, CartaCriatura)))
+        self.assertEqual(
+            self.banco.consultar(tipo=CartaFeitico),
+            self._por_varredura(lambda c: isinstance(c, CartaFeitico)))
+        self.assertEqual(
+            self.banco.consultar(tipo_magia="cura", custo_mana=(None, 3)),
+            self._por_varredura(lambda c: c.tipo_magia == "cura" and c.custo_mana <= 3))
+        self.assertEqual(
+            self.banco.consultar(tipo="CartaCriatura", poder=(3, 5), resistencia=4),
+            self._por_varredura(lambda c: isinstance(c, CartaCriatura) and 3 <= c.poder <= 5 and c.resistencia == 4))
+        self.assertEqual([c.nome for c in self.banco.consultar(nome="Zumbi")], ["Zumbi"])
+
+    def test_indices_atualizados_ao_adicionar_carta(self):
+        """Testa se cartas adicionadas ao banco entram nos índices."""
+        nova = self.banco.adicionar_carta(CartaCriatura("Hidra", 9, "Muitas cabeças.", 9, 9))
+        self.assertEqual(self.banco.consultar(custo_mana=(9, None)), [nova])
+        self.assertEqual(self.banco.consultar(nome="Hidra", tipo=CartaCriatura), [nova])
+        self.assertEqual(self.banco.consultar(nome="Hidra", tipo=CartaFeitico), [])
+
+class TestBancoSQLite(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.mkdtemp()
+        self.banco = BancoSQLite(os.path.join(self.pasta, "cartas.db"), arquivo_csv='cartas_game.csv')
+        self.referencia = BancoSimulado('cartas_game.csv')
+
+    def tearDown(self):
+        self.banco.fechar()
+        shutil.rmtree(self.pasta)
+
+    def test_importa_csv_com_a_mesma_interface(self):
+        """Testa se o banco SQLite entrega as mesmas cartas que o banco em CSV."""
+        cartas = self.banco.obter_cartas()
+        self.assertEqual(len(cartas), len(self.referencia.obter_cartas()))
+        self.assertEqual([c.modelo for c in cartas], [c.modelo for c in self.referencia.obter_cartas()])
+        self.assertEqual(cartas[-1].efeitos, ("dano", "cura", "mana_extra"))
+        self.assertEqual(len(random.choices(cartas, k=30)), 30)
+
+    def test_consulta_e_adicao(self):
+        """Testa as consultas indexadas e a inclusão de cartas novas."""
+        self.assertEqual(
+            [c.nome for c in self.banco.consultar(tipo=CartaFeitico, custo_mana=(None, 1))],
+            [c.nome for c in self.referencia.consultar(tipo=CartaFeitico, custo_mana=(None, 1))])
+        self.banco.adicionar_carta(CartaCriatura("Hidra", 9, "Muitas cabeças.", 9, 9))
+        self.assertEqual(self.banco.obter_cartas()[-1].nome, "Hidra")
+        self.assertEqual([c.nome for c in self.banco.consultar(resistencia=(9, None))], ["Hidra"])
+
+    def test_efeito_registrado_depois_da_leitura(self):
+        """Testa se o cache de modelos do SQLite resolve de novo os opcodes após um registro de efeito."""
+        guardar_tabela_de_efeitos(self)
+        self.banco.adicionar_carta(CartaTerreno("Pântano", "Desc.", "teste_pantano_sqlite"))
+        cartas = self.banco.obter_cartas()
+        self.assertEqual(cartas[-1].modelo.opcodes, (SEM_EFEITO,))
+        opcode = registrar_efeito(CartaTerreno, "teste_pantano_sqlite",
+                                  lambda carta, jogador, alvo, jogador_alvo, rng: None)
+        self.assertEqual(cartas[-1].modelo.opcodes, (opcode,))
+
+    def test_cache_de_modelos_descarta_o_menos_usado(self):
+        """Testa se o cache de modelos, cheio, descarta o modelo usado há mais tempo, e não o mais antigo."""
+        cartas = CartasSQLite(self.banco, tamanho_cache=2)
+        for indice in (0, 1, 0, 2):
+            cartas[indice]
+        self.assertEqual(list(cartas._modelos), [0, 2])
+
+    def test_iteradores_abertos_nao_prendem_conexoes(self):
+        """Testa se iteradores pela metade não esgotam o pool de conexões de leitura."""
+        cartas = self.banco.obter_cartas()
+        abertos = [self.banco.iterar_cartas(tamanho_lote=2) for _ in range(8)]
+        for iterador in abertos:
+            next(iterador)
+        self.assertEqual(cartas[0].nome, self.referencia.obter_cartas()[0].nome)
+        self.assertEqual(len(self.banco.consultar(tipo=CartaTerreno)), 2)
+        self.assertEqual([carta.nome for carta in abertos[0]],
+                         [carta.nome for carta in self.referencia.obter_cartas()[1:]])
+
+    def test_conexoes_do_pool_sao_somente_leitura(self):
+        """Testa se as conexões de leitura não permitem escrever no banco."""
+        with self.banco.leitura() as con:
+            with self.assertRaises(sqlite3.OperationalError):
+                con.execute("DELETE FROM cartas")
+
+class TestEstadoJogo(unittest.TestCase):
+    def setUp(self):
+        os.environ["RUNNING_TESTS"] = "1"
+        self.jogador1 = Jogador("Jogador 1", eh_humano=False)
+        self.jogador2 = Jogador("Jogador 2", eh_humano=False)
+        self.jogo = Jogo([self.jogador1, self.jogador2], politica_historico=Historico.DESLIGADO)
+        self.golem = CartaCriatura("Golem", 6, "Um gigante.", 6, 6)
+        self.zumbi = CartaCriatura("Zumbi", 2, "Um zumbi comum.", 2, 2)
+        self.raio = CartaFeitico("Raio", 2, "Causa 2 de dano.", "dano_direto", 2)
+        self.jogador1.campo_de_batalha.append(self.golem)
+        self.jogador2.campo_de_batalha.append(self.zumbi)
+        self.jogador2.mao.append(self.raio)
+        for jogador in (self.jogador1, self.jogador2):
+            jogador.baralho.extend(CartaCriatura("Orc", 3, "Um orc.", 4, 3) for _ in range(5))
+
+    def test_restaurar_desfaz_o_turno(self):
+        """Testa se restaurar desfaz compras, dano em criaturas, mortes e a derrota de um jogador."""
+        estado = self.jogo.capturar()
+        with eventos.usar_saida(eventos.SaidaNula()):
+            self.jogador1.atacar(self.jogador2, 0, 0)
+            self.zumbi.resistencia = 2
+            self.jogador2.atacar(self.jogador1, 0, 0)
+            self.jogador1.comprar_carta()
+            self.jogador2.saude = 0
+            self.jogo.finalizar_turno(self.jogador2)
+        self.assertEqual(self.jogo.jogadores, [self.jogador1])
+
+        self.jogo.restaurar(estado)
+        self.assertEqual(self.jogo.jogadores, [self.jogador1, self.jogador2])
+        self.assertEqual(self.jogo.turno, 0)
+        self.assertEqual(self.jogador2.saude, 20)
+        self.assertEqual(self.jogador2.campo_de_batalha, [self.zumbi])
+        self.assertEqual(self.jogador2.cemiterio, [])
+        self.assertEqual((self.zumbi.resistencia, self.golem.resistencia), (2, 6))
+        self.assertEqual((len(self.jogador1.mao), len(self.jogador1.baralho)), (0, 5))
+
+    def test_clone_independente(self):
+        """Testa se o clone copia as criaturas e compartilha as cartas que não mudam."""
+        clone = self.jogo.clonar()
+        jogador1, jogador2 = clone.jogadores
+        with eventos.usar_saida(eventos.SaidaNula()):
+            jogador1.atacar(jogador2, 0, 0)
+            jogador1.comprar_carta()
+        self.assertEqual(jogador2.cemiterio[0].nome, "Zumbi")
+        self.assertEqual(self.jogador2.campo_de_batalha, [self.zumbi])
+        self.assertEqual(self.zumbi.resistencia, 2)
+        self.assertEqual(len(self.jogador1.baralho), 5)
+        self.assertIs(jogador2.mao[0], self.raio)
+        self.assertIsNot(jogador1.campo_de_batalha[0], self.golem)
+
+    def test_capturar_com_gerador(self):
+        """Testa se o estado do gerador guardado repete os mesmos sorteios."""
+        estado = self.jogo.capturar(incluir_rng=True)
+        sorteios = [self.jogo.rng.random() for _ in range(3)]
+        self.jogo.restaurar(estado)
+        self.assertEqual(self.jogo.clonar().rng.random(), sorteios[0])
+        self.assertEqual([self.jogo.rng.random() for _ in range(3)], sorteios)
+
+class TestGeradorDaPartida(unittest.TestCase):
+    def _jogar(self, semente):
+        os.environ["RUNNING_TESTS"] = "1"
+        jogo = Jogo([Jogador("Máquina 1", eh_humano=False), Jogador("Máquina 2", eh_humano=False)],
+                    politica_historico=Historico.COMPLETO, semente=semente)
+        with eventos.usar_saida(eventos.SaidaNula()):
+            jogo.distribuir_baralhos(BancoSimulado('cartas_game.csv').obter_cartas())
+            jogo.iniciar()
+            while jogo.turno < 200 and jogo.jogar_turno():
+                pass
+        return list(jogo.historico)
+
+    def test_mesma_semente_repete_a_partida(self):
+        """Testa se a semente determina todos os sorteios da partida, sem usar o gerador global."""
+        random.seed(1)
+        primeira = self._jogar(123)
+        random.seed(2)
+        self.assertEqual(self._jogar(123), primeira)
+        self.assertNotEqual(self._jogar(124), primeira)
+
+    def test_sorteio_das_cartas_usa_o_gerador_da_partida(self):
+        """Testa se a carta aleatória sorteia o efeito com o gerador da partida."""
+        jogo = Jogo([Jogador("A", eh_humano=False), Jogador("B", eh_humano=False)], rng=random.Random(5))
+        carta = CartaAleatoria("Caos Mágico", 0, "Efeito aleatório.", ["dano", "cura", "mana_extra"])
+        jogo.jogadores[0].mao.append(carta)
+        with eventos.usar_saida(eventos.SaidaNula()):
+            jogo.jogadores[0].jogar_carta(0, jogador_alvo=jogo.jogadores[1], jogo=jogo)
+        self.assertEqual(carta.efeito_atual, random.Random(5).choice(carta.efeitos))
+
+class TestTorneio(unittest.TestCase):
+    def test_intervalo_wilson(self):
+        """Testa o intervalo de Wilson em um placar equilibrado e em um placar de 100%."""
+        inferior, superior = intervalo_wilson(50, 100, 1.96)
+        self.assertAlmostEqual(inferior, 0.4038, places=3)
+        self.assertAlmostEqual(superior, 0.5962, places=3)
+        inferior, superior = intervalo_wilson(20, 20, 1.96)
+        self.assertGreater(inferior, 0.5)
+        self.assertEqual(superior, 1.0)
+
+    def test_confronto_conta_lotes_na_ordem_e_elo_finito(self):
+        """Testa se lotes fora de ordem esperam os anteriores e se um placar de 100% tem Elo finito."""
+        a, b = Participante("A", ()), Participante("B", ())
+        confronto = Confronto(a, b, semente=1)
+        self.assertFalse(confronto.receber(1, ResultadoLote(10, 0, 0, 5), 2.576, 20, 100))
+        self.assertEqual(confronto.partidas, 0)
+        self.assertTrue(confronto.receber(0, ResultadoLote(10, 0, 0, 5), 2.576, 20, 100))
+        self.assertEqual((confronto.partidas, confronto.vencedor(2.576)), (20, "A"))
+        elo = calcular_elo(["A", "B"], [confronto])
+        self.assertGreater(elo["A"], elo["B"])
+        self.assertAlmostEqual(elo["A"] + elo["B"], 3000, places=0)
+
+class TestOtimizadorBaralhos(unittest.TestCase):
+    def test_amostra_adaptativa_e_cache(self):
+        """Testa se só quem disputa a elite joga a amostra máxima e se baralhos já vistos não jogam de novo."""
+        def lotes_falsos(tarefas):
+            # Baralhos com a carta "Forte" vencem todas as partidas; os outros perdem todas.
+            return [ResultadoLote(quantidade, 0, 0, 0) if "Forte" in candidato.baralho else ResultadoLote(0, 0, quantidade, 0)
+                    for candidato, _, _, _, quantidade, _, _ in tarefas]
+
+        otimizador = OtimizadorBaralhos(Participante("Referência", ()), elite=1, amostra_inicial=20, amostra_maxima=160)
+        forte, fraco, outro_fraco = normalizar(["Forte", "X"]), normalizar(["X", "Fraco"]), normalizar(["Fraco", "Fraco"])
+        classificados = otimizador._avaliar([fraco, forte, outro_fraco, fraco], lotes_falsos)
+        self.assertEqual(classificados[0], forte)
+        self.assertEqual(otimizador.aptidoes[forte].partidas, 160)
+        self.assertEqual(otimizador.aptidoes[fraco].partidas, 20)
+        self.assertEqual(otimizador.aptidoes[outro_fraco].partidas, 20)
+        self.assertEqual(otimizador.partidas_jogadas, 200)
+        otimizador._avaliar([normalizar(["X", "Forte"]), fraco], lotes_falsos)
+        self.assertEqual(otimizador.partidas_jogadas, 200)
+
+    def test_referencia_com_nome_do_candidato_ou_cartas_desconhecidas(self):
+        """Testa se a referência pode se chamar "Candidato" e se cartas fora do catálogo são recusadas antes de jogar."""
+        otimizador = OtimizadorBaralhos(Participante("Candidato", ("Zumbi",) * 30))
+        self.assertNotEqual(otimizador.nome_candidato, otimizador.referencia.nome)
+        with self.assertRaisesRegex(ValueError, "Zumbii"):
+            OtimizadorBaralhos(Participante("Referência", ("Zumbii",) * 30))
+
+class TestPerfil(unittest.TestCase):
+    def test_fase_aninhada_e_descontada(self):
+        """Testa se o tempo de uma fase aninhada não é contado também na fase de fora."""
+        perfil = Perfil()
+        with patch('jogo_estrutura.perfil.time.perf_counter', side_effect=[0.0, 1.0, 4.0, 10.0]):
+            with perfil.fase("decisao"):
+                with perfil.fase("combate"):
+                    pass
+        self.assertEqual(dict(perfil.tempos), {"decisao": 7.0, "combate": 3.0})
+        self.assertEqual(perfil.chamadas["decisao"], 1)
+
+    def test_turno_com_perfil(self):
+        """Testa se o turno medido conta a carta jogada, a decisão e a criatura morta."""
+        os.environ["RUNNING_TESTS"] = "1"
+        perfil = Perfil()
+        jogador1, jogador2 = Jogador("Máquina 1", eh_humano=False), Jogador("Máquina 2", eh_humano=False)
+        jogo = Jogo([jogador1, jogador2], perfil=perfil)
+        jogador1.mao.append(CartaFeitico("Terremoto", 0, "Dano em todos.", "dano_coletivo", 3, False, True))
+        jogador2.campo_de_batalha.append(CartaCriatura("Zumbi", 2, "Um zumbi comum.", 2, 2))
+        with eventos.usar_saida(eventos.SaidaNula()):
+            jogo.jogar_turno()
+        self.assertEqual(perfil.contadores["feiticos_lancados"], 1)
+        self.assertEqual(perfil.contadores["criaturas_mortas"], 1)
+        self.assertEqual(perfil.latencias["Máquina 1"].quantidade, 1)
+        self.assertEqual(set(perfil.para_dict()["fases"]), {"renderizacao", "compra", "decisao", "feiticos", "fim_turno"})
+
+class TestTela(unittest.TestCase):
+    def setUp(self):
+        self.saida = io.StringIO()
+        self.tela = Tela(self.saida, tamanho=lambda: os.terminal_size((80, 24)))
+
+    def test_reescreve_so_as_linhas_alteradas(self):
+        """Testa se o segundo quadro reescreve só a linha que mudou, sem limpar a tela."""
+        self.tela.desenhar(["Tabuleiro", "Saúde: 20", "Mão: 3 cartas"])
+        self.assertIn("\x1b[2J", self.saida.getvalue())
+        self.assertIn("\x1b[8;24r", self.saida.getvalue())
+        self.saida.seek(0)
+        self.saida.truncate()
+        self.tela.desenhar(["Tabuleiro", "Saúde: 17", "Mão: 3 cartas"])
+        texto = self.saida.getvalue()
+        self.assertIn("\x1b[2;1HSaúde: 17", texto)
+        self.assertNotIn("Tabuleiro", texto)
+        self.assertNotIn("Mão", texto)
+        self.assertNotIn("\x1b[2J", texto)
+        self.saida.seek(0)
+        self.saida.truncate()
+        self.tela.desenhar(["Tabuleiro", "Saúde: 17"])
+        self.assertIn("\x1b[3;1H\x1b[0m\x1b[K", self.saida.getvalue())
+        self.assertNotIn("\x1b[2J", self.saida.getvalue())
+
+    def test_pausa_adia_a_proxima_escrita(self):
+        """Testa se a pausa não bloqueia quem a pede e só é esperada antes de escrever."""
+        ritmo = Ritmo()
+        with patch('jogo_estrutura.tela.time.sleep') as mock_sleep, \
+                patch('jogo_estrutura.tela.time.monotonic', side_effect=[100.0, 100.5]):
+            ritmo.adiar(1.5)
+            mock_sleep.assert_not_called()
+            ritmo.aguardar()
+        mock_sleep.assert_called_once_with(1.0)
+
+    def test_console_sem_ansi_volta_ao_modo_linha_a_linha(self):
+        """Testa se, sem processamento de ANSI no console, não há `Tela` e a limpeza usa `cls`."""
+        from jogo_estrutura import tela, utils
+        with patch.object(tela, '_terminal', None), patch.object(tela, '_vt', None), \
+                patch.dict(os.environ, {"RUNNING_TESTS": "0"}), \
+                patch.object(tela.sys, 'stdout', io.StringIO()) as saida, \
+                patch.object(tela, '_ativar_vt', return_value=False), \
+                patch('jogo_estrutura.utils.os.system') as mock_system:
+            saida.isatty = lambda: True
+            self.assertIsNone(tela.terminal())
+            utils.limpar_tela()
+            self.assertEqual(saida.getvalue(), "")
+        mock_system.assert_called_once_with('cls')
+
+class TestJogadorMCTS(unittest.TestCase):
+    def setUp(self):
+        os.environ["RUNNING_TESTS"] = "1"
+        self.maquina = Jogador("Máquina", eh_humano=False, estrategia=functools.partial(JogadorMCTS, simulacoes=60))
+        self.adversario = Jogador("Adversário", eh_humano=False)
+        self.jogo = Jogo([self.maquina, self.adversario], politica_historico=Historico.DESLIGADO)
+        for jogador in (self.maquina, self.adversario):
+            jogador.baralho.extend(CartaCriatura("Zumbi", 2, "Um zumbi comum.", 2, 2) for _ in range(10))
+
+    def test_acoes_legais(self):
+        """Testa se as jogadas listadas respeitam a mana e os alvos disponíveis."""
+        self.maquina.mana = 2
+        self.maquina.mao = [CartaCriatura("Zumbi", 2, "Um zumbi comum.", 2, 2),
+                            CartaCriatura("Golem", 6, "Um gigante.", 6, 6),
+                            CartaTerreno("Floresta Encantada", "Concede mana extra.", "mana_extra")]
+        self.maquina.campo_de_batalha = [CartaCriatura("Vampiro", 4, "Sanguinário.", 3, 4)]
+        self.adversario.campo_de_batalha = [CartaCriatura("Orc", 3, "Um orc.", 4, 3)]
+        self.assertEqual(acoes_legais(self.maquina, self.adversario), [
+            Acao("jogar", "Zumbi"), Acao("jogar", "Floresta Encantada"), Acao("atacar", "Vampiro", "Orc"), PASSAR])
+
+    def test_escolhe_ataque_letal(self):
+        """Testa se a busca encontra o ataque que vence a partida."""
+        self.maquina.campo_de_batalha = [CartaCriatura("Golem", 6, "Um gigante.", 6, 6)]
+        self.adversario.saude = 5
+        self.adversario.mao = [CartaFeitico("Cura Superior", 5, "Restaura 10 de saúde.", "cura", 10)]
+        self.assertEqual(JogadorMCTS(self.maquina, simulacoes=60).buscar(self.adversario, self.jogo), Acao("atacar", "Golem"))
+
+    def test_estrategia_do_jogador_joga_o_turno(self):
+        """Testa se o jogador usa a estratégia configurada e se a busca não altera o jogo real."""
+        self.maquina.campo_de_batalha = [CartaCriatura("Golem", 6, "Um gigante.", 6, 6)]
+        baralho = len(self.adversario.baralho)
+        saida = eventos.SaidaColetora()
+        with eventos.usar_saida(saida):
+            self.jogo.jogar_turno()
+        self.assertEqual(self.adversario.saude, 14)
+        self.assertEqual(len(self.adversario.baralho), baralho)
+        self.assertIn(eventos.IAEscolhendo("Máquina"), saida.eventos)
+
+    def test_exige_limite_de_busca(self):
+        """Testa se a busca sem limite de simulações nem de tempo é recusada."""
+        with self.assertRaises(ValueError):
+            JogadorMCTS(self.maquina, simulacoes=None)
+
+class TestModeloCarta(unittest.TestCase):
+    def test_copias_compartilham_modelo_e_separam_estado(self):
+        """Testa se as cópias de uma carta compartilham o modelo, mas não o estado da partida."""
+        original = CartaCriatura("Zumbi", 2, "Um zumbi comum.", 2, 2)
+        original.sofrer_dano(1)
+        copia = original.nova_copia()
+        self.assertIs(copia.modelo, original.modelo)
+        self.assertEqual(copia.resistencia, 2)
+        copia.poder += 3
+        self.assertEqual(original.poder, 2)
+
+    def test_deepcopy_preserva_estado_sem_copiar_modelo(self):
+        """Testa se deepcopy mantém o estado atual e reaproveita o modelo."""
+        original = CartaAleatoria("Caos Mágico", 3, "Efeito aleatório.", ["dano", "cura"])
+        original.efeito_atual = "cura"
+        copia = copy.deepcopy(original)
+        self.assertIs(copia.modelo, original.modelo)
+        self.assertEqual(copia.efeito_atual, "cura")
+
+    def test_cartas_nao_tem_dicionario_de_instancia(self):
+        """Testa se todas as classes de carta usam __slots__."""
+        for carta in (CartaCriatura("Zumbi", 2, "", 2, 2), CartaFeitico("Raio", 2, "", "dano_direto", 3),
+                      CartaFeiticoRevive("Necromante", 5, ""), CartaTerreno("Floresta", "", "mana_extra"),
+                      CartaAleatoria("Caos", 3, "", ["dano"])):
+            self.assertFalse(hasattr(carta, "__dict__"), type(carta).__name__)
+
+    def test_carta_de_modelo_sem_opcodes_e_compilada(self):
+        """Testa se cartas criadas de um ModeloCarta simples, sem opcodes, são jogadas normalmente."""
+        jogador, adversario = Jogador("Jogador"), Jogador("Adversário")
+        jogador.mana = 3
+        jogador.mao = [CartaTerreno.de_modelo(ModeloCarta("Fonte", 0, "", efeitos=("cura",))),
+                       CartaFeitico.de_modelo(ModeloCarta("Raio", 1, "", "dano_direto", poder=3)),
+                       CartaAleatoria.de_modelo(ModeloCarta("Caos", 1, "", efeitos=("mana_extra",))).nova_copia()]
+        with eventos.usar_saida(eventos.SaidaNula()):
+            for _ in range(3):
+                self.assertTrue(jogador.jogar_carta(0, jogador_alvo=adversario))
+        self.assertEqual(jogador.saude, 23)
+        self.assertEqual(adversario.saude, 17)
+        self.assertEqual(jogador.mana, 5)
+        self.assertEqual(len(jogador.mao), 0)
+
+    def test_feitico_sem_tipo_magia_so_gasta_mana(self):
+        """Testa se um feitiço com `tipo_magia` vazio ou None gasta a mana e vai para o cemitério sem efeito."""
+        jogador, adversario = Jogador("Jogador"), Jogador("Adversário")
+        jogador.mana = 2
+        jogador.mao = [CartaFeitico("Vazio", 1, "", "", 0),
+                       CartaFeitico.de_modelo(ModeloCarta("Nulo", 1, "", None))]
+        with eventos.usar_saida(eventos.SaidaNula()):
+            for _ in range(2):
+                self.assertTrue(jogador.jogar_carta(0, jogador_alvo=adversario))
+        self.assertEqual(jogador.mana, 0)
+        self.assertEqual([carta.nome for carta in jogador.cemiterio], ["Vazio", "Nulo"])
+        self.assertEqual((jogador.saude, adversario.saude), (20, 20))
+
+    def test_subclasse_usa_jogada_e_efeito_da_classe_base(self):
+        """Testa se uma subclasse de feitiço sem registro próprio é jogada e resolvida como a classe base."""
+        class FeiticoDeGelo(CartaFeitico):
+            __slots__ = ()
+
+        feitico = FeiticoDeGelo("Gelo", 1, "", "dano_direto", 4)
+        jogador, adversario = Jogador("Jogador"), Jogador("Adversário")
+        jogador.mana = 1
+        jogador.mao.append(feitico)
+        with eventos.usar_saida(eventos.SaidaNula()):
+            self.assertTrue(jogador.jogar_carta(0, jogador_alvo=adversario))
+        self.assertEqual(adversario.saude, 16)
+        self.assertEqual(jogador.cemiterio, [feitico])
+
+class TestEventos(unittest.TestCase):
+    def setUp(self):
+        self.jogador1 = Jogador("Jogador 1")
+        self.jogador2 = Jogador("Jogador 2")
+
+    def test_saida_coletora_recebe_eventos_tipados(self):
+        """Testa se os passos do motor chegam à saída ativa como eventos tipados."""
+        criatura = CartaCriatura("Zumbi", 2, "Um zumbi comum.", 2, 2)
+        self.jogador1.campo_de_batalha.append(criatura)
+        with eventos.usar_saida(eventos.SaidaColetora()) as saida:
+            criatura.sofrer_dano(2, self.jogador1)
+        self.assertEqual(
+            saida.eventos,
+            [eventos.CriaturaSofreDano("Zumbi", 2, 0), eventos.CriaturaDestruida("Zumbi")],
+        )
+        self.assertEqual(saida.mensagens()[0], "Zumbi sofre 2 de dano. Resistência restante: 0")
+
+    def test_saida_console_mantem_texto_original(self):
+        """Testa se a saída de console imprime o mesmo texto de antes dos eventos."""
+        self.jogador1.baralho.append(CartaCriatura("Zumbi", 2, "Um zumbi comum.", 2, 2))
+        with patch('builtins.print') as mock_print:
+            self.jogador1.comprar_carta()
+        mock_print.assert_called_once_with("Jogador 1 comprou a carta: Zumbi.")
+
+    def test_saida_nula_nao_formata_mensagens(self):
+        """Testa se a saída nula descarta os eventos sem montar o texto."""
+        with patch.object(eventos, 'formatar') as mock_formatar, eventos.usar_saida(eventos.SaidaNula()):
+            self.jogador1.receber_dano(3)
+        mock_formatar.assert_not_called()
+        self.assertEqual(self.jogador1.saude, 17)
+
+    def test_saida_sem_receber_nao_pode_ser_criada(self):
+        """Testa se uma saída que não implementa `receber` é recusada ao ser criada."""
+        class SaidaIncompleta(eventos.Saida):
+            pass
+
+        with self.assertRaises(TypeError):
+            SaidaIncompleta()
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file